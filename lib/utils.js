@@ -1,5 +1,5 @@
 const hashSync = require('bcryptjs').hashSync;
-const randomBytes = require('crypto').randomBytes;
+const { createHash, randomBytes } = require('crypto');
 const Deepcopy = require('deepcopy');
 const Fs = require('fs');
 const { ObjectId } = require('mongodb');
@@ -53,6 +53,22 @@ const addEventRecordIDs = async (request, records) => {
 
 };
 
+const addResponseETag = (request, h) => {
+
+  // add a content-based ETag to successful GET responses so clients can
+  // revalidate cached records, hapi replies 304 when If-None-Match matches.
+  const response = request.response;
+
+  if (request.method !== 'get' || response.isBoom || response.statusCode !== 200 || typeof response.source !== 'object' || response.source === null) {
+    return h.continue;
+  }
+
+  const etag = createHash('sha1').update(JSON.stringify(response.source)).digest('base64');
+  response.etag(etag);
+
+  return h.continue;
+};
+
 const arrayMove = (arr, old_index, new_index) => {
 
   if (new_index >= arr.length) {
@@ -479,6 +495,7 @@ const rmPath = (path) => {
 
 module.exports = {
   addEventRecordIDs,
+  addResponseETag,
   buildEventCSVHeaders,
   buildEventsQuery,
   filePreProcessor,
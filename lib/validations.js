@@ -510,6 +510,13 @@ const eventCreateResponse = Joi.object({
   insertedEvent: eventSuccessResponse
 }).label('eventCreateResponse');
 
+const eventBulkCreatePayload = Joi.array().items(eventCreatePayload).min(1).max(5000).label('eventBulkCreatePayload');
+
+const eventBulkCreateResponse = Joi.object({
+  acknowledged: Joi.boolean(),
+  insertedCount: Joi.number().integer()
+}).label('eventBulkCreateResponse');
+
 const eventUpdatePayload = Joi.object({
   event_author: Joi.string().min(1).max(100).optional(),
   ts: Joi.date().iso().optional(),
@@ -688,6 +695,8 @@ module.exports = {
   customVarSuccessResponse,
   customVarUpdatePayload,
   databaseInsertResponse,
+  eventBulkCreatePayload,
+  eventBulkCreateResponse,
   eventCountSuccessResponse,
   eventCreatePayload,
   eventCreateResponse,
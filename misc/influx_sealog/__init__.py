@@ -0,0 +1,15 @@
+'''
+Functions for building sealog aux_data records from InfluxDB queries.
+
+The sealog root directory is added to the module search path once, when the
+package is first imported, so the modules can import each other as
+misc.influx_sealog.<module>.
+'''
+
+import sys
+from os.path import dirname, realpath
+
+_ROOT_DIR = dirname(dirname(dirname(realpath(__file__))))
+
+if _ROOT_DIR not in sys.path:
+    sys.path.append(_ROOT_DIR)
@@ -17,16 +17,22 @@ LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for det
                 Copyright (C) OceanDataTools.org 2024
 '''
 import sys
-import json
 import logging
 from datetime import datetime, timedelta
 from urllib3.exceptions import NewConnectionError
 from influxdb_client.rest import ApiException
 
-from os.path import dirname, realpath
-sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
+from misc.python_sealog.json_backend import LazyJSON
+from misc.python_sealog.metrics import stage_timer
 
-from misc.influx_sealog.settings import INFLUXDB_URL, INFLUXDB_AUTH_TOKEN, INFLUXDB_ORG, INFLUXDB_BUCKET
+# The settings are only needed to query a real InfluxDB, e.g. not with the
+# FakeInfluxDBClient used by sealog_benchmark.
+try:
+    from misc.influx_sealog.settings import (
+        INFLUXDB_URL, INFLUXDB_AUTH_TOKEN, INFLUXDB_ORG, INFLUXDB_BUCKET
+    )
+except (ModuleNotFoundError, ImportError):
+    INFLUXDB_URL = INFLUXDB_AUTH_TOKEN = INFLUXDB_ORG = INFLUXDB_BUCKET = None
 
 
 class SealogInfluxAuxDataRecordBuilder():
@@ -101,7 +107,7 @@ class SealogInfluxAuxDataRecordBuilder():
 
                 influx_data[record.get_field()] = record.get_value()
 
-        logging.debug("raw values: %s", json.dumps(influx_data, indent=2))
+        logging.debug("raw values: %s", LazyJSON(influx_data, indent=2))
 
         if not influx_data:
             return None
@@ -126,7 +132,7 @@ class SealogInfluxAuxDataRecordBuilder():
                             test_result = False
 
                             for test in mod_op['test']:
-                                logging.debug(json.dumps(test))
+                                logging.debug("%s", LazyJSON(test))
 
                                 if 'field' in test:
 
@@ -200,7 +206,8 @@ class SealogInfluxAuxDataRecordBuilder():
         logging.debug("Query: %s", query)
         # run the query against the influxDB
         try:
-            query_result = self._influxdb_client.query(query=query)
+            with stage_timer(f'influx_query {self._data_source}'):
+                query_result = self._influxdb_client.query(query=query)
 
         except NewConnectionError:
             logging.error("InfluxDB connection error, verify URL: %s", INFLUXDB_URL)
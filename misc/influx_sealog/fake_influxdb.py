@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+'''
+FILE:           fake_influxdb.py
+
+DESCRIPTION:    This script contains a local stand-in for the InfluxDB client
+                used to test and benchmark SealogInfluxAuxDataRecordBuilder
+                without an InfluxDB.  FakeInfluxDBClient implements the
+                query_api().query() surface used by the builder, answering the
+                flux queries from in-memory time series that are either
+                generated from the inserter aux_data configs or loaded from a
+                CSV file exported by influx.  A fixed latency and random jitter
+                can be added to every query.
+
+                Only the parts of flux used by the builder are understood:
+                range(start, stop), the _measurement and _field filters,
+                sort(desc) and limit(n).  Without a limit every point in the
+                range is returned.
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import re
+import csv
+import math
+import time
+import random
+import logging
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_INTERVAL = 1.0  # seconds between generated points
+
+RANGE_REGEX = re.compile(r'range\(\s*start:\s*([^,)]+?)\s*(?:,\s*stop:\s*([^,)]+?)\s*)?\)')
+MEASUREMENT_REGEX = re.compile(r'r\["_measurement"\]\s*==\s*"([^"]*)"')
+FIELD_REGEX = re.compile(r'r\["_field"\]\s*==\s*"([^"]*)"')
+SORT_DESC_REGEX = re.compile(r'sort\([^)]*desc:\s*true')
+LIMIT_REGEX = re.compile(r'limit\(\s*n:\s*(\d+)')
+DURATION_REGEX = re.compile(r'^-(\d+)(ms|s|m|h|d)$')
+
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def _parse_time(value):
+    '''
+    Convert a flux time (RFC3339 timestamp, now() or a negative duration
+    relative to now) to seconds since the epoch.
+    '''
+
+    value = value.strip().strip('"')
+
+    if value == 'now()':
+        return time.time()
+
+    duration = DURATION_REGEX.match(value)
+    if duration:
+        return time.time() - int(duration.group(1)) * DURATION_UNITS[duration.group(2)]
+
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def _to_datetime(epoch):
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=epoch)
+
+
+def _parse_value(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def fields_from_configs(aux_data_configs):
+    '''
+    Return the fields queried by the aux_data configs as
+    {measurement: {field: values}}.  values lists the str values compared
+    against by the modify tests of the field or is None for numeric fields.
+    '''
+
+    test_values = {}
+    for config in aux_data_configs:  # pylint: disable=too-many-nested-blocks
+        for lookup in config['aux_record_lookup'].values():
+            for mod_op in (lookup or {}).get('modify', []):
+                for test in mod_op.get('test', []):
+                    for operator in ('eq', 'ne'):
+                        if isinstance(test.get(operator), str):
+                            test_values.setdefault(test['field'], []).append(test[operator])
+
+    fields = {}
+    for config in aux_data_configs:
+        for measurement in config['query_measurements']:
+            for field in config['aux_record_lookup']:
+                fields.setdefault(measurement, {})[field] = test_values.get(field)
+
+    return fields
+
+
+class FluxRecord():
+    '''
+    A single point in a query result, mirrors the accessors of the
+    influxdb_client FluxRecord.
+    '''
+
+    __slots__ = ('table', 'values')
+
+    def __init__(self, table, values):
+        self.table = table
+        self.values = values
+
+    def get_start(self):
+        '''
+        Return the start of the query range.
+        '''
+        return self.values['_start']
+
+    def get_stop(self):
+        '''
+        Return the stop of the query range.
+        '''
+        return self.values['_stop']
+
+    def get_time(self):
+        '''
+        Return the time of the point.
+        '''
+        return self.values['_time']
+
+    def get_value(self):
+        '''
+        Return the value of the point.
+        '''
+        return self.values['_value']
+
+    def get_field(self):
+        '''
+        Return the field of the point.
+        '''
+        return self.values['_field']
+
+    def get_measurement(self):
+        '''
+        Return the measurement of the point.
+        '''
+        return self.values['_measurement']
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+
+class FluxTable():  # pylint: disable=too-few-public-methods
+    '''
+    The points of a single measurement and field in a query result.
+    '''
+
+    def __init__(self):
+        self.records = []
+
+
+class TableList(list):
+    '''
+    The tables returned by a query.
+    '''
+
+    def to_values(self, columns=None):
+        '''
+        Return the values of every record as a list of lists, optionally
+        limited to columns.
+        '''
+
+        return [[record.values.get(column) for column in columns] if columns
+                else list(record.values.values())
+                for table in self for record in table.records]
+
+
+class FakeTimeSeries():
+    '''
+    Class that holds the points of each measurement and field in time order.
+    '''
+
+    def __init__(self):
+        self._series = {}
+
+    def add_point(self, measurement, field, epoch, value):
+        '''
+        Add a single point, points are kept in time order.
+        '''
+
+        times, values = self._series.setdefault((measurement, field), (array('d'), []))
+
+        if not times or epoch >= times[-1]:
+            times.append(epoch)
+            values.append(value)
+            return
+
+        position = bisect_right(times, epoch)
+        times.insert(position, epoch)
+        values.insert(position, value)
+
+    def query(self, measurements, fields, start, stop,  # pylint: disable=too-many-arguments
+              desc=False, limit=None):
+        '''
+        Yield (measurement, field, times, values) of the points in each
+        series from start (inclusive) to stop (exclusive).  measurements and
+        fields limit the series returned, None returns every series.
+        '''
+
+        for (measurement, field), (times, values) in sorted(self._series.items()):
+            if measurements is not None and measurement not in measurements:
+                continue
+
+            if fields is not None and field not in fields:
+                continue
+
+            first = bisect_left(times, start)
+            last = bisect_left(times, stop)
+
+            if first == last:
+                continue
+
+            indexes = range(last - 1, first - 1, -1) if desc else range(first, last)
+
+            if limit is not None:
+                indexes = indexes[:limit]
+
+            yield (measurement, field, [times[index] for index in indexes],
+                   [values[index] for index in indexes])
+
+    def series(self):
+        '''
+        Return the (measurement, field) of every series.
+        '''
+
+        return sorted(self._series)
+
+    def __len__(self):
+        return sum(len(times) for times, _ in self._series.values())
+
+    @classmethod
+    def generate(cls, fields, start, stop,  # pylint: disable=too-many-arguments,too-many-locals
+                 interval=DEFAULT_INTERVAL, seed=0):
+        '''
+        Return series with a point every interval seconds from start to stop
+        (seconds since the epoch) for the fields, {measurement: {field:
+        values}} as returned by fields_from_configs().  Numeric fields follow
+        a random walk, fields with values cycle slowly through them.
+        '''
+
+        rng = random.Random(seed)
+        time_series = cls()
+        count = max(0, int(math.ceil((stop - start) / interval)))
+        times = array('d', (start + index * interval for index in range(count)))
+
+        for measurement, measurement_fields in sorted(fields.items()):
+            for field, choices in sorted(measurement_fields.items()):
+                if choices:
+                    period = max(1, int(3600 / interval))
+                    values = [choices[(index // period) % len(choices)] for index in range(count)]
+
+                else:
+                    value = rng.uniform(0, 90)
+                    values = []
+                    for _ in range(count):
+                        value += rng.gauss(0, 0.01)
+                        values.append(value)
+
+                # pylint: disable=protected-access
+                time_series._series[(measurement, field)] = (array('d', times), values)
+
+        return time_series
+
+    @classmethod
+    def from_csv(cls, filename):
+        '''
+        Return the series read from a CSV file with _time, _value, _field and
+        _measurement columns, i.e. the annotated CSV output of "influx query".
+        Annotation rows starting with # are skipped.
+        '''
+
+        time_series = cls()
+        header = None
+
+        with open(filename, 'r', encoding='utf-8', newline='') as csv_fp:
+            for row in csv.reader(csv_fp):
+                # a blank row starts a new table with its own header row
+                if not row:
+                    header = None
+                    continue
+
+                if row[0].startswith('#'):
+                    continue
+
+                if header is None:
+                    header = {name: index for index, name in enumerate(row)}
+                    continue
+
+                time_series.add_point(row[header['_measurement']], row[header['_field']],
+                                      _parse_time(row[header['_time']]),
+                                      _parse_value(row[header['_value']]))
+
+        return time_series
+
+    def to_csv(self, filename):
+        '''
+        Write the series to a CSV file that can be read by from_csv().
+        '''
+
+        with open(filename, 'w', encoding='utf-8', newline='') as csv_fp:
+            writer = csv.writer(csv_fp)
+            writer.writerow(['_time', '_value', '_field', '_measurement'])
+
+            for (measurement, field), (times, values) in sorted(self._series.items()):
+                for epoch, value in zip(times, values):
+                    writer.writerow([_to_datetime(epoch).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+                                     value, field, measurement])
+
+
+class FakeQueryApi():  # pylint: disable=too-few-public-methods
+    '''
+    Answers flux queries from the FakeTimeSeries of the FakeInfluxDBClient.
+    '''
+
+    def __init__(self, client):
+        self._client = client
+
+    def query(self, query, org=None, params=None):  # pylint: disable=unused-argument
+        '''
+        Run the flux query and return the result as a TableList.  Raises a
+        ValueError if the query has no range.
+        '''
+
+        return self._client.run_query(query)
+
+
+class FakeInfluxDBClient():
+    '''
+    Class that stands in for influxdb_client.InfluxDBClient when only
+    queries are needed.  Every query is delayed by latency seconds plus up to
+    jitter seconds.
+    '''
+
+    def __init__(self, time_series=None, latency=0.0, jitter=0.0, seed=0):
+        self._time_series = time_series if time_series is not None else FakeTimeSeries()
+        self._latency = latency
+        self._jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {'queries': 0, 'points': 0, 'seconds': 0.0}
+
+    @property
+    def time_series(self):
+        '''
+        Getter method for the _time_series property
+        '''
+        return self._time_series
+
+    @property
+    def stats(self):
+        '''
+        Getter method for the _stats property, the number of queries, points
+        returned and seconds spent answering queries
+        '''
+        with self._lock:
+            return dict(self._stats)
+
+    def query_api(self):
+        '''
+        Return the query API.
+        '''
+
+        return FakeQueryApi(self)
+
+    def run_query(self, query):  # pylint: disable=too-many-locals
+        '''
+        Run the flux query against the time series and return the result as
+        a TableList.
+        '''
+
+        started = time.perf_counter()
+
+        query_range = RANGE_REGEX.search(query)
+        if query_range is None:
+            raise ValueError(f'flux query has no range: {query}')
+
+        start = _parse_time(query_range.group(1))
+        stop = _parse_time(query_range.group(2)) if query_range.group(2) else time.time()
+        measurements = set(MEASUREMENT_REGEX.findall(query)) or None
+        fields = set(FIELD_REGEX.findall(query)) or None
+        limit = LIMIT_REGEX.search(query)
+
+        start_dt = _to_datetime(start)
+        stop_dt = _to_datetime(stop)
+
+        tables = TableList()
+        points = 0
+
+        series = self._time_series.query(measurements, fields, start, stop,
+                                         SORT_DESC_REGEX.search(query) is not None,
+                                         int(limit.group(1)) if limit else None)
+
+        for measurement, field, times, values in series:
+            table = FluxTable()
+            table.records = [FluxRecord(len(tables), {
+                'result': '_result',
+                'table': len(tables),
+                '_start': start_dt,
+                '_stop': stop_dt,
+                '_time': _to_datetime(epoch),
+                '_value': value,
+                '_field': field,
+                '_measurement': measurement
+            }) for epoch, value in zip(times, values)]
+
+            tables.append(table)
+            points += len(times)
+
+        delay = self._latency + (self._rng.uniform(0, self._jitter) if self._jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._lock:
+            self._stats['queries'] += 1
+            self._stats['points'] += points
+            self._stats['seconds'] += time.perf_counter() - started
+
+        logging.debug("Fake influx query returned %d points from %d series", points, len(tables))
+
+        return tables
+
+    def close(self):
+        '''
+        Nothing to close, for compatibility with InfluxDBClient.
+        '''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
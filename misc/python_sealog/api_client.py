@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+'''
+FILE:           api_client.py
+
+DESCRIPTION:    This script contains the HTTP session shared by the wrapper
+                functions.  Reusing a single pooled session keeps the
+                connections to the sealog-server open between calls instead
+                of opening a new connection for every request.
+
+                Also contains the optional response cache used by the cruise,
+                lowering, event template and custom var lookups.  The cache
+                is disabled until enable_cache() is called.
+
+                When the metrics are enabled (see metrics.py) the duration,
+                size and outcome of every request made with the session are
+                recorded.  When profiling is enabled (see profiling.py) the
+                requests are recorded as the http phase.
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import time
+import threading
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from misc.python_sealog.settings import (CRUISES_API_PATH, CUSTOM_VAR_API_PATH,
+                                         EVENT_TEMPLATES_API_PATH, LOWERINGS_API_PATH)
+from misc.python_sealog.metrics import api_route, get_metrics
+from misc.python_sealog.profiling import phase
+
+# maximum number of connections kept open to each server
+POOL_SIZE = 16
+
+# number of times a request is retried with a backoff of
+# RETRY_BACKOFF * 2^(retry - 1) seconds between retries.  Idempotent requests
+# (GET, PUT, DELETE, ...) are retried after a connection error or a
+# 502/503/504 response, POST and PATCH requests only when the connection
+# could not be established.
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.25
+
+# maximum number of responses kept by the response cache
+DEFAULT_CACHE_SIZE = 1000
+
+# seconds a cached response is used before it is revalidated with the server
+DEFAULT_CACHE_TTL = 60
+
+# cached API paths made stale by each websocket subscription
+CACHE_INVALIDATION_SUBS = {
+    '/ws/status/newCruises': [CRUISES_API_PATH, LOWERINGS_API_PATH],
+    '/ws/status/updateCruises': [CRUISES_API_PATH, LOWERINGS_API_PATH],
+    '/ws/status/newLowerings': [CRUISES_API_PATH, LOWERINGS_API_PATH],
+    '/ws/status/updateLowerings': [CRUISES_API_PATH, LOWERINGS_API_PATH],
+    '/ws/status/deleteCruises': [CRUISES_API_PATH, LOWERINGS_API_PATH],
+    '/ws/status/deleteLowerings': [CRUISES_API_PATH, LOWERINGS_API_PATH],
+    '/ws/status/updateCustomVars': [CUSTOM_VAR_API_PATH],
+    '/ws/status/newEventTemplates': [EVENT_TEMPLATES_API_PATH],
+    '/ws/status/updateEventTemplates': [EVENT_TEMPLATES_API_PATH],
+    '/ws/status/deleteEventTemplates': [EVENT_TEMPLATES_API_PATH]
+}
+
+_session = None  # pylint: disable=invalid-name
+_session_lock = threading.Lock()
+
+_cache = None  # pylint: disable=invalid-name
+
+
+class InstrumentedSession(requests.Session):
+    '''
+    requests.Session that records the duration, response size, retries and
+    errors of each request when the metrics are enabled.
+    '''
+
+    def request(self, method, url, *args, **kwargs):  # pylint: disable=arguments-differ
+        with phase('http'):
+            return self._timed_request(method, url, *args, **kwargs)
+
+    def _timed_request(self, method, url, *args, **kwargs):
+        metrics = get_metrics()
+
+        if metrics is None:
+            return super().request(method, url, *args, **kwargs)
+
+        route = api_route(method, url)
+        start = time.perf_counter()
+
+        try:
+            req = super().request(method, url, *args, **kwargs)
+
+        except requests.exceptions.RequestException:
+            metrics.observe('api', route, time.perf_counter() - start, error=True)
+            raise
+
+        # streamed bodies have not been read yet
+        if kwargs.get('stream'):
+            nbytes = int(req.headers.get('Content-Length', 0))
+        else:
+            nbytes = len(req.content)
+
+        retries = getattr(req.raw, 'retries', None)
+
+        metrics.observe('api', route, time.perf_counter() - start, nbytes=nbytes,
+                        error=req.status_code >= 500,
+                        retries=len(retries.history) if retries is not None else 0)
+
+        return req
+
+
+def get_session():
+    '''
+    Return the requests.Session shared by all the wrapper functions, creating
+    it on first use.
+    '''
+
+    global _session  # pylint: disable=global-statement,invalid-name
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = InstrumentedSession()
+                retry = Retry(total=MAX_RETRIES, backoff_factor=RETRY_BACKOFF,
+                              status_forcelist=(502, 503, 504), raise_on_status=False)
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE,
+                                      max_retries=retry)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+
+    return _session
+
+
+class ResponseCache():
+    '''
+    Class that holds a size-bounded LRU cache of GET responses keyed by url,
+    params and authorization header.
+
+    A response younger than ttl seconds is returned without contacting the
+    server.  Older responses are revalidated with If-None-Match /
+    If-Modified-Since when the server supplied an ETag / Last-Modified
+    header, a 304 reply renews the cached response.
+    '''
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hits(self):
+        '''
+        Getter method for the _hits property
+        '''
+        return self._hits
+
+    @property
+    def misses(self):
+        '''
+        Getter method for the _misses property
+        '''
+        return self._misses
+
+    @staticmethod
+    def _key(url, headers, params):
+        # multi-valued params (lists) are converted to tuples so the key is
+        # hashable
+        params = tuple(sorted((name, tuple(value) if isinstance(value, (list, tuple)) else value)
+                              for name, value in (params or {}).items()))
+
+        return (url, params, (headers or {}).get('Authorization'))
+
+    def get(self, url, headers=None, params=None):
+        '''
+        Return the response for the GET request, from the cache when possible.
+        '''
+
+        key = self._key(url, headers, params)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+                if time.monotonic() - entry[0] < self._ttl:
+                    self._hits += 1
+                    return entry[1]
+
+        request_headers = dict(headers or {})
+
+        if entry is not None:
+            if entry[1].headers.get('ETag'):
+                request_headers['If-None-Match'] = entry[1].headers['ETag']
+            if entry[1].headers.get('Last-Modified'):
+                request_headers['If-Modified-Since'] = entry[1].headers['Last-Modified']
+
+        req = get_session().get(url, headers=request_headers, params=params)
+
+        with self._lock:
+            if req.status_code == 304 and entry is not None:
+                self._hits += 1
+                response = entry[1]
+
+            else:
+                self._misses += 1
+                response = req
+
+                if req.status_code != 200:
+                    self._entries.pop(key, None)
+                    return req
+
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+        return response
+
+    def remove(self, key):
+        '''
+        Remove a single cached response.
+        '''
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, api_path=None):
+        '''
+        Remove the cached responses for urls containing api_path, or every
+        cached response when api_path is None.
+        '''
+
+        with self._lock:
+            if api_path is None:
+                self._entries.clear()
+                return
+
+            for key in [key for key in self._entries if api_path in key[0]]:
+                del self._entries[key]
+
+
+def enable_cache(max_size=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL):
+    '''
+    Enable the response cache used by the cruise, lowering, event template
+    and custom var lookups.
+    '''
+
+    global _cache  # pylint: disable=global-statement,invalid-name
+    _cache = ResponseCache(max_size, ttl)
+
+    return _cache
+
+
+def disable_cache():
+    '''
+    Disable and discard the response cache.
+    '''
+
+    global _cache  # pylint: disable=global-statement,invalid-name
+    _cache = None
+
+
+def get_cache():
+    '''
+    Return the response cache or None if it is not enabled.
+    '''
+
+    return _cache
+
+
+def cached_get(url, headers=None, params=None):
+    '''
+    Submit a GET request through the response cache when it is enabled.
+    '''
+
+    if _cache is None:
+        return get_session().get(url, headers=headers, params=params)
+
+    return _cache.get(url, headers=headers, params=params)
+
+
+def invalidate_cache(api_path=None):
+    '''
+    Remove the cached responses for urls containing api_path, or every cached
+    response when api_path is None.
+    '''
+
+    if _cache is not None:
+        _cache.invalidate(api_path)
+
+
+def invalidate_cache_by_sub(ws_path):
+    '''
+    Remove the cached responses made stale by a message published to the
+    ws_path websocket subscription.
+    '''
+
+    for api_path in CACHE_INVALIDATION_SUBS.get(ws_path, []):
+        invalidate_cache(api_path)
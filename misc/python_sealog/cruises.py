@@ -17,15 +17,13 @@ LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for det
                 Copyright (C) OceanDataTools.org 2024
 '''
 
-import sys
 import json
 import logging
 import requests
 
-from os.path import dirname, realpath
-sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
-
 from misc.python_sealog.settings import API_SERVER_URL, HEADERS, CRUISES_API_PATH
+from misc.python_sealog.json_backend import loads
+from misc.python_sealog.api_client import cached_get
 
 
 def get_cruise(cruise_uid, export_format='json', api_server_url=API_SERVER_URL, headers=HEADERS):
@@ -41,11 +39,11 @@ def get_cruise(cruise_uid, export_format='json', api_server_url=API_SERVER_URL,
 
     try:
         url = api_server_url + CRUISES_API_PATH + '/' + cruise_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -75,11 +73,11 @@ def get_cruises(export_format='json', api_server_url=API_SERVER_URL, headers=HEA
 
     try:
         url = api_server_url + CRUISES_API_PATH
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -113,10 +111,10 @@ def get_cruise_uid_by_id(cruise_id, api_server_url=API_SERVER_URL, headers=HEADE
 
     try:
         url = api_server_url + CRUISES_API_PATH
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
-            cruise = json.loads(req.text)[0]
+            cruise = loads(req.content)[0]
 
             return cruise['id']
 
@@ -146,11 +144,11 @@ def get_cruise_by_id(cruise_id, export_format='json', api_server_url=API_SERVER_
 
     try:
         url = api_server_url + CRUISES_API_PATH
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)[0]
+                return loads(req.content)[0]
 
             if export_format == 'csv':
                 return req.text
@@ -182,11 +180,11 @@ def get_cruise_by_lowering(lowering_uid, export_format='json',
 
     try:
         url = api_server_url + CRUISES_API_PATH + '/bylowering/' + lowering_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -218,11 +216,11 @@ def get_cruise_by_event(event_uid, export_format='json', api_server_url=API_SERV
 
     try:
         url = api_server_url + CRUISES_API_PATH + '/byevent/' + event_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -17,15 +17,13 @@ LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for det
                 Copyright (C) OceanDataTools.org 2024
 '''
 
-import sys
 import json
 import logging
 import requests
 
-from os.path import dirname, realpath
-sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
-
 from misc.python_sealog.settings import API_SERVER_URL, HEADERS, CUSTOM_VAR_API_PATH
+from misc.python_sealog.json_backend import dumps, LazyJSON, loads
+from misc.python_sealog.api_client import cached_get, get_session, invalidate_cache
 
 
 def get_custom_var(var_uid, api_server_url=API_SERVER_URL, headers=HEADERS):
@@ -35,12 +33,12 @@ def get_custom_var(var_uid, api_server_url=API_SERVER_URL, headers=HEADERS):
 
     try:
         url = api_server_url + CUSTOM_VAR_API_PATH + '/' + var_uid
-        req = requests.get(url, headers=headers)
+        req = cached_get(url, headers=headers)
         logging.debug(req.text)
 
         if req.status_code != 404:
-            custom_var = json.loads(req.text)
-            logging.debug(json.dumps(custom_var))
+            custom_var = loads(req.content)
+            logging.debug("%s", LazyJSON(custom_var))
             return custom_var
 
     except requests.exceptions.RequestException as exc:
@@ -65,11 +63,11 @@ def get_custom_var_uid_by_name(var_name, api_server_url=API_SERVER_URL, headers=
 
     try:
         url = api_server_url + CUSTOM_VAR_API_PATH
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
         logging.debug(req.text)
 
         if req.status_code != 404:
-            custom_var = json.loads(req.text)[0]
+            custom_var = loads(req.content)[0]
             return custom_var['id']
 
     except requests.exceptions.RequestException as exc:
@@ -94,11 +92,11 @@ def get_custom_var_by_name(var_name, api_server_url=API_SERVER_URL, headers=HEAD
 
     try:
         url = api_server_url + CUSTOM_VAR_API_PATH
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
         logging.debug(req.text)
 
         if req.status_code != 404:
-            return json.loads(req.text)[0]
+            return loads(req.content)[0]
 
     except requests.exceptions.RequestException as exc:
         logging.error(str(exc))
@@ -119,8 +117,9 @@ def set_custom_var(var_uid, value, api_server_url=API_SERVER_URL, headers=HEADER
     try:
         payload = {"custom_var_value": value}
         url = api_server_url + CUSTOM_VAR_API_PATH + '/' + var_uid
-        req = requests.patch(url, headers=headers, data=json.dumps(payload))
+        req = get_session().patch(url, headers=headers, data=dumps(payload))
         logging.debug(req.text)
+        invalidate_cache(CUSTOM_VAR_API_PATH)
 
     except requests.exceptions.RequestException as exc:
         logging.error(str(exc))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+'''
+FILE:           dataframes.py
+
+DESCRIPTION:    This script contains the functions for retrieving the
+                event_exports as pandas DataFrames.  The records are built
+                directly from the json response with the aux_data pivoted
+                into columns named the same as the csv export format, so
+                there is no csv serialization round-trip.
+
+BUGS:
+NOTES:          Requires the pandas module.
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+try:
+    import pandas as pd
+    PANDAS_REQS = True
+except (ModuleNotFoundError, ImportError):
+    PANDAS_REQS = False
+
+from misc.python_sealog.settings import API_SERVER_URL, HEADERS
+from misc.python_sealog.profiling import phase
+from misc.python_sealog.event_exports import (
+    flatten_event_export, get_event_exports, get_event_exports_by_cruise,
+    get_event_exports_by_lowering
+)
+
+TS_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+
+def _is_aux_data_value(column):
+    return column.endswith('_value') and '.' in column and not column.startswith('event_option.')
+
+
+def event_exports_to_dataframe(events, columns=None):
+    '''
+    Convert event_export records to a DataFrame with one row per event.
+    Optionally set columns to only build those columns, a ValueError is raised
+    if any of them are not found.  The ts column is parsed to UTC datetimes in
+    a single step and the aux_data value columns are converted to numbers when all of their
+    values are numeric.
+    '''
+
+    if not PANDAS_REQS:
+        raise RuntimeError('Python module pandas not found. Please install using '
+                           '"pip install pandas" prior to using the event_exports '
+                           'DataFrame functions.')
+
+    if not events:
+        return pd.DataFrame(columns=columns)
+
+    with phase('pandas'):
+        data = pd.DataFrame.from_records([flatten_event_export(event, columns) for event in events])
+
+        if columns is not None:
+            missing = [column for column in columns if column not in data.columns]
+
+            if missing:
+                raise ValueError(f"Columns not found in event_exports: {', '.join(missing)}")
+
+            data = data[list(columns)]
+
+        if 'ts' in data:
+            data['ts'] = pd.to_datetime(data['ts'], format=TS_FORMAT, utc=True)
+
+        for column in [column for column in data.columns if _is_aux_data_value(column)]:
+            try:
+                data[column] = pd.to_numeric(data[column])
+            except (ValueError, TypeError):
+                pass
+
+    return data
+
+
+def get_event_exports_dataframe(columns=None,  # pylint: disable=too-many-arguments
+                                event_filter=None, start_ts=None, stop_ts=None,
+                                api_server_url=API_SERVER_URL, headers=HEADERS):
+    '''
+    Return the event_exports between start_ts and stop_ts as a DataFrame.
+    '''
+
+    events = get_event_exports(event_filter=event_filter, start_ts=start_ts, stop_ts=stop_ts,
+                               api_server_url=api_server_url, headers=headers)
+
+    return event_exports_to_dataframe(events, columns) if events is not None else None
+
+
+def get_event_exports_dataframe_by_cruise(cruise_uid, columns=None, event_filter=None,
+                                          api_server_url=API_SERVER_URL, headers=HEADERS):
+    '''
+    Return the event_exports for the cruise with the given cruise_uid as a
+    DataFrame.
+    '''
+
+    events = get_event_exports_by_cruise(cruise_uid, event_filter=event_filter,
+                                         api_server_url=api_server_url, headers=headers)
+
+    return event_exports_to_dataframe(events, columns) if events is not None else None
+
+
+def get_event_exports_dataframe_by_lowering(lowering_uid, columns=None, event_filter=None,
+                                            api_server_url=API_SERVER_URL, headers=HEADERS):
+    '''
+    Return the event_exports for the lowering with the given lowering_uid as a
+    DataFrame.
+    '''
+
+    events = get_event_exports_by_lowering(lowering_uid, event_filter=event_filter,
+                                           api_server_url=api_server_url, headers=headers)
+
+    return event_exports_to_dataframe(events, columns) if events is not None else None
@@ -22,6 +22,14 @@ import copy
 import logging
 from jsonschema import validate
 
+if __package__:
+    from misc.python_sealog.profiling import add_profile_arguments, start_profiling, phase
+else:
+    # run as a script by sealog_import_from_file.sh
+    from profiling import (  # pylint: disable=import-error
+        add_profile_arguments, start_profiling, phase
+    )
+
 cruise_schema = {
     "type": "object",
     "properties": {
@@ -200,16 +208,18 @@ def _convert_aux_data_record(record):
 def _convert_record_fn(record_fn, conv_func, validate_func):
 
     try:
-        with open(record_fn, 'r', encoding='utf-8') as record_fp:
+        with phase('file_read'), open(record_fn, 'r', encoding='utf-8') as record_fp:
             record = json.load(record_fp)
 
-            if isinstance(record, dict):
-                record = [record]
+        if isinstance(record, dict):
+            record = [record]
 
-            logging.info("Validating record(s)")
+        logging.info("Validating record(s)")
+        with phase('validate'):
             list(map(validate_func, record))
 
-            logging.info("Converting record(s)")
+        logging.info("Converting record(s)")
+        with phase('convert'):
             return list(map(conv_func, record))
 
     except Exception as exc:
@@ -297,6 +307,8 @@ if __name__ == '__main__':
                         help='type of records contained in file (cruise, lowering, event, aux_data)')
     parser.add_argument('record_file', help=' records file to import')
 
+    add_profile_arguments(parser)
+
     parsed_args = parser.parse_args()
 
     ############################
@@ -310,6 +322,8 @@ if __name__ == '__main__':
     parsed_args.verbosity = min(parsed_args.verbosity, max(LOG_LEVELS))
     logging.getLogger().setLevel(LOG_LEVELS[parsed_args.verbosity])
 
+    start_profiling(parsed_args)
+
     if not os.path.isfile(parsed_args.record_file):
         logging.error("%s does not exist.", parsed_args.record_file)
         sys.exit(os.EX_DATAERR)
@@ -17,15 +17,13 @@ LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for det
                 Copyright (C) OceanDataTools.org 2024
 '''
 
-import sys
 import json
 import logging
 import requests
 
-from os.path import dirname, realpath
-sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
-
 from misc.python_sealog.settings import API_SERVER_URL, HEADERS, EVENT_AUX_DATA_API_PATH
+from misc.python_sealog.json_backend import dumps, LazyJSON, loads
+from misc.python_sealog.api_client import get_session
 
 
 def get_event_aux_data_by_cruise(cruise_uid, datasource=None, limit=0,
@@ -50,11 +48,11 @@ def get_event_aux_data_by_cruise(cruise_uid, datasource=None, limit=0,
 
     try:
         url = api_server_url + EVENT_AUX_DATA_API_PATH + '/bycruise/' + cruise_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
         if req.status_code != 404:
-            event_aux_data = json.loads(req.text)
-            logging.debug(json.dumps(event_aux_data))
+            event_aux_data = loads(req.content)
+            logging.debug("%s", LazyJSON(event_aux_data))
             return event_aux_data
 
     except requests.exceptions.RequestException as exc:
@@ -90,10 +88,10 @@ def get_event_aux_data_by_lowering(lowering_uid, datasource=None, limit=0,
 
     try:
         url = api_server_url + EVENT_AUX_DATA_API_PATH + '/bylowering/' + lowering_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
-        event_aux_data = json.loads(req.text)
-        logging.debug(json.dumps(event_aux_data))
+        event_aux_data = loads(req.content)
+        logging.debug("%s", LazyJSON(event_aux_data))
         return event_aux_data
 
     except requests.exceptions.RequestException as exc:
@@ -105,16 +103,73 @@ def get_event_aux_data_by_lowering(lowering_uid, datasource=None, limit=0,
         raise exc
 
 
+def get_event_aux_data(datasource=None, start_ts=None,  # pylint: disable=too-many-arguments
+                       stop_ts=None, limit=0, offset=0, api_server_url=API_SERVER_URL,
+                       headers=HEADERS):
+    '''
+    Return the aux_data records for the events between start_ts and stop_ts
+    with the optional datasource.  Use limit and offset to page through large
+    result sets.
+    '''
+    datasource = datasource or []
+
+    if not isinstance(datasource, list):
+        datasource = [datasource]
+
+    params = {}
+
+    if datasource:
+        params['datasource'] = datasource
+
+    if start_ts is not None:
+        params['startTS'] = start_ts
+
+    if stop_ts is not None:
+        params['stopTS'] = stop_ts
+
+    if limit > 0:
+        params['limit'] = limit
+
+    if offset > 0:
+        params['offset'] = offset
+
+    try:
+        url = api_server_url + EVENT_AUX_DATA_API_PATH
+        req = get_session().get(url, headers=headers, params=params)
+
+        if req.status_code == 200:
+            return loads(req.content)
+
+        if req.status_code == 404:
+            return []
+
+    except requests.exceptions.RequestException as exc:
+        logging.error(str(exc))
+        raise exc
+
+    except json.JSONDecodeError as exc:
+        logging.error(str(exc))
+        raise exc
+
+    return None
+
+
 def create_event_aux_data(payload, api_server_url=API_SERVER_URL, headers=HEADERS):
     '''
-    Add an aux_data records.
+    Add an aux_data records.  Returns True if the record was saved.
     '''
 
     try:
         url = f'{api_server_url}{EVENT_AUX_DATA_API_PATH}'
-        req = requests.post(url, headers=headers, data=json.dumps(payload))
+        req = get_session().post(url, headers=headers, data=dumps(payload))
         logging.debug(req.text)
 
+        if req.status_code in (201, 204):
+            return True
+
+        logging.error("Unable to save the aux_data record, server returned %s", req.status_code)
+        return False
+
     except requests.exceptions.RequestException as exc:
         logging.error(str(exc))
         raise exc
@@ -130,7 +185,7 @@ def delete_event_aux_data(aux_data_uid, api_server_url=API_SERVER_URL,
 
     try:
         url = api_server_url + EVENT_AUX_DATA_API_PATH + '/' + aux_data_uid
-        requests.delete(url, headers=headers, params=params)
+        get_session().delete(url, headers=headers, params=params)
 
     except requests.exceptions.RequestException as exc:
         logging.error(str(exc))
@@ -17,15 +17,13 @@ LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for det
                 Copyright (C) OceanDataTools.org 2024
 '''
 
-import sys
 import json
 import logging
 import requests
 
-from os.path import dirname, realpath
-sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
-
 from misc.python_sealog.settings import API_SERVER_URL, HEADERS, EVENT_EXPORTS_API_PATH
+from misc.python_sealog.json_backend import LazyJSON, loads
+from misc.python_sealog.api_client import get_session
 
 
 def get_event_export(event_uid,
@@ -50,11 +48,11 @@ def get_event_export(event_uid,
 
     try:
         url = api_server_url + EVENT_EXPORTS_API_PATH + '/' + event_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
         if req.status_code != 404:
-            event = json.loads(req.text)
-            logging.debug(json.dumps(event))
+            event = loads(req.content)
+            logging.debug("%s", LazyJSON(event))
             return event
 
     except requests.exceptions.RequestException as exc:
@@ -105,12 +103,12 @@ def get_event_exports(export_format='json',
 
     try:
         url = api_server_url + EVENT_EXPORTS_API_PATH
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
         if req.status_code != 404:
 
             if export_format == 'json':
-                events = json.loads(req.text)
+                events = loads(req.content)
                 return events
 
             return req.text
@@ -155,12 +153,12 @@ def get_event_exports_by_cruise(cruise_uid,
 
     try:
         url = api_server_url + EVENT_EXPORTS_API_PATH + '/bycruise/' + cruise_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
         if req.status_code != 404:
 
             if export_format == 'json':
-                events = json.loads(req.text)
+                events = loads(req.content)
                 return events
 
             return req.text
@@ -206,12 +204,12 @@ def get_event_exports_by_lowering(lowering_uid,
 
     try:
         url = api_server_url + EVENT_EXPORTS_API_PATH + '/bylowering/' + lowering_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
         if req.status_code != 404:
 
             if export_format == 'json':
-                events = json.loads(req.text)
+                events = loads(req.content)
                 return events
 
             return req.text
@@ -225,3 +223,62 @@ def get_event_exports_by_lowering(lowering_uid,
         raise exc
 
     return None
+
+
+def _unique_name(names, name, suffix=''):
+    '''
+    Return the first of name, name_2, name_3... not already in names.
+    '''
+
+    if name + suffix not in names:
+        return name
+
+    enumerator = 2
+    while f'{name}_{enumerator}{suffix}' in names:
+        enumerator += 1
+
+    return f'{name}_{enumerator}'
+
+
+def flatten_event_export(event, columns=None):
+    '''
+    Flatten an event_export record into a single level dict using the same
+    column names as the csv export format: <data_source>.<data_name>_value,
+    <data_source>.<data_name>_uom and event_option.<event_option_name>.
+    Optionally set columns to only include those columns, the aux_data for
+    other data_sources is skipped entirely.
+    '''
+
+    columns = set(columns) if columns is not None else None
+    names = set(event.keys())
+
+    flat_event = {key: value for key, value in event.items()
+                  if key not in ('aux_data', 'event_options')
+                  and (columns is None or key in columns)}
+
+    data_sources = None if columns is None else {column.split('.', 1)[0]
+                                                 for column in columns if '.' in column}
+
+    for aux_data in event.get('aux_data', []):
+        if data_sources is not None and aux_data['data_source'] not in data_sources:
+            continue
+
+        for data in aux_data['data_array']:
+            name = _unique_name(names, f"{aux_data['data_source']}.{data['data_name']}", '_value')
+            names.update((name + '_value', name + '_uom'))
+
+            if columns is None or name + '_value' in columns:
+                flat_event[name + '_value'] = data['data_value']
+
+            if columns is None or name + '_uom' in columns:
+                flat_event[name + '_uom'] = data.get('data_uom')
+
+    if data_sources is None or 'event_option' in data_sources:
+        for option in event.get('event_options', []):
+            name = _unique_name(names, f"event_option.{option['event_option_name']}")
+            names.add(name)
+
+            if columns is None or name in columns:
+                flat_event[name] = option['event_option_value']
+
+    return flat_event
@@ -17,15 +17,13 @@ LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for det
                 Copyright (C) OceanDataTools.org 2024
 '''
 
-import sys
 import json
 import logging
 import requests
 
-from os.path import dirname, realpath
-sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
-
 from misc.python_sealog.settings import API_SERVER_URL, HEADERS, EVENT_TEMPLATES_API_PATH
+from misc.python_sealog.json_backend import LazyJSON, loads
+from misc.python_sealog.api_client import cached_get
 
 
 def get_event_templates(system=True, non_system=True, api_server_url=API_SERVER_URL,
@@ -40,10 +38,10 @@ def get_event_templates(system=True, non_system=True, api_server_url=API_SERVER_
 
     try:
         url = api_server_url + EVENT_TEMPLATES_API_PATH
-        req = requests.get(url, headers=headers)
+        req = cached_get(url, headers=headers)
 
         if req.status_code != 404:
-            event_templates = json.loads(req.text)
+            event_templates = loads(req.content)
 
             if not system:
                 event_templates = [template for template in event_templates if not template['system_template']]
@@ -51,7 +49,7 @@ def get_event_templates(system=True, non_system=True, api_server_url=API_SERVER_
             if not non_system:
                 event_templates = [template for template in event_templates if template['system_template']]
 
-            logging.debug(json.dumps(event_templates))
+            logging.debug("%s", LazyJSON(event_templates))
             return event_templates
 
         return []
@@ -17,15 +17,34 @@ LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for det
                 Copyright (C) OceanDataTools.org 2024
 '''
 
-import sys
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import requests
 
-from os.path import dirname, realpath
-sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
-
 from misc.python_sealog.settings import API_SERVER_URL, HEADERS, EVENTS_API_PATH
+from misc.python_sealog.json_backend import dumps, loads
+from misc.python_sealog.api_client import get_session
+
+# number of events submitted per request by create_events
+DEFAULT_BATCH_SIZE = 500
+
+# number of requests create_events submits concurrently
+DEFAULT_BATCH_WORKERS = 4
+
+
+class CreateEventsError(Exception):
+    '''
+    Raised by create_events when one or more batches could not be added.
+    inserted is the number of events added by the other batches and failed
+    is the list of event payloads that were not added, so they can be
+    retried.
+    '''
+
+    def __init__(self, inserted, failed):
+        super().__init__(f"Unable to add {len(failed)} events, {inserted} events added")
+        self.inserted = inserted
+        self.failed = failed
 
 
 def get_event(event_uid,
@@ -46,11 +65,11 @@ def get_event(event_uid,
 
     try:
         url = api_server_url + EVENTS_API_PATH + '/' + event_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -73,13 +92,16 @@ def get_events(export_format='json',
                event_filter=None,
                start_ts=None,
                stop_ts=None,
+               limit=0,
+               offset=0,
                api_server_url=API_SERVER_URL,
                headers=HEADERS):
     '''
     Return event records based on the cruise_uid.  Returns the records as json
     objects by default.  Set export_format to 'csv' to return the records in
     csv format.  Optionally define an event_filter to filter the returned
-    events.
+    events.  Use limit and offset to page through large result sets, records
+    are returned oldest first.
     '''
 
     event_filter = event_filter or []
@@ -102,13 +124,19 @@ def get_events(export_format='json',
     if stop_ts is not None:
         params['stopTS'] = stop_ts
 
+    if limit > 0:
+        params['limit'] = limit
+
+    if offset > 0:
+        params['offset'] = offset
+
     try:
         url = api_server_url + EVENTS_API_PATH
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -159,11 +187,11 @@ def get_events_by_cruise(cruise_uid,
 
     try:
         url = api_server_url + EVENTS_API_PATH + '/bycruise/' + cruise_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -215,12 +243,12 @@ def get_events_by_lowering(lowering_uid,
 
     try:
         url = api_server_url + EVENTS_API_PATH + '/bylowering/' + lowering_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
         if req.status_code == 200:
 
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -243,8 +271,70 @@ def get_events_by_lowering(lowering_uid,
     return None
 
 
+def create_event(payload, api_server_url=API_SERVER_URL, headers=HEADERS):
+    '''
+    Add an event record.  Returns True if the record was saved.
+    '''
+
+    try:
+        url = api_server_url + EVENTS_API_PATH
+        req = get_session().post(url, headers=headers, data=dumps(payload))
+        logging.debug(req.text)
+
+        if req.status_code == 201:
+            return True
+
+        logging.error("Unable to save the event record, server returned %s", req.status_code)
+        return False
+
+    except requests.exceptions.RequestException as exc:
+        logging.error(str(exc))
+        raise exc
+
+
+def create_events(payloads, batch_size=DEFAULT_BATCH_SIZE,  # pylint: disable=too-many-arguments
+                  workers=DEFAULT_BATCH_WORKERS, api_server_url=API_SERVER_URL,
+                  headers=HEADERS):
+    '''
+    Add several event records.  The events are submitted to the bulk route in
+    batches of batch_size, up to workers batches at a time.  Returns the
+    number of events added.  If any batch is not added, CreateEventsError is
+    raised once all the batches have been submitted, listing the events in
+    the failed batches.
+    '''
+
+    url = api_server_url + EVENTS_API_PATH + '/bulk'
+    batches = [payloads[i:i + batch_size] for i in range(0, len(payloads), batch_size)]
+
+    def _submit(batch):
+        try:
+            req = get_session().post(url, headers=headers, data=dumps(batch))
+
+        except requests.exceptions.RequestException as exc:
+            logging.error("Unable to add %d events: %s", len(batch), str(exc))
+            return None
+
+        if req.status_code == 201:
+            return loads(req.content)['insertedCount']
+
+        logging.error("Unable to add %d events: %s", len(batch), req.text)
+        return None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(executor.map(_submit, batches))
+
+    inserted = sum(result for result in results if result is not None)
+    failed = [payload for batch, result in zip(batches, results) if result is None
+              for payload in batch]
+
+    if failed:
+        raise CreateEventsError(inserted, failed)
+
+    return inserted
+
+
 def delete_event(event_uid, api_server_url=API_SERVER_URL,
-                          headers=HEADERS):
+                 headers=HEADERS):
     '''
     Delete the event record.
     '''
@@ -253,7 +343,7 @@ def delete_event(event_uid, api_server_url=API_SERVER_URL,
 
     try:
         url = api_server_url + EVENTS_API_PATH + '/' + event_uid
-        requests.delete(url, headers=headers, params=params)
+        get_session().delete(url, headers=headers, params=params)
 
     except requests.exceptions.RequestException as exc:
         logging.error(str(exc))
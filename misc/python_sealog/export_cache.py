@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+'''
+FILE:           export_cache.py
+
+DESCRIPTION:    This script contains the functions for saving the
+                event_exports for a cruise or lowering to a local columnar
+                (Arrow IPC) file and reading them back.  The aux_data is
+                flattened into typed columns named the same as the csv export
+                format.  Cached files are memory-mapped when read and only the
+                requested columns are loaded.
+
+BUGS:
+NOTES:          Requires the pandas and pyarrow modules.
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import os
+import logging
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+    PYARROW_REQS = True
+except (ModuleNotFoundError, ImportError):
+    PYARROW_REQS = False
+
+from os.path import dirname, expanduser, isfile, join, realpath
+
+from misc.python_sealog.settings import API_SERVER_URL, HEADERS
+from misc.python_sealog.dataframes import event_exports_to_dataframe
+from misc.python_sealog.event_exports import (
+    get_event_exports_by_cruise, get_event_exports_by_lowering
+)
+
+DEFAULT_CACHE_DIR = join(expanduser('~'), '.cache', 'sealog', 'event_exports')
+
+
+def _check_reqs():
+    if not PYARROW_REQS:
+        raise RuntimeError('Python module pyarrow not found. Please install using '
+                           '"pip install pyarrow" prior to using the event_exports '
+                           'cache.')
+
+
+def event_exports_to_table(events):
+    '''
+    Convert event_export records to a pyarrow Table with one row per event.
+    '''
+
+    _check_reqs()
+
+    return pa.Table.from_pandas(event_exports_to_dataframe(events), preserve_index=False)
+
+
+def save_event_exports(events, filename):
+    '''
+    Save event_export records to an Arrow IPC file.  The file is written
+    uncompressed so it can be memory-mapped when read.
+    '''
+
+    table = event_exports_to_table(events)
+
+    os.makedirs(dirname(realpath(filename)), exist_ok=True)
+    feather.write_feather(table, filename, compression='uncompressed')
+
+    return table
+
+
+def load_event_exports(filename, columns=None):
+    '''
+    Read the event_exports from an Arrow IPC file.  Only the specified
+    columns are loaded.
+    '''
+
+    _check_reqs()
+
+    return feather.read_table(filename, columns=columns, memory_map=True)
+
+
+def _get_cached_event_exports(filename, fetch, columns, refresh):
+    '''
+    Return the cached event_exports, retrieving and saving them first if the
+    file does not exist or refresh is True.
+    '''
+
+    _check_reqs()
+
+    if refresh or not isfile(filename):
+        logging.info("Retrieving event_exports for %s", filename)
+        events = fetch()
+
+        if events is None:
+            return None
+
+        save_event_exports(events, filename)
+
+    return load_event_exports(filename, columns)
+
+
+def get_event_exports_table_by_cruise(cruise_uid,  # pylint: disable=too-many-arguments
+                                      columns=None, cache_dir=DEFAULT_CACHE_DIR, refresh=False,
+                                      api_server_url=API_SERVER_URL, headers=HEADERS):
+    '''
+    Return the event_exports for the cruise with the given cruise_uid as a
+    pyarrow Table, from the local cache when available.  Set refresh to True
+    to retrieve the records from the API again.
+    '''
+
+    return _get_cached_event_exports(
+        join(cache_dir, f'cruise_{cruise_uid}.arrow'),
+        lambda: get_event_exports_by_cruise(cruise_uid, api_server_url=api_server_url,
+                                            headers=headers),
+        columns, refresh)
+
+
+def get_event_exports_table_by_lowering(lowering_uid,  # pylint: disable=too-many-arguments
+                                        columns=None, cache_dir=DEFAULT_CACHE_DIR, refresh=False,
+                                        api_server_url=API_SERVER_URL, headers=HEADERS):
+    '''
+    Return the event_exports for the lowering with the given lowering_uid as a
+    pyarrow Table, from the local cache when available.  Set refresh to True
+    to retrieve the records from the API again.
+    '''
+
+    return _get_cached_event_exports(
+        join(cache_dir, f'lowering_{lowering_uid}.arrow'),
+        lambda: get_event_exports_by_lowering(lowering_uid, api_server_url=api_server_url,
+                                              headers=headers),
+        columns, refresh)
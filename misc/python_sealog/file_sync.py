@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+'''
+FILE:           file_sync.py
+
+DESCRIPTION:    This script contains the functions used by the export scripts
+                to copy the framegrabs and uploaded files to the export
+                directories in place of rsync.  Files are copied (or
+                hardlinked) by a pool of threads and every copy is recorded
+                in a manifest saved in the destination directory along with
+                the size and mtime of the source file and the hash of its
+                content.  When the export is re-run a file is only copied
+                again if its source has changed, the destination is not
+                stat'd, and a source with a new mtime but the same content
+                is not copied again.
+
+                Hardlinking the files when the export directory is on the
+                same filesystem as the sealog-server files avoids copying
+                the same framegrabs to every export destination.
+
+BUGS:
+NOTES:          Files that are changed in the destination directory by other
+                programs are not detected, delete the manifest to force every
+                file to be copied again.
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import os
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from misc.python_sealog.json_backend import dumps, loads
+
+MANIFEST_FILENAME = '.sealog_sync_manifest.json'
+
+DEFAULT_WORKERS = 8
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class SyncStats():  # pylint: disable=too-many-instance-attributes
+    '''
+    Class that counts the files and bytes handled by a sync.
+    '''
+
+    def __init__(self):
+        self.files = 0
+        self.copied = 0
+        self.linked = 0
+        self.skipped = 0
+        self.deleted = 0
+        self.failed = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, result, size=0):
+        '''
+        Count a file as copied, linked, skipped or failed.
+        '''
+
+        with self._lock:
+            setattr(self, result, getattr(self, result) + 1)
+
+            if result in ('copied', 'linked'):
+                self.bytes += size
+
+    @property
+    def throughput(self):
+        '''
+        Getter method for the throughput property, bytes copied or linked per
+        second.
+        '''
+
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self):
+        '''
+        Return the stats as a dict that can be serialized to json.
+        '''
+
+        return {
+            'files': self.files,
+            'copied': self.copied,
+            'linked': self.linked,
+            'skipped': self.skipped,
+            'deleted': self.deleted,
+            'failed': self.failed,
+            'bytes': self.bytes,
+            'elapsed': self.elapsed,
+            'throughput': self.throughput
+        }
+
+    def summary(self):
+        '''
+        Return the stats as a single line for logging.
+        '''
+
+        return (f"{self.files} files, {self.copied} copied, {self.linked} linked, "
+                f"{self.skipped} unchanged, {self.deleted} deleted, {self.failed} failed, "
+                f"{self.bytes / 1e6:0.1f} MB in {self.elapsed:0.2f}s "
+                f"({self.throughput / 1e6:0.1f} MB/s)")
+
+
+def _load_manifest(dest_dir):
+    try:
+        with open(os.path.join(dest_dir, MANIFEST_FILENAME), 'rb') as manifest_fp:
+            return loads(manifest_fp.read())
+
+    except FileNotFoundError:
+        return {}
+
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logging.warning("Unable to read the sync manifest in %s, copying all files", dest_dir)
+        logging.debug(str(exc))
+        return {}
+
+
+def _save_manifest(dest_dir, manifest):
+    filepath = os.path.join(dest_dir, MANIFEST_FILENAME)
+
+    with open(filepath + '.part', 'w', encoding='utf-8') as manifest_fp:
+        manifest_fp.write(dumps(manifest))
+
+    os.replace(filepath + '.part', filepath)
+
+
+def _hash_file(filepath):
+    hasher = hashlib.blake2b()
+
+    with open(filepath, 'rb') as src_fp:
+        while chunk := src_fp.read(CHUNK_SIZE):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+def _copy_file(src, dst):
+    '''
+    Copy src to dst through a .part file, returns the hash of the content.
+    '''
+
+    hasher = hashlib.blake2b()
+
+    with open(src, 'rb') as src_fp, open(dst + '.part', 'wb') as dst_fp:
+        while chunk := src_fp.read(CHUNK_SIZE):
+            hasher.update(chunk)
+            dst_fp.write(chunk)
+
+    shutil.copystat(src, dst + '.part')
+    os.replace(dst + '.part', dst)
+
+    return hasher.hexdigest()
+
+
+def _link_file(src, dst):
+    '''
+    Hardlink src to dst, returns False if the files are on different
+    filesystems or the filesystem does not support hardlinks.
+    '''
+
+    try:
+        os.link(src, dst + '.part')
+
+    except OSError:
+        return False
+
+    os.replace(dst + '.part', dst)
+    return True
+
+
+def _sync_file(src_dir, dest_dir, filename,  # pylint: disable=too-many-arguments
+               entry, existing, hardlink):
+    '''
+    Copy a single file unless the manifest entry shows it is unchanged.
+    Returns the result and the new manifest entry.
+    '''
+
+    src = os.path.join(src_dir, filename)
+    dst = os.path.join(dest_dir, filename)
+
+    src_stat = os.stat(src)
+
+    if entry and filename in existing and entry['size'] == src_stat.st_size:
+        if entry['mtime'] == src_stat.st_mtime_ns:
+            return 'skipped', entry
+
+        # the source was touched, only copy it if the content changed
+        if entry.get('hash') and entry['hash'] == _hash_file(src):
+            return 'skipped', {**entry, 'mtime': src_stat.st_mtime_ns}
+
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+
+    if hardlink and _link_file(src, dst):
+        # the destination is the same file as the source so there is no
+        # need to hash it
+        return 'linked', {'size': src_stat.st_size, 'mtime': src_stat.st_mtime_ns, 'hash': None}
+
+    return 'copied', {'size': src_stat.st_size, 'mtime': src_stat.st_mtime_ns,
+                      'hash': _copy_file(src, dst)}
+
+
+def _list_dest_files(dest_dir):
+    '''
+    Return the paths of the files in dest_dir relative to dest_dir, the
+    directories are listed without stat'ing the files.
+    '''
+
+    files = set()
+
+    for root, _, filenames in os.walk(dest_dir):
+        rel_root = os.path.relpath(root, dest_dir)
+
+        for filename in filenames:
+            files.add(filename if rel_root == '.' else os.path.join(rel_root, filename))
+
+    files.discard(MANIFEST_FILENAME)
+    return files
+
+
+def _delete_files(dest_dir, filenames, stats):
+    for filename in filenames:
+        try:
+            logging.info('Deleting: %s', filename)
+            os.remove(os.path.join(dest_dir, filename))
+            stats.deleted += 1
+
+        except OSError as exc:
+            logging.debug(str(exc))
+
+    # remove any directories left empty
+    for root, dirnames, _ in os.walk(dest_dir, topdown=False):
+        for dirname in dirnames:
+            try:
+                os.rmdir(os.path.join(root, dirname))
+
+            except OSError:
+                pass
+
+
+def sync_files(src_dir, filenames, dest_dir,  # pylint: disable=too-many-arguments
+               delete=False, hardlink=False, workers=DEFAULT_WORKERS):
+    '''
+    Copy the files (paths relative to src_dir) from src_dir to dest_dir,
+    skipping the files that have not changed since they were last copied.
+    Set delete to remove the files in dest_dir that are not in filenames and
+    hardlink to link the files instead of copying them when src_dir and
+    dest_dir are on the same filesystem.  Returns a SyncStats object.
+    '''
+
+    started = time.perf_counter()
+
+    stats = SyncStats()
+    filenames = sorted(set(filenames))
+    stats.files = len(filenames)
+
+    os.makedirs(dest_dir, exist_ok=True)
+
+    manifest = _load_manifest(dest_dir)
+    existing = _list_dest_files(dest_dir)
+
+    if delete:
+        _delete_files(dest_dir, existing - set(filenames), stats)
+
+    new_manifest = {}
+
+    def _sync(filename):
+        try:
+            result, entry = _sync_file(src_dir, dest_dir, filename, manifest.get(filename),
+                                       existing, hardlink)
+
+        except OSError as exc:
+            logging.error("Unable to copy %s to %s", os.path.join(src_dir, filename), dest_dir)
+            logging.debug(str(exc))
+            stats.add('failed')
+            return
+
+        if result != 'skipped':
+            logging.debug("%s %s", result.capitalize(), filename)
+
+        new_manifest[filename] = entry
+        stats.add(result, entry['size'])
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        list(executor.map(_sync, filenames))
+
+    # keep the entries for the files that were not part of this sync unless
+    # they have been deleted
+    if not delete:
+        new_manifest = {**{filename: entry for filename, entry in manifest.items()
+                           if filename in existing},
+                        **new_manifest}
+
+    try:
+        _save_manifest(dest_dir, dict(sorted(new_manifest.items())))
+
+    except OSError as exc:
+        logging.warning("Unable to save the sync manifest in %s", dest_dir)
+        logging.debug(str(exc))
+
+    stats.elapsed = time.perf_counter() - started
+    logging.info("Synced %s: %s", dest_dir, stats.summary())
+
+    return stats
+
+
+def sync_directory(src_dir, dest_dir, delete=True,  # pylint: disable=too-many-arguments
+                   hardlink=False, workers=DEFAULT_WORKERS):
+    '''
+    Copy every file in src_dir and its sub-directories to dest_dir, by
+    default removing the files in dest_dir that are no longer in src_dir.
+    Returns a SyncStats object.  If src_dir does not exist nothing is copied
+    or deleted.
+    '''
+
+    if not os.path.isdir(src_dir):
+        logging.warning("Source directory %s not found, skipping sync to %s", src_dir, dest_dir)
+        return SyncStats()
+
+    filenames = []
+
+    for root, _, files in os.walk(src_dir):
+        rel_root = os.path.relpath(root, src_dir)
+        filenames.extend(filename if rel_root == '.' else os.path.join(rel_root, filename)
+                         for filename in files)
+
+    return sync_files(src_dir, filenames, dest_dir, delete=delete, hardlink=hardlink,
+                      workers=workers)
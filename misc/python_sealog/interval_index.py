@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+'''
+FILE:           interval_index.py
+
+DESCRIPTION:    This script contains an in-memory index of records with a
+                start/stop time range (i.e. cruises and lowerings) used to
+                find the record containing a timestamp without querying the
+                sealog-server API.
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import threading
+from bisect import bisect_right
+from datetime import datetime
+
+TS_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+
+def _parse_ts(timestamp):
+    '''
+    Convert an ISO8601 timestamp str returned by the API to a datetime object.
+    '''
+
+    if isinstance(timestamp, datetime):
+        return timestamp
+
+    return datetime.strptime(timestamp, TS_FORMAT)
+
+
+class IntervalIndex():
+    '''
+    Class that indexes records by their start_ts/stop_ts time range.
+
+    The ranges are kept sorted by start_ts along with the running maximum of
+    stop_ts so a lookup is a binary search followed by a backwards scan that
+    ends as soon as no earlier range can contain the timestamp.  When ranges
+    overlap, the record that started most recently is returned.
+    '''
+
+    def __init__(self, records=None):
+        self._records = {}
+        self._starts = []
+        self._entries = []
+        self._max_stops = []
+        self._lock = threading.Lock()
+
+        if records:
+            self.load(records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def _rebuild(self):
+        '''
+        Rebuild the sorted ranges from the records.
+        '''
+
+        entries = sorted(
+            (_parse_ts(record['start_ts']), _parse_ts(record['stop_ts']), uid)
+            for uid, record in self._records.items()
+        )
+
+        max_stops = []
+        for _, stop_ts, _ in entries:
+            max_stops.append(max(stop_ts, max_stops[-1]) if max_stops else stop_ts)
+
+        self._starts = [start_ts for start_ts, _, _ in entries]
+        self._entries = entries
+        self._max_stops = max_stops
+
+    def load(self, records):
+        '''
+        Replace the indexed records.
+        '''
+
+        with self._lock:
+            self._records = {record['id']: record for record in records}
+            self._rebuild()
+
+    def update(self, record):
+        '''
+        Add or replace a single record.
+        '''
+
+        with self._lock:
+            self._records[record['id']] = record
+            self._rebuild()
+
+    def remove(self, uid):
+        '''
+        Remove the record with the specified uid.
+        '''
+
+        with self._lock:
+            if self._records.pop(uid, None) is not None:
+                self._rebuild()
+
+    def get(self, uid):
+        '''
+        Return the record with the specified uid.
+        '''
+
+        return self._records.get(uid)
+
+    def find(self, timestamp):
+        '''
+        Return the record whose time range contains timestamp or None.
+        '''
+
+        timestamp = _parse_ts(timestamp)
+
+        with self._lock:
+            idx = bisect_right(self._starts, timestamp) - 1
+
+            while idx >= 0 and self._max_stops[idx] >= timestamp:
+                _, stop_ts, uid = self._entries[idx]
+
+                if stop_ts >= timestamp:
+                    return self._records[uid]
+
+                idx -= 1
+
+        return None
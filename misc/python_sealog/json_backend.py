@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+'''
+FILE:           json_backend.py
+
+DESCRIPTION:    This script contains the json encode/decode functions used by
+                the python_sealog modules.  The orjson module is used when it
+                is installed.  Also contains a wrapper for passing json objects
+                to the logging functions that is only serialized when the log
+                message is emitted.  Decoding is recorded as the json_decode
+                phase when profiling is enabled.
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import json
+
+from misc.python_sealog.profiling import phase
+
+try:
+    import orjson
+    ORJSON_ENABLED = True
+except (ModuleNotFoundError, ImportError):
+    ORJSON_ENABLED = False
+
+JSON_BACKENDS = ('json', 'orjson')
+
+_backend = 'orjson' if ORJSON_ENABLED else 'json'  # pylint: disable=invalid-name
+
+
+def get_backend():
+    '''
+    Return the name of the json backend in use.
+    '''
+
+    return _backend
+
+
+def set_backend(backend):
+    '''
+    Select the json backend, 'json' or 'orjson'.
+    '''
+
+    global _backend  # pylint: disable=global-statement,invalid-name
+
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown json backend: {backend}, "
+                         f"must be one of: {', '.join(JSON_BACKENDS)}")
+
+    if backend == 'orjson' and not ORJSON_ENABLED:
+        raise RuntimeError('Python module orjson not found. Please install using '
+                           '"pip install orjson" prior to selecting the orjson '
+                           'json backend.')
+
+    _backend = backend
+
+
+def loads(data):
+    '''
+    Decode a json str or bytes object.
+    '''
+
+    with phase('json_decode'):
+        if _backend == 'orjson':
+            return orjson.loads(data)  # pylint: disable=no-member
+
+        return json.loads(data)
+
+
+def dumps(obj, indent=None):
+    '''
+    Encode obj as a json str.  orjson always indents by 2 spaces when indent
+    is set.
+    '''
+
+    if _backend == 'orjson':
+        try:
+            option = orjson.OPT_INDENT_2 if indent else None  # pylint: disable=no-member
+            return orjson.dumps(obj, option=option).decode('utf-8')  # pylint: disable=no-member
+
+        except TypeError:
+            # i.e. non-str dict keys, let the json module handle it
+            pass
+
+    return json.dumps(obj, indent=indent)
+
+
+class LazyJSON():
+    '''
+    Wrapper for logging a json object, i.e.
+    logging.debug("Event:\n%s", LazyJSON(event, indent=2)).  The object is
+    only serialized if the log message is emitted.
+    '''
+
+    __slots__ = ('_obj', '_indent')
+
+    def __init__(self, obj, indent=None):
+        self._obj = obj
+        self._indent = indent
+
+    def __str__(self):
+        return dumps(self._obj, indent=self._indent)
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+'''
+FILE:           latency.py
+
+DESCRIPTION:    This script contains the event-to-aux_data latency tracking
+                used by the aux_data inserters.  For each event and
+                data_source the time from the event ts until the event was
+                received from the websocket feed, until the data source query
+                completed and until the aux_data record was saved are recorded
+                and rolling percentiles are kept per data_source.  Events whose
+                aux_data record never landed are flagged.
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import math
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+
+from misc.python_sealog.metrics import register_collector
+
+NEW_EVENTS_PATH = '/ws/status/newEvents'
+
+TS_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+# number of recent events per data_source used to calculate the percentiles
+DEFAULT_WINDOW = 1000
+
+# seconds after which an aux_data record that has not been saved is flagged
+DEFAULT_MISSING_TIMEOUT = 60
+
+# number of flagged events kept for the stats
+DEFAULT_MISSING_SIZE = 100
+
+# number of websocket receipt times remembered
+RECEIPTS_SIZE = 10000
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# the lag from the event ts to each stage
+STAGES = ('received', 'queried', 'inserted')
+
+_receipts = OrderedDict()
+_receipts_lock = threading.Lock()
+
+_trackers = []
+
+
+def record_receipt(path, message):
+    '''
+    Record when a new event was received from the websocket feed.  Pass as
+    the on_receive function of the SealogWSSubscriber.
+    '''
+
+    if path != NEW_EVENTS_PATH:
+        return
+
+    with _receipts_lock:
+        _receipts[message.get('id')] = time.time()
+
+        if len(_receipts) > RECEIPTS_SIZE:
+            _receipts.popitem(last=False)
+
+
+def _parse_ts(timestamp):
+    return datetime.strptime(timestamp, TS_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _percentile(values, quantile):
+    '''
+    Return the nearest-rank percentile of the sorted values.
+    '''
+
+    return values[max(0, math.ceil(quantile * len(values)) - 1)]
+
+
+class LatencyTracker():  # pylint: disable=too-many-instance-attributes
+    '''
+    Class that tracks the lag between the event ts and the websocket receipt,
+    data source query completion and aux_data POST completion for each event
+    and data_source.
+
+    Call start() when the inserter begins processing an event, queried() once
+    the data for a data_source has been retrieved and inserted() once its
+    aux_data record was saved.  Call failed() if the record could not be
+    built or saved.  Records that were not saved within missing_timeout
+    seconds are flagged as missing.
+    '''
+
+    def __init__(self, data_sources=None, window=DEFAULT_WINDOW,
+                 missing_timeout=DEFAULT_MISSING_TIMEOUT,
+                 missing_size=DEFAULT_MISSING_SIZE):
+        self._data_sources = list(data_sources or [])
+        self._window = window
+        self._missing_timeout = missing_timeout
+        self._pending = OrderedDict()
+        self._lags = {}
+        self._counts = {}
+        self._missing = deque(maxlen=missing_size)
+        self._lock = threading.Lock()
+
+        _trackers.append(self)
+
+    def _data_source_stats(self, data_source):
+        if data_source not in self._lags:
+            self._lags[data_source] = {stage: deque(maxlen=self._window) for stage in STAGES}
+            self._counts[data_source] = {'inserted': 0, 'missing': 0}
+
+        return self._lags[data_source], self._counts[data_source]
+
+    def _flag(self, entry, reason):
+        '''
+        Flag an event whose aux_data record never landed.  Must be called
+        with the lock held.
+        '''
+
+        _, counts = self._data_source_stats(entry['data_source'])
+        counts['missing'] += 1
+
+        self._missing.append({
+            'event_id': entry['event_id'],
+            'ts': entry['event_ts'],
+            'data_source': entry['data_source'],
+            'queried': entry['queried'] is not None,
+            'reason': reason
+        })
+
+        logging.warning("aux_data record for event %s from %s never landed: %s",
+                        entry['event_id'], entry['data_source'], reason)
+
+    def start(self, event, data_sources=None):
+        '''
+        Start tracking the event for each of the data_sources, defaults to the
+        data_sources the tracker was created with.
+        '''
+
+        now = time.time()
+
+        with _receipts_lock:
+            received = _receipts.get(event['id'], now)
+
+        with self._lock:
+            for data_source in data_sources or self._data_sources:
+                self._pending[(event['id'], data_source)] = {
+                    'event_id': event['id'],
+                    'event_ts': event['ts'],
+                    'data_source': data_source,
+                    'ts': _parse_ts(event['ts']),
+                    'received': received,
+                    'queried': None,
+                    'started': now
+                }
+
+        self.check_missing()
+
+    def queried(self, event, data_source):
+        '''
+        Record that the data_source query for the event has completed.
+        '''
+
+        with self._lock:
+            entry = self._pending.get((event['id'], data_source))
+
+            if entry is not None:
+                entry['queried'] = time.time()
+
+    def inserted(self, event, data_source):
+        '''
+        Record that the aux_data record for the event was saved.
+        '''
+
+        now = time.time()
+
+        with self._lock:
+            entry = self._pending.pop((event['id'], data_source), None)
+
+            if entry is None:
+                return
+
+            lags, counts = self._data_source_stats(data_source)
+            counts['inserted'] += 1
+
+            lags['received'].append(entry['received'] - entry['ts'])
+            lags['queried'].append((entry['queried'] or now) - entry['ts'])
+            lags['inserted'].append(now - entry['ts'])
+
+    def failed(self, event, data_source, reason):
+        '''
+        Flag the event, the aux_data record could not be built or saved.
+        '''
+
+        with self._lock:
+            entry = self._pending.pop((event['id'], data_source), None)
+
+            if entry is not None:
+                self._flag(entry, reason)
+
+    def check_missing(self):
+        '''
+        Flag the events whose aux_data records have not been saved within
+        missing_timeout seconds.
+        '''
+
+        expired = time.time() - self._missing_timeout
+
+        with self._lock:
+            while self._pending:
+                key, entry = next(iter(self._pending.items()))
+
+                if entry['started'] > expired:
+                    break
+
+                del self._pending[key]
+                self._flag(entry, f'not saved within {self._missing_timeout} seconds')
+
+    def to_dict(self):
+        '''
+        Return the lag percentiles in seconds, counts and recently flagged
+        events for each data_source.
+        '''
+
+        self.check_missing()
+
+        stats = {}
+
+        with self._lock:
+            pending = {}
+            for _, data_source in self._pending:
+                pending[data_source] = pending.get(data_source, 0) + 1
+
+            for data_source in set(self._data_sources) | set(self._lags) | set(pending):
+                lags, counts = self._data_source_stats(data_source)
+
+                stats[data_source] = dict(counts, pending=pending.get(data_source, 0))
+
+                for stage in STAGES:
+                    values = sorted(lags[stage])
+                    stats[data_source][f'{stage}_lag'] = {
+                        f'p{round(quantile * 100)}': (_percentile(values, quantile)
+                                                      if values else None)
+                        for quantile in QUANTILES
+                    }
+
+                stats[data_source]['missing_events'] = [missing for missing in self._missing
+                                                        if missing['data_source'] == data_source]
+
+        return stats
+
+
+def latency_stats():
+    '''
+    Return the stats of every LatencyTracker keyed by data_source.
+    '''
+
+    stats = {}
+    for tracker in _trackers:
+        stats.update(tracker.to_dict())
+
+    return stats
+
+
+def latency_prometheus():
+    '''
+    Return the stats of every LatencyTracker in the Prometheus text exposition
+    format.
+    '''
+
+    stats = latency_stats()
+
+    lines = ['# HELP sealog_aux_data_lag_seconds '
+             'Lag from the event ts to each aux_data inserter stage.',
+             '# TYPE sealog_aux_data_lag_seconds gauge']
+
+    for data_source, data_source_stats in sorted(stats.items()):
+        for stage in STAGES:
+            for quantile, value in data_source_stats[f'{stage}_lag'].items():
+                if value is not None:
+                    lines.append(f'sealog_aux_data_lag_seconds{{data_source="{data_source}",'
+                                 f'stage="{stage}",quantile="{int(quantile[1:]) / 100}"}} '
+                                 f'{value}')
+
+    for counter, help_text, metric_type in (
+            ('inserted', 'Number of aux_data records saved', 'counter'),
+            ('missing', 'Number of aux_data records that never landed', 'counter'),
+            ('pending', 'Number of aux_data records in progress', 'gauge')):
+        name = f'sealog_aux_data_{counter}' + ('_total' if metric_type == 'counter' else '')
+        lines += [f'# HELP {name} {help_text}.', f'# TYPE {name} {metric_type}']
+
+        for data_source, data_source_stats in sorted(stats.items()):
+            lines.append(f'{name}{{data_source="{data_source}"}} {data_source_stats[counter]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+register_collector('aux_data_latency', latency_stats, latency_prometheus)
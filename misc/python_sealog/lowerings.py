@@ -17,15 +17,13 @@ LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for det
                 Copyright (C) OceanDataTools.org 2024
 '''
 
-import sys
 import json
 import logging
 import requests
 
-from os.path import dirname, realpath
-sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
-
 from misc.python_sealog.settings import API_SERVER_URL, HEADERS, LOWERINGS_API_PATH
+from misc.python_sealog.json_backend import dumps, loads
+from misc.python_sealog.api_client import cached_get, get_session, invalidate_cache
 
 
 def get_lowering_uid_by_id(lowering_id, api_server_url=API_SERVER_URL, headers=HEADERS):
@@ -39,10 +37,10 @@ def get_lowering_uid_by_id(lowering_id, api_server_url=API_SERVER_URL, headers=H
 
     try:
         url = api_server_url + LOWERINGS_API_PATH
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
-            lowering = json.loads(req.text)[0]
+            lowering = loads(req.content)[0]
             return lowering['id']
 
     except requests.exceptions.RequestException as exc:
@@ -68,11 +66,11 @@ def get_lowerings(export_format='json', api_server_url=API_SERVER_URL, headers=H
 
     try:
         url = api_server_url + LOWERINGS_API_PATH
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -102,10 +100,10 @@ def get_lowering_uids_by_cruise(cruise_uid, api_server_url=API_SERVER_URL, heade
 
     try:
         url = api_server_url + LOWERINGS_API_PATH + '/bycruise/' + cruise_uid
-        req = requests.get(url, headers=headers)
+        req = cached_get(url, headers=headers)
 
         if req.status_code == 200:
-            lowerings = json.loads(req.text)
+            lowerings = loads(req.content)
             return (lowering['id'] for lowering in lowerings)
 
         if req.status_code == 404:
@@ -129,10 +127,10 @@ def get_lowering_ids_by_cruise(cruise_uid, api_server_url=API_SERVER_URL, header
 
     try:
         url = api_server_url + LOWERINGS_API_PATH + '/bycruise/' + cruise_uid
-        req = requests.get(url, headers=headers)
+        req = cached_get(url, headers=headers)
 
         if req.status_code == 200:
-            lowerings = json.loads(req.text)
+            lowerings = loads(req.content)
             return (lowering['lowering_id'] for lowering in lowerings)
 
         if req.status_code == 404:
@@ -163,11 +161,11 @@ def get_lowering(lowering_uid, export_format='json', api_server_url=API_SERVER_U
 
     try:
         url = api_server_url + LOWERINGS_API_PATH + '/' + lowering_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -198,11 +196,11 @@ def get_lowering_by_id(lowering_id, export_format='json', api_server_url=API_SER
 
     try:
         url = api_server_url + LOWERINGS_API_PATH
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)[0]
+                return loads(req.content)[0]
 
             if export_format == 'csv':
                 return req.text
@@ -232,11 +230,11 @@ def get_lowerings_by_cruise(cruise_uid, export_format='json', api_server_url=API
 
     try:
         url = api_server_url + LOWERINGS_API_PATH + '/bycruise/' + cruise_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -273,11 +271,11 @@ def get_lowering_by_event(event_uid, export_format='json', api_server_url=API_SE
 
     try:
         url = f'{api_server_url}{LOWERINGS_API_PATH}/byevent/{event_uid}'
-        req = requests.get(url, headers=headers, params=params)
+        req = cached_get(url, headers=headers, params=params)
 
         if req.status_code == 200:
             if export_format == 'json':
-                return json.loads(req.text)
+                return loads(req.content)
 
             if export_format == 'csv':
                 return req.text
@@ -292,6 +290,7 @@ def get_lowering_by_event(event_uid, export_format='json', api_server_url=API_SE
 
     return None
 
+
 def update_lowering(lowering_uid, payload, api_server_url=API_SERVER_URL,
                     headers=HEADERS):
     '''
@@ -300,7 +299,8 @@ def update_lowering(lowering_uid, payload, api_server_url=API_SERVER_URL,
 
     try:
         url = f'{api_server_url}{LOWERINGS_API_PATH}/{lowering_uid}'
-        requests.patch(url, headers=headers, data=json.dumps(payload))
+        get_session().patch(url, headers=headers, data=dumps(payload))
+        invalidate_cache(LOWERINGS_API_PATH)
 
     except requests.exceptions.RequestException as exc:
         raise exc
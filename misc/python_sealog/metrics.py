@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+'''
+FILE:           metrics.py
+
+DESCRIPTION:    This script contains the optional request timing
+                instrumentation for the python_sealog wrapper functions.  When
+                enabled, the duration, response size, retries and errors of
+                every sealog-server API request are recorded by route.  Service
+                scripts can record their own stages (i.e. influx query time)
+                with stage_timer().  The metrics are available in Prometheus
+                text format from a small HTTP server or as a periodic JSON
+                dump.  Other modules can add their own stats with
+                register_collector().
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import os
+import re
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from misc.python_sealog.json_backend import dumps
+
+# upper bounds of the latency histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+DEFAULT_METRICS_PORT = 9464
+
+# seconds between JSON stats dumps
+DEFAULT_DUMP_INTERVAL = 60
+
+# metric name prefix, label name, description and counters for each family
+# of timings
+FAMILIES = {
+    'api': ('sealog_api_request', 'route', 'sealog-server API requests',
+            ('errors', 'bytes', 'retries')),
+    'stage': ('sealog_stage', 'stage', 'service script stages', ('errors',))
+}
+
+COUNTER_HELP = {
+    'errors': 'Number of failed',
+    'bytes': 'Bytes received from the',
+    'retries': 'Number of retries of the'
+}
+
+# sealog record ids in the API paths are replaced so the requests for
+# different records share a route
+ID_REGEX = re.compile(r'/[0-9a-fA-F]{24}(?=/|$)')
+
+_metrics = None  # pylint: disable=invalid-name
+
+# name: (to_dict, to_prometheus) functions of the additional stats included
+# with the metrics
+_collectors = {}
+
+
+def register_collector(name, to_dict, to_prometheus):
+    '''
+    Include additional stats with the metrics.  to_dict returns the stats
+    added to the json output under name, to_prometheus returns the stats in
+    the Prometheus text exposition format.
+    '''
+
+    _collectors[name] = (to_dict, to_prometheus)
+
+
+def api_route(method, url):
+    '''
+    Return the route label for an API request, i.e.
+    "GET /sealog-server/api/v1/lowerings/bycruise/{id}".
+    '''
+
+    return f'{method.upper()} {ID_REGEX.sub("/{id}", urlsplit(url).path or "/")}'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _Timing():
+    '''
+    The histogram and counters recorded for a single route or stage.
+    '''
+
+    __slots__ = ('buckets', 'count', 'sum', 'max', 'errors', 'bytes', 'retries')
+
+    def __init__(self, bucket_count):
+        self.buckets = [0] * (bucket_count + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.bytes = 0
+        self.retries = 0
+
+    def copy(self):
+        '''
+        Return a copy of the timing.
+        '''
+
+        timing = _Timing(len(self.buckets) - 1)
+        for attr in self.__slots__:
+            setattr(timing, attr, getattr(self, attr))
+
+        timing.buckets = list(self.buckets)
+        return timing
+
+
+class Metrics():
+    '''
+    Class that records the duration of the API requests and service stages as
+    histograms along with the bytes transferred, retries and errors.
+    '''
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._buckets = tuple(sorted(buckets))
+        self._timings = {}
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    @property
+    def buckets(self):
+        '''
+        Getter method for the _buckets property
+        '''
+        return self._buckets
+
+    def observe(self, family, label, seconds,  # pylint: disable=too-many-arguments
+                nbytes=0, error=False, retries=0):
+        '''
+        Record a single API request or stage.
+        '''
+
+        bucket = bisect_left(self._buckets, seconds)
+
+        with self._lock:
+            timing = self._timings.get((family, label))
+            if timing is None:
+                timing = self._timings[(family, label)] = _Timing(len(self._buckets))
+
+            timing.buckets[bucket] += 1
+            timing.count += 1
+            timing.sum += seconds
+            timing.max = max(timing.max, seconds)
+            timing.errors += int(error)
+            timing.bytes += nbytes
+            timing.retries += retries
+
+    @contextmanager
+    def timer(self, stage):
+        '''
+        Context manager that records the duration of a stage, the stage is
+        counted as an error if an exception is raised.
+        '''
+
+        start = time.perf_counter()
+        error = False
+
+        try:
+            yield
+
+        except Exception:
+            error = True
+            raise
+
+        finally:
+            self.observe('stage', stage, time.perf_counter() - start, error=error)
+
+    def reset(self):
+        '''
+        Remove all the recorded timings.
+        '''
+
+        with self._lock:
+            self._timings = {}
+            self._started = time.time()
+
+    def _snapshot(self):
+        with self._lock:
+            return sorted((key, timing.copy()) for key, timing in self._timings.items())
+
+    def to_dict(self):
+        '''
+        Return the recorded timings as a dict that can be serialized to json.
+        The bucket counts are cumulative, keyed by their upper bound.
+        '''
+
+        stats = {
+            'started': self._started,
+            'uptime': time.time() - self._started
+        }
+
+        for family in FAMILIES:
+            stats[family] = {}
+
+        for (family, label), timing in self._snapshot():
+            cumulative = 0
+            buckets = {}
+            for upper, count in zip(self._buckets + ('+Inf',), timing.buckets):
+                cumulative += count
+                buckets[str(upper)] = cumulative
+
+            stats.setdefault(family, {})[label] = {
+                'count': timing.count,
+                'sum': timing.sum,
+                'mean': timing.sum / timing.count if timing.count else 0.0,
+                'max': timing.max,
+                'errors': timing.errors,
+                'bytes': timing.bytes,
+                'retries': timing.retries,
+                'buckets': buckets
+            }
+
+        for name, (to_dict, _) in _collectors.items():
+            stats[name] = to_dict()
+
+        return stats
+
+    def to_prometheus(self):
+        '''
+        Return the recorded timings in the Prometheus text exposition format.
+        '''
+
+        lines = []
+        snapshot = self._snapshot()
+
+        for family, (prefix, label_name, description, counters) in FAMILIES.items():
+            timings = [(label, timing) for (timing_family, label), timing in snapshot
+                       if timing_family == family]
+
+            lines += [f'# HELP {prefix}_duration_seconds Duration of the {description}.',
+                      f'# TYPE {prefix}_duration_seconds histogram']
+
+            for label, timing in timings:
+                label = f'{label_name}="{_escape(label)}"'
+                cumulative = 0
+                for upper, count in zip(self._buckets + ('+Inf',), timing.buckets):
+                    cumulative += count
+                    lines.append(
+                        f'{prefix}_duration_seconds_bucket{{{label},le="{upper}"}} {cumulative}')
+
+                lines.append(f'{prefix}_duration_seconds_sum{{{label}}} {timing.sum}')
+                lines.append(f'{prefix}_duration_seconds_count{{{label}}} {timing.count}')
+
+            for counter in counters:
+                lines += [f'# HELP {prefix}_{counter}_total {COUNTER_HELP[counter]} {description}.',
+                          f'# TYPE {prefix}_{counter}_total counter']
+
+                for label, timing in timings:
+                    lines.append(f'{prefix}_{counter}_total{{{label_name}="{_escape(label)}"}} '
+                                 f'{getattr(timing, counter)}')
+
+        return '\n'.join(lines) + '\n' + ''.join(
+            to_prometheus() for _, to_prometheus in _collectors.values())
+
+
+def enable_metrics(buckets=DEFAULT_BUCKETS):
+    '''
+    Start recording the API request and stage timings.  Returns the Metrics
+    object.
+    '''
+
+    global _metrics  # pylint: disable=global-statement,invalid-name
+
+    if _metrics is None:
+        _metrics = Metrics(buckets)
+
+    return _metrics
+
+
+def disable_metrics():
+    '''
+    Stop recording and discard the timings.
+    '''
+
+    global _metrics  # pylint: disable=global-statement,invalid-name
+    _metrics = None
+
+
+def get_metrics():
+    '''
+    Return the Metrics object or None if the metrics are not enabled.
+    '''
+
+    return _metrics
+
+
+def observe_stage(stage, seconds, error=False):
+    '''
+    Record the duration of a stage timed by the caller.  Does nothing if the
+    metrics are not enabled.
+    '''
+
+    if _metrics is not None:
+        _metrics.observe('stage', stage, seconds, error=error)
+
+
+@contextmanager
+def stage_timer(stage):
+    '''
+    Context manager that records the duration of a stage, i.e.
+
+        with stage_timer('influx_query'):
+            result = query_api.query(query)
+
+    Does nothing if the metrics are not enabled.
+    '''
+
+    if _metrics is None:
+        yield
+        return
+
+    with _metrics.timer(stage):
+        yield
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    '''
+    Serve the metrics in Prometheus text format at /metrics and as json at
+    /metrics.json.
+    '''
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        '''
+        Return the current metrics.
+        '''
+
+        metrics = _metrics
+
+        if metrics is None:
+            self.send_error(503, 'Metrics are not enabled')
+            return
+
+        if self.path.split('?', 1)[0] == '/metrics':
+            body = metrics.to_prometheus().encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+        elif self.path.split('?', 1)[0] == '/metrics.json':
+            body = dumps(metrics.to_dict()).encode('utf-8')
+            content_type = 'application/json'
+
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logging.debug(format, *args)
+
+
+def start_metrics_server(port=DEFAULT_METRICS_PORT, host=''):
+    '''
+    Enable the metrics and serve them from a background thread.  Returns the
+    HTTP server, call shutdown() on it to stop serving.
+    '''
+
+    enable_metrics()
+
+    server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='sealog-metrics', daemon=True).start()
+
+    logging.info("Serving metrics at http://%s:%d/metrics",
+                 host or '0.0.0.0', server.server_address[1])
+
+    return server
+
+
+def write_stats(filename=None):
+    '''
+    Write the metrics as json to filename, or to stdout if filename is None.
+    '''
+
+    if _metrics is None:
+        return
+
+    stats = dumps(_metrics.to_dict(), indent=2)
+
+    if filename is None:
+        print(stats, flush=True)
+        return
+
+    # replace the file in one step so readers never see a partial file
+    tmp_filename = f'{filename}.tmp'
+    with open(tmp_filename, 'w', encoding='utf-8') as stats_fp:
+        stats_fp.write(stats)
+
+    os.replace(tmp_filename, filename)
+
+
+def start_stats_dump(interval=DEFAULT_DUMP_INTERVAL, filename=None):
+    '''
+    Enable the metrics and write them as json every interval seconds from a
+    background thread.  Returns a threading.Event, set it to stop the dumps.
+    '''
+
+    enable_metrics()
+
+    stop = threading.Event()
+
+    def _dump():
+        while not stop.wait(interval):
+            try:
+                write_stats(filename)
+
+            except OSError as exc:
+                logging.error("Unable to write the metrics to %s", filename)
+                logging.debug(str(exc))
+
+    threading.Thread(target=_dump, name='sealog-metrics-dump', daemon=True).start()
+
+    return stop
@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+'''
+FILE:           mirror.py
+
+DESCRIPTION:    This script contains a local SQLite mirror of the sealog-
+                server cruise, lowering, event and aux_data records.  The
+                mirror is seeded from the API in pages and kept current from
+                the websocket feeds.  The query functions mirror the wrapper
+                functions so read-heavy scripts and notebooks can run against
+                the local copy instead of the live server.
+
+BUGS:
+NOTES:          The server only publishes new events created within a few
+                minutes of their ts, and does not publish aux_data updates or
+                deletions.  Records changed that way, or while the mirror was
+                not running, are picked up by seeding the time range again.
+
+                Run from the sealog-server directory as a module:
+                python3 -m misc.python_sealog.mirror --seed <db_file>
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import sys
+import logging
+import sqlite3
+import threading
+
+from misc.python_sealog.settings import API_SERVER_URL, HEADERS
+from misc.python_sealog.json_backend import dumps, loads
+from misc.python_sealog.cruises import get_cruises
+from misc.python_sealog.lowerings import get_lowerings
+from misc.python_sealog.events import get_events
+from misc.python_sealog.event_aux_data import get_event_aux_data
+from misc.python_sealog.ws_subscriber import SealogWSSubscriber
+
+CLIENT_WSID = 'sealogMirror'
+
+DEFAULT_PAGE_SIZE = 1000
+
+EVENT_SUBS = ['/ws/status/newEvents', '/ws/status/updateEvents', '/ws/status/deleteEvents']
+
+EVENT_AUX_DATA_SUBS = ['/ws/status/newEventAuxData', '/ws/status/updateEventAuxData',
+                       '/ws/status/deleteEventAuxData']
+
+CRUISE_SUBS = ['/ws/status/newCruises', '/ws/status/updateCruises']
+
+LOWERING_SUBS = ['/ws/status/newLowerings', '/ws/status/updateLowerings']
+
+SUBS = EVENT_SUBS + EVENT_AUX_DATA_SUBS + CRUISE_SUBS + LOWERING_SUBS
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS cruises (
+    id TEXT PRIMARY KEY,
+    start_ts TEXT,
+    stop_ts TEXT,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lowerings (
+    id TEXT PRIMARY KEY,
+    start_ts TEXT,
+    stop_ts TEXT,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    ts TEXT NOT NULL,
+    event_value TEXT,
+    event_author TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_value_ts ON events (event_value, ts);
+CREATE TABLE IF NOT EXISTS event_aux_data (
+    id TEXT PRIMARY KEY,
+    event_id TEXT NOT NULL,
+    data_source TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS event_aux_data_event_id ON event_aux_data (event_id);
+CREATE INDEX IF NOT EXISTS event_aux_data_data_source ON event_aux_data (data_source);
+'''
+
+
+def _in_clause(column, values):
+    '''
+    Return an SQL IN clause and its parameters.
+    '''
+
+    return f"{column} IN ({','.join('?' * len(values))})", list(values)
+
+
+class SealogMirror():  # pylint: disable=too-many-public-methods
+    '''
+    Class that maintains a local SQLite copy of the sealog-server records.
+
+    Timestamps are stored as the ISO8601 strings returned by the API, which
+    sort chronologically, so ts filters should use the same format.
+    '''
+
+    def __init__(self, db_file, api_server_url=API_SERVER_URL, headers=HEADERS):
+        self._api_server_url = api_server_url
+        self._headers = headers
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        '''
+        Close the database connection.
+        '''
+
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql, params=()):
+        with self._lock, self._conn:
+            self._conn.execute(sql, params)
+
+    def _executemany(self, sql, rows):
+        with self._lock, self._conn:
+            self._conn.executemany(sql, rows)
+
+    def _select(self, sql, params=()):
+        with self._lock:
+            return [loads(row[0]) for row in self._conn.execute(sql, params)]
+
+    # -------------------------------------------------------------------------
+    # Writing records
+    # -------------------------------------------------------------------------
+    def upsert_cruises(self, cruises):
+        '''
+        Add or replace cruise records.
+        '''
+
+        self._executemany('INSERT OR REPLACE INTO cruises VALUES (?, ?, ?, ?)',
+                          [(cruise['id'], cruise['start_ts'], cruise['stop_ts'], dumps(cruise))
+                           for cruise in cruises])
+
+    def upsert_lowerings(self, lowerings):
+        '''
+        Add or replace lowering records.
+        '''
+
+        self._executemany('INSERT OR REPLACE INTO lowerings VALUES (?, ?, ?, ?)',
+                          [(lowering['id'], lowering['start_ts'], lowering['stop_ts'],
+                            dumps(lowering)) for lowering in lowerings])
+
+    def upsert_events(self, events):
+        '''
+        Add or replace event records.
+        '''
+
+        self._executemany('INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?)',
+                          [(event['id'], event['ts'], event.get('event_value'),
+                            event.get('event_author'), dumps(event))
+                           for event in events])
+
+    def upsert_event_aux_data(self, event_aux_data):
+        '''
+        Add or replace aux_data records.
+        '''
+
+        self._executemany('INSERT OR REPLACE INTO event_aux_data VALUES (?, ?, ?, ?)',
+                          [(aux_data['id'], aux_data['event_id'], aux_data.get('data_source'),
+                            dumps(aux_data))
+                           for aux_data in event_aux_data])
+
+    def delete_event(self, event_uid):
+        '''
+        Delete the event record and its aux_data records.
+        '''
+
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM events WHERE id = ?', (event_uid,))
+            self._conn.execute('DELETE FROM event_aux_data WHERE event_id = ?', (event_uid,))
+
+    def delete_event_aux_data(self, aux_data_uid):
+        '''
+        Delete the aux_data record.
+        '''
+
+        self._execute('DELETE FROM event_aux_data WHERE id = ?', (aux_data_uid,))
+
+    # -------------------------------------------------------------------------
+    # Synchronizing with the server
+    # -------------------------------------------------------------------------
+    def seed(self, start_ts=None, stop_ts=None, page_size=DEFAULT_PAGE_SIZE):
+        '''
+        Copy the cruise and lowering records and the event and aux_data
+        records between start_ts and stop_ts from the API.  The events are
+        retrieved in pages of page_size along with the aux_data records for
+        the time range covered by each page.  Returns the number of events
+        copied.
+        '''
+
+        self.upsert_cruises(get_cruises(api_server_url=self._api_server_url,
+                                        headers=self._headers) or [])
+        self.upsert_lowerings(get_lowerings(api_server_url=self._api_server_url,
+                                            headers=self._headers) or [])
+
+        offset = 0
+        total = 0
+
+        while True:
+            events = get_events(start_ts=start_ts, stop_ts=stop_ts, limit=page_size, offset=offset,
+                                api_server_url=self._api_server_url, headers=self._headers)
+
+            if not events:
+                break
+
+            self.upsert_events(events)
+
+            event_aux_data = get_event_aux_data(start_ts=events[0]['ts'], stop_ts=events[-1]['ts'],
+                                                api_server_url=self._api_server_url,
+                                                headers=self._headers)
+            self.upsert_event_aux_data(event_aux_data or [])
+
+            total += len(events)
+            logging.info("Copied %d events", total)
+
+            if len(events) < page_size:
+                break
+
+            offset += page_size
+
+        return total
+
+    def apply(self, path, message):
+        '''
+        Apply a message published to one of the websocket feeds.
+        '''
+
+        if path in ('/ws/status/newEvents', '/ws/status/updateEvents'):
+            self.upsert_events([message])
+
+        elif path == '/ws/status/deleteEvents':
+            self.delete_event(message['id'])
+
+        elif path in ('/ws/status/newEventAuxData', '/ws/status/updateEventAuxData'):
+            self.upsert_event_aux_data([message])
+
+        elif path == '/ws/status/deleteEventAuxData':
+            self.delete_event_aux_data(message['id'])
+
+        elif path in CRUISE_SUBS:
+            self.upsert_cruises([message])
+
+        elif path in LOWERING_SUBS:
+            self.upsert_lowerings([message])
+
+    @property
+    def last_event_ts(self):
+        '''
+        The ts of the newest event in the mirror.
+        '''
+
+        with self._lock:
+            return self._conn.execute('SELECT MAX(ts) FROM events').fetchone()[0]
+
+    def subscriber(self, ws_server_url=None):
+        '''
+        Return a SealogWSSubscriber that applies the websocket feeds to the
+        mirror, recovering the events created since the newest event in the
+        mirror.
+        '''
+
+        kwargs = {'ws_server_url': ws_server_url} if ws_server_url else {}
+
+        return SealogWSSubscriber(CLIENT_WSID, SUBS, self.apply, headers=self._headers,
+                                  catch_up=True, api_server_url=self._api_server_url,
+                                  last_event_ts=self.last_event_ts, **kwargs)
+
+    async def sync(self, ws_server_url=None):
+        '''
+        Keep the mirror current until cancelled.
+        '''
+
+        await self.subscriber(ws_server_url).run()
+
+    # -------------------------------------------------------------------------
+    # Querying records
+    # -------------------------------------------------------------------------
+    def get_cruises(self):
+        '''
+        Return all cruise records.
+        '''
+
+        return self._select('SELECT record FROM cruises ORDER BY start_ts')
+
+    def get_cruise(self, cruise_uid):
+        '''
+        Return the cruise record with the specified uid.
+        '''
+
+        results = self._select('SELECT record FROM cruises WHERE id = ?', (cruise_uid,))
+        return results[0] if results else None
+
+    def get_lowerings(self):
+        '''
+        Return all lowering records.
+        '''
+
+        return self._select('SELECT record FROM lowerings ORDER BY start_ts')
+
+    def get_lowering(self, lowering_uid):
+        '''
+        Return the lowering record with the specified uid.
+        '''
+
+        results = self._select('SELECT record FROM lowerings WHERE id = ?', (lowering_uid,))
+        return results[0] if results else None
+
+    def get_event(self, event_uid):
+        '''
+        Return the event record with the specified uid.
+        '''
+
+        results = self._select('SELECT record FROM events WHERE id = ?', (event_uid,))
+        return results[0] if results else None
+
+    def get_events(self, event_filter=None,  # pylint: disable=too-many-arguments
+                   start_ts=None, stop_ts=None, limit=0, offset=0):
+        '''
+        Return the event records between start_ts and stop_ts, oldest first.
+        Optionally define an event_filter to filter the returned events.
+        '''
+
+        clauses = []
+        params = []
+
+        if event_filter:
+            event_filter = event_filter if isinstance(event_filter, list) else [event_filter]
+            clause, values = _in_clause('event_value', event_filter)
+            clauses.append(clause)
+            params += values
+
+        if start_ts is not None:
+            clauses.append('ts >= ?')
+            params.append(start_ts)
+
+        if stop_ts is not None:
+            clauses.append('ts <= ?')
+            params.append(stop_ts)
+
+        sql = 'SELECT record FROM events'
+
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+
+        sql += ' ORDER BY ts'
+
+        if limit > 0 or offset > 0:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [limit if limit > 0 else -1, offset]
+
+        return self._select(sql, params)
+
+    def _time_bounds(self, table, uid):
+        with self._lock:
+            return self._conn.execute(f'SELECT start_ts, stop_ts FROM {table} WHERE id = ?',
+                                      (uid,)).fetchone()
+
+    def get_events_by_cruise(self, cruise_uid, event_filter=None):
+        '''
+        Return the event records for the cruise.
+        '''
+
+        bounds = self._time_bounds('cruises', cruise_uid)
+        return self.get_events(event_filter, *bounds) if bounds else None
+
+    def get_events_by_lowering(self, lowering_uid, event_filter=None):
+        '''
+        Return the event records for the lowering.
+        '''
+
+        bounds = self._time_bounds('lowerings', lowering_uid)
+        return self.get_events(event_filter, *bounds) if bounds else None
+
+    def get_event_aux_data(self, datasource=None,  # pylint: disable=too-many-arguments
+                           start_ts=None, stop_ts=None, limit=0, offset=0):
+        '''
+        Return the aux_data records for the events between start_ts and
+        stop_ts with the optional datasource.
+        '''
+
+        sql = ('SELECT event_aux_data.record FROM event_aux_data '
+               'JOIN events ON events.id = event_aux_data.event_id')
+        clauses = []
+        params = []
+
+        if datasource:
+            datasource = datasource if isinstance(datasource, list) else [datasource]
+            clause, values = _in_clause('event_aux_data.data_source', datasource)
+            clauses.append(clause)
+            params += values
+
+        if start_ts is not None:
+            clauses.append('events.ts >= ?')
+            params.append(start_ts)
+
+        if stop_ts is not None:
+            clauses.append('events.ts <= ?')
+            params.append(stop_ts)
+
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+
+        sql += ' ORDER BY events.ts'
+
+        if limit > 0 or offset > 0:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [limit if limit > 0 else -1, offset]
+
+        return self._select(sql, params)
+
+    def get_event_aux_data_by_event(self, event_uid, datasource=None):
+        '''
+        Return the aux_data records for the event.
+        '''
+
+        sql = 'SELECT record FROM event_aux_data WHERE event_id = ?'
+        params = [event_uid]
+
+        if datasource:
+            datasource = datasource if isinstance(datasource, list) else [datasource]
+            clause, values = _in_clause('data_source', datasource)
+            sql += ' AND ' + clause
+            params += values
+
+        return self._select(sql, params)
+
+    def get_event_aux_data_by_cruise(self, cruise_uid, datasource=None, limit=0):
+        '''
+        Return the aux_data records for the cruise and optional datasource.
+        '''
+
+        bounds = self._time_bounds('cruises', cruise_uid)
+        return self.get_event_aux_data(datasource, *bounds, limit=limit) if bounds else None
+
+    def get_event_aux_data_by_lowering(self, lowering_uid, datasource=None, limit=0):
+        '''
+        Return the aux_data records for the lowering and optional datasource.
+        '''
+
+        bounds = self._time_bounds('lowerings', lowering_uid)
+        return self.get_event_aux_data(datasource, *bounds, limit=limit) if bounds else None
+
+    def _merge_aux_data(self, events):
+        '''
+        Add the aux_data records to the events, in the same form as the
+        event_exports routes.
+        '''
+
+        aux_data_by_event = {}
+
+        for start in range(0, len(events), 500):
+            event_ids = [event['id'] for event in events[start:start + 500]]
+            clause, params = _in_clause('event_id', event_ids)
+
+            for aux_data in self._select(f'SELECT record FROM event_aux_data WHERE {clause}',
+                                         params):
+                event_id = aux_data.pop('event_id')
+                aux_data.pop('id', None)
+                aux_data_by_event.setdefault(event_id, []).append(aux_data)
+
+        for event in events:
+            event['aux_data'] = aux_data_by_event.get(event['id'], [])
+
+        return events
+
+    def get_event_export(self, event_uid):
+        '''
+        Return the event record with the specified uid merged with its
+        aux_data records.
+        '''
+
+        event = self.get_event(event_uid)
+        return self._merge_aux_data([event])[0] if event else None
+
+    def get_event_exports(self, event_filter=None, start_ts=None, stop_ts=None):
+        '''
+        Return the event records between start_ts and stop_ts merged with
+        their aux_data records.
+        '''
+
+        return self._merge_aux_data(self.get_events(event_filter, start_ts, stop_ts))
+
+    def get_event_exports_by_cruise(self, cruise_uid, event_filter=None):
+        '''
+        Return the event records for the cruise merged with their aux_data
+        records.
+        '''
+
+        events = self.get_events_by_cruise(cruise_uid, event_filter)
+        return self._merge_aux_data(events) if events is not None else None
+
+    def get_event_exports_by_lowering(self, lowering_uid, event_filter=None):
+        '''
+        Return the event records for the lowering merged with their aux_data
+        records.
+        '''
+
+        events = self.get_events_by_lowering(lowering_uid, event_filter)
+        return self._merge_aux_data(events) if events is not None else None
+
+
+# -------------------------------------------------------------------------------------
+# Required python code for running the script as a stand-alone utility
+# -------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    import os
+    import asyncio
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python3 -m misc.python_sealog.mirror',
+                                     description='Sealog Local Mirror')
+    parser.add_argument('-v', '--verbosity', dest='verbosity',
+                        default=0, action='count',
+                        help='Increase output verbosity')
+    parser.add_argument('-s', '--seed', action='store_true',
+                        help='copy the records from the API before syncing')
+    parser.add_argument('--start_ts', help='copy the events starting at this time (UTC)')
+    parser.add_argument('--stop_ts', help='copy the events until this time (UTC)')
+    parser.add_argument('--no_sync', action='store_true',
+                        help='exit after seeding instead of following the websocket feeds')
+    parser.add_argument('db_file', help='SQLite database file')
+
+    parsed_args = parser.parse_args()
+
+    ############################
+    # Set up logging before we do any other argument parsing (so that we
+    # can log problems with argument parsing).
+
+    LOGGING_FORMAT = '%(asctime)-15s %(levelname)s - %(message)s'
+    logging.basicConfig(format=LOGGING_FORMAT)
+
+    LOG_LEVELS = {0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}
+    parsed_args.verbosity = min(parsed_args.verbosity, max(LOG_LEVELS))
+    logging.getLogger().setLevel(LOG_LEVELS[parsed_args.verbosity])
+
+    mirror = SealogMirror(parsed_args.db_file)
+
+    try:
+        if parsed_args.seed:
+            logging.info("Seeded %d events", mirror.seed(parsed_args.start_ts, parsed_args.stop_ts))
+
+        if not parsed_args.no_sync:
+            logging.debug("Listening to websocket feeds...")
+            asyncio.run(mirror.sync())
+
+    except KeyboardInterrupt:
+        logging.error('Keyboard Interrupted')
+        try:
+            sys.exit(0)
+        except SystemExit:
+            os._exit(0)  # pylint: disable=protected-access
+
+    finally:
+        mirror.close()
@@ -17,15 +17,13 @@ LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for det
                 Copyright (C) OceanDataTools.org 2024
 '''
 
-import sys
 import json
 import logging
 import requests
 
-from os.path import dirname, realpath
-sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
-
 from misc.python_sealog.settings import API_SERVER_URL, HEADERS, EVENT_AUX_DATA_API_PATH
+from misc.python_sealog.json_backend import loads
+from misc.python_sealog.api_client import get_session
 
 
 def get_framegrab_list_by_lowering(lowering_uid, datasources, api_server_url=API_SERVER_URL,
@@ -44,10 +42,10 @@ def get_framegrab_list_by_lowering(lowering_uid, datasources, api_server_url=API
 
     try:
         url = api_server_url + EVENT_AUX_DATA_API_PATH + '/bylowering/' + lowering_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
         if req.status_code != 404:
-            framegrabs = json.loads(req.text)
+            framegrabs = loads(req.content)
             for data in framegrabs:
                 for framegrab in data['data_array']:
                     if framegrab['data_name'] == 'filename':
@@ -80,10 +78,10 @@ def get_framegrab_list_by_cruise(cruise_uid, datasources, api_server_url=API_SER
 
     try:
         url = api_server_url + EVENT_AUX_DATA_API_PATH + '/bycruise/' + cruise_uid
-        req = requests.get(url, headers=headers, params=params)
+        req = get_session().get(url, headers=headers, params=params)
 
         if req.status_code != 404:
-            framegrabs = json.loads(req.text)
+            framegrabs = loads(req.content)
             for data in framegrabs:
                 for framegrab in data['data_array']:
                     if framegrab['data_name'] == 'filename':
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+'''
+FILE:           profiling.py
+
+DESCRIPTION:    This script contains the optional per-phase profiling used by
+                the export and import scripts.  Scripts mark their phases
+                (file writes, rsync, pandas processing, ...) with phase(), the
+                API requests and json decoding done by the wrapper functions
+                are recorded as the http and json_decode phases.  The wall and
+                CPU time of each phase is exclusive of the phases nested
+                inside it, so the phases add up to the runtime of the script.
+                The CPU time of child processes (i.e. rsync) is reported
+                separately.
+
+                Optionally the script can also be profiled with cProfile, the
+                stats are saved in pstats format, or sampled at a fixed
+                interval with the stacks saved in the collapsed format read by
+                flamegraph.pl and speedscope.
+
+                Scripts add the --profile options with add_profile_arguments()
+                and call start_profiling() with the parsed arguments, the
+                summary table is printed to stderr at exit.
+
+BUGS:
+NOTES:          CPU times are for the whole process, phases running at the
+                same time in different threads share the same CPU time.
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import os
+import sys
+import time
+import atexit
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+from collections import Counter
+
+# seconds between the stack samples
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+_profiler = None  # pylint: disable=invalid-name
+
+_NO_PHASE = nullcontext()
+
+
+def _child_cpu():
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+class _PhaseTiming():  # pylint: disable=too-few-public-methods
+    '''
+    The exclusive time recorded for a single phase.
+    '''
+
+    __slots__ = ('calls', 'wall', 'cpu', 'child_cpu')
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.child_cpu = 0.0
+
+
+class _ActivePhase():  # pylint: disable=too-few-public-methods
+    '''
+    A running phase and the time spent in the phases nested inside it.
+    '''
+
+    __slots__ = ('wall', 'cpu', 'child_cpu', 'nested_wall', 'nested_cpu', 'nested_child_cpu')
+
+    def __init__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.child_cpu = _child_cpu()
+        self.nested_wall = 0.0
+        self.nested_cpu = 0.0
+        self.nested_child_cpu = 0.0
+
+
+class Profiler():  # pylint: disable=too-many-instance-attributes
+    '''
+    Class that records the wall and CPU time of each phase, and optionally
+    profiles the script with cProfile or samples its stacks.
+    '''
+
+    def __init__(self, stats_file=None, sample_file=None, sample_interval=DEFAULT_SAMPLE_INTERVAL):
+        self._stats_file = stats_file
+        self._sample_file = sample_file
+        self._sample_interval = sample_interval
+        self._phases = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started = None
+        self._cpu_started = None
+        self._child_cpu_started = None
+        self._wall = None
+        self._cpu = None
+        self._child_cpu = None
+        self._cprofile = None
+        self._samples = Counter()
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+
+    @contextmanager
+    def phase(self, name):
+        '''
+        Context manager that records the time spent in the phase, less the
+        time spent in the phases nested inside it.
+        '''
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        active = _ActivePhase()
+        stack.append(active)
+
+        try:
+            yield
+
+        finally:
+            stack.pop()
+
+            wall = time.perf_counter() - active.wall
+            cpu = time.process_time() - active.cpu
+            child_cpu = _child_cpu() - active.child_cpu
+
+            if stack:
+                stack[-1].nested_wall += wall
+                stack[-1].nested_cpu += cpu
+                stack[-1].nested_child_cpu += child_cpu
+
+            with self._lock:
+                timing = self._phases.get(name)
+                if timing is None:
+                    timing = self._phases[name] = _PhaseTiming()
+
+                timing.calls += 1
+                timing.wall += wall - active.nested_wall
+                timing.cpu += cpu - active.nested_cpu
+                timing.child_cpu += child_cpu - active.nested_child_cpu
+
+    def _sample(self):
+        '''
+        Record the stack of every other thread every sample_interval seconds.
+        '''
+
+        sampler_id = threading.get_ident()
+
+        while not self._stop_sampling.wait(self._sample_interval):
+            frames = sys._current_frames()  # pylint: disable=protected-access
+
+            for thread_id, frame in frames.items():
+                if thread_id == sampler_id:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} '
+                                 f'({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+
+                self._samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        '''
+        Start the profile.
+        '''
+
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self._child_cpu_started = _child_cpu()
+
+        if self._stats_file:
+            import cProfile  # pylint: disable=import-outside-toplevel
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+        if self._sample_file:
+            self._sampler = threading.Thread(target=self._sample, name='sealog-profile-sampler',
+                                             daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        '''
+        Stop the profile and write the cProfile stats and stack samples.
+        '''
+
+        if self._started is None or self._wall is not None:
+            return
+
+        self._wall = time.perf_counter() - self._started
+        self._cpu = time.process_time() - self._cpu_started
+        self._child_cpu = _child_cpu() - self._child_cpu_started
+
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+
+            try:
+                with open(self._sample_file, 'w', encoding='utf-8') as sample_fp:
+                    for stack, count in self._samples.most_common():
+                        sample_fp.write(f'{stack} {count}\n')
+
+                logging.info("%d stack samples saved to %s", sum(self._samples.values()),
+                             self._sample_file)
+
+            except OSError as exc:
+                logging.error("Unable to save the stack samples to %s", self._sample_file)
+                logging.debug(str(exc))
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+            try:
+                self._cprofile.dump_stats(self._stats_file)
+                logging.info("cProfile stats saved to %s", self._stats_file)
+
+            except OSError as exc:
+                logging.error("Unable to save the cProfile stats to %s", self._stats_file)
+                logging.debug(str(exc))
+
+    def to_dict(self):
+        '''
+        Return the timings of each phase and the time not spent in any phase
+        as a dict that can be serialized to json.
+        '''
+
+        if self._wall is not None:
+            wall, cpu, child_cpu = self._wall, self._cpu, self._child_cpu
+
+        else:
+            wall = time.perf_counter() - self._started
+            cpu = time.process_time() - self._cpu_started
+            child_cpu = _child_cpu() - self._child_cpu_started
+
+        with self._lock:
+            phases = {name: {'calls': timing.calls, 'wall': timing.wall, 'cpu': timing.cpu,
+                             'child_cpu': timing.child_cpu}
+                      for name, timing in sorted(self._phases.items(),
+                                                 key=lambda item: -item[1].wall)}
+
+        phases['(other)'] = {
+            'calls': 1,
+            'wall': max(0.0, wall - sum(timing['wall'] for timing in phases.values())),
+            'cpu': max(0.0, cpu - sum(timing['cpu'] for timing in phases.values())),
+            'child_cpu': max(0.0, child_cpu - sum(timing['child_cpu']
+                                                  for timing in phases.values()))
+        }
+
+        return {
+            'wall': wall,
+            'cpu': cpu,
+            'child_cpu': child_cpu,
+            'phases': phases
+        }
+
+    def summary(self):
+        '''
+        Return the phase timings as a table.
+        '''
+
+        stats = self.to_dict()
+        wall = stats['wall'] or 1.0
+
+        lines = [f"{'phase':24} {'calls':>8} {'wall s':>10} {'wall %':>7} {'cpu s':>10} "
+                 f"{'child cpu s':>12}"]
+
+        for name, timing in stats['phases'].items():
+            lines.append(f"{name:24} {timing['calls']:>8} {timing['wall']:>10.3f} "
+                         f"{timing['wall'] / wall:>7.1%} {timing['cpu']:>10.3f} "
+                         f"{timing['child_cpu']:>12.3f}")
+
+        lines.append(f"{'total':24} {'':>8} {stats['wall']:>10.3f} {'':>7} {stats['cpu']:>10.3f} "
+                     f"{stats['child_cpu']:>12.3f}")
+
+        return '\n'.join(lines)
+
+
+def enable_profiling(stats_file=None, sample_file=None, sample_interval=DEFAULT_SAMPLE_INTERVAL):
+    '''
+    Start recording the phase timings, optionally profiling with cProfile
+    (saved to stats_file) and sampling the stacks (saved to sample_file).
+    Returns the Profiler object.
+    '''
+
+    global _profiler  # pylint: disable=global-statement,invalid-name
+
+    if _profiler is None:
+        _profiler = Profiler(stats_file, sample_file, sample_interval)
+        _profiler.start()
+
+    return _profiler
+
+
+def disable_profiling():
+    '''
+    Stop the profile and discard the timings.
+    '''
+
+    global _profiler  # pylint: disable=global-statement,invalid-name
+
+    if _profiler is not None:
+        _profiler.stop()
+
+    _profiler = None
+
+
+def get_profiler():
+    '''
+    Return the Profiler object or None if profiling is not enabled.
+    '''
+
+    return _profiler
+
+
+def phase(name):
+    '''
+    Context manager that records the time spent in a phase, i.e.
+
+        with phase('rsync'):
+            subprocess.call(['rsync', ...])
+
+    Does nothing if profiling is not enabled.
+    '''
+
+    if _profiler is None:
+        return _NO_PHASE
+
+    return _profiler.phase(name)
+
+
+def add_profile_arguments(parser):
+    '''
+    Add the --profile options to the argparse parser.
+    '''
+
+    parser.add_argument('--profile', action='store_true',
+                        help='print the time spent in each phase at exit')
+    parser.add_argument('--profile_stats', metavar='FILE',
+                        help='profile with cProfile and save the stats to FILE in pstats format, '
+                             'implies --profile')
+    parser.add_argument('--profile_sample', metavar='FILE',
+                        help='sample the stacks and save them to FILE in collapsed (flamegraph) '
+                             'format, implies --profile')
+    parser.add_argument('--profile_interval', type=float, default=DEFAULT_SAMPLE_INTERVAL,
+                        help=f'seconds between stack samples, default: {DEFAULT_SAMPLE_INTERVAL}')
+
+
+def _finish_profiling():
+    profiler = _profiler
+
+    if profiler is None:
+        return
+
+    profiler.stop()
+    print(profiler.summary(), file=sys.stderr)
+
+
+def start_profiling(parsed_args):
+    '''
+    Enable profiling if requested by the --profile options and print the
+    summary table to stderr at exit.  Returns the Profiler object or None.
+    '''
+
+    if not (parsed_args.profile or parsed_args.profile_stats or parsed_args.profile_sample):
+        return None
+
+    profiler = enable_profiling(parsed_args.profile_stats, parsed_args.profile_sample,
+                                parsed_args.profile_interval)
+    atexit.register(_finish_profiling)
+
+    return profiler
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+'''
+FILE:           ws_subscriber.py
+
+DESCRIPTION:    This script contains a reusable asyncio client for the sealog-
+                server websocket subscriptions.  It handles the HELLO/PING
+                exchange, reconnects with exponential backoff and hands
+                published messages to a bounded queue serviced by a pool of
+                worker tasks.  Optionally recovers the events published while
+                the connection was down.
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import random
+import asyncio
+import inspect
+import logging
+from collections import OrderedDict
+import websockets
+
+from misc.python_sealog.settings import API_SERVER_URL, WS_SERVER_URL, HEADERS
+from misc.python_sealog.json_backend import dumps, loads
+from misc.python_sealog.api_client import invalidate_cache_by_sub
+from misc.python_sealog.events import get_events
+
+NEW_EVENTS_PATH = '/ws/status/newEvents'
+
+DEFAULT_WORKERS = 1
+
+DEFAULT_QUEUE_SIZE = 1000
+
+DEFAULT_MIN_BACKOFF = 1  # seconds
+
+DEFAULT_MAX_BACKOFF = 60  # seconds
+
+DEFAULT_CATCH_UP_PAGE_SIZE = 500
+
+# number of recently processed event ids remembered to drop duplicates
+SEEN_EVENTS_SIZE = 10000
+
+
+class SealogWSSubscriber():  # pylint: disable=too-many-instance-attributes
+    '''
+    Class that subscribes to one or more sealog-server websocket feeds and
+    passes each published message to handler(path, message).
+
+    Pings are answered by the reader as soon as they arrive.  Published
+    messages are placed on a bounded queue and processed by worker tasks so a
+    slow handler never delays a ping reply.  The reader never waits for room
+    in the queue.  If the queue is full when a new event arrives and catch_up
+    is True, the event is dropped and recovered from the API by a catch-up
+    once the workers have emptied the queue, any other message is queued by
+    dropping the oldest message in the queue.  Handlers may be plain functions
+    or coroutines, plain functions are run in a thread so blocking API calls
+    do not stall the event loop.  With the default of one worker, messages are
+    handled in the order they were received.
+
+    When catch_up is True and the newEvents feed is subscribed, the ts of the
+    last processed event is recorded.  After a reconnect the events created
+    since that ts are retrieved from the API in pages of catch_up_page_size
+    and passed to the handler before any live messages received in the
+    meantime.  Events that have already been processed are skipped.  Set
+    last_event_ts to also catch up on the first connection, e.g. from a ts
+    persisted by a previous run.  If provided, the recovered events are passed
+    to catch_up_handler(path, message) instead of the handler, e.g. so they
+    are only processed by the handlers that want them.
+
+    If provided, on_connect() is called each time the connection is
+    established, e.g. to refresh cached state that may have changed while
+    disconnected.  When the python_sealog response cache is enabled, the
+    cached responses made stale by each published message are dropped.
+
+    If provided, on_receive(path, message) is called by the reader as each
+    published message arrives, before it is queued, e.g. to record when
+    events were received.  It must be quick and must not block.
+    '''
+
+    def __init__(self, client_wsid, subs,  # pylint: disable=too-many-arguments,too-many-locals
+                 handler, ws_server_url=WS_SERVER_URL, headers=HEADERS,
+                 workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE,
+                 min_backoff=DEFAULT_MIN_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF,
+                 catch_up=False, catch_up_page_size=DEFAULT_CATCH_UP_PAGE_SIZE,
+                 api_server_url=API_SERVER_URL, on_connect=None, last_event_ts=None,
+                 on_receive=None, catch_up_handler=None):
+        self._client_wsid = client_wsid
+        self._subs = list(subs)
+        self._handler = handler
+        self._ws_server_url = ws_server_url
+        self._headers = headers
+        self._workers = max(1, workers)
+        self._queue_size = queue_size
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._catch_up = catch_up and NEW_EVENTS_PATH in self._subs
+        self._catch_up_page_size = catch_up_page_size
+        self._api_server_url = api_server_url
+        self._on_connect = on_connect
+        self._on_receive = on_receive
+        self._catch_up_handler = catch_up_handler or handler
+        self._queue = None
+        self._ping = dumps({'type': 'ping', 'id': self._client_wsid})
+        self._last_event_ts = last_event_ts
+        self._seen_events = OrderedDict()
+        self._catching_up = False
+        self._held = []
+        self._catch_up_task = None
+        self._missed_since = None
+        self._dropped = 0
+
+    @property
+    def hello(self):
+        '''
+        The HELLO message sent to the server after connecting.
+        '''
+        return {
+            'type': 'hello',
+            'id': self._client_wsid,
+            'auth': {
+                'headers': self._headers
+            },
+            'version': '2',
+            'subs': self._subs
+        }
+
+    @property
+    def subs(self):
+        '''
+        Getter method for the _subs property
+        '''
+        return self._subs
+
+    @property
+    def last_event_ts(self):
+        '''
+        Getter method for the _last_event_ts property
+        '''
+        return self._last_event_ts
+
+    def _is_duplicate(self, path, message):
+        '''
+        Return True if the message is a new event that was already processed.
+        '''
+
+        return path == NEW_EVENTS_PATH and message.get('id') in self._seen_events
+
+    def _mark_processed(self, path, message):
+        '''
+        Record the id and ts of a processed new event.
+        '''
+
+        if path != NEW_EVENTS_PATH:
+            return
+
+        self._seen_events[message.get('id')] = True
+        if len(self._seen_events) > SEEN_EVENTS_SIZE:
+            self._seen_events.popitem(last=False)
+
+        if self._last_event_ts is None or message['ts'] > self._last_event_ts:
+            self._last_event_ts = message['ts']
+
+    def _backoff_delay(self, attempt):
+        '''
+        Return the delay before the next connection attempt.  The delay doubles
+        with each failed attempt up to max_backoff and is jittered so a group
+        of clients does not reconnect in lock-step after a server restart.
+        '''
+
+        cap = min(self._max_backoff, self._min_backoff * (2 ** attempt))
+        return random.uniform(cap / 2, cap)
+
+    @staticmethod
+    async def _call(func, *args):
+        '''
+        Call a function or coroutine, plain functions are run in a thread.
+        '''
+
+        if inspect.iscoroutinefunction(func):
+            await func(*args)
+        else:
+            await asyncio.to_thread(func, *args)
+
+    async def _dispatch(self, path, message, recovered=False):
+        '''
+        Call the handler for a single published message, recovered is True for
+        the events retrieved by a catch-up.
+        '''
+
+        await self._call(self._catch_up_handler if recovered else self._handler, path, message)
+
+    async def _run_on_connect(self):
+        '''
+        Call the on_connect function.
+        '''
+
+        try:
+            await self._call(self._on_connect)
+
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logging.error("Error running on_connect function")
+            logging.debug(str(exc))
+
+    async def _worker(self):
+        '''
+        Pull messages from the queue and pass them to the handler.
+        '''
+
+        while True:
+            path, message, recovered = await self._queue.get()
+
+            try:
+                if self._is_duplicate(path, message):
+                    logging.debug("Skipping event %s, already processed", message.get('id'))
+                    continue
+
+                await self._dispatch(path, message, recovered)
+                self._mark_processed(path, message)
+
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logging.error("Error handling message from %s", path)
+                logging.debug(str(exc))
+
+            finally:
+                self._queue.task_done()
+
+            # recover the events dropped while the queue was full
+            if self._missed_since is not None and self._queue.empty() and not self._catching_up:
+                self._start_catch_up(self._missed_since)
+
+    def _enqueue_nowait(self, path, message):
+        '''
+        Add a published message to the queue without waiting for room.  When
+        the queue is full a new event is dropped and marked for catch-up if
+        catch_up is enabled, otherwise the oldest queued message is dropped.
+        '''
+
+        if not self._queue.full():
+            self._queue.put_nowait((path, message, False))
+            return
+
+        if self._catch_up and path == NEW_EVENTS_PATH and message.get('ts'):
+            if self._missed_since is None:
+                logging.warning("Message queue is full, events will be retrieved once the "
+                                "handlers catch up")
+
+            if self._missed_since is None or message['ts'] < self._missed_since:
+                self._missed_since = message['ts']
+
+            return
+
+        self._queue.get_nowait()
+        self._queue.task_done()
+        self._queue.put_nowait((path, message, False))
+
+        self._dropped += 1
+        logging.warning("Message queue is full, dropped the oldest message (%d dropped)",
+                        self._dropped)
+
+    def _start_catch_up(self, start_ts):
+        '''
+        Start retrieving the events created since start_ts, live messages are
+        held back until the catch-up is complete.
+        '''
+
+        if self._missed_since is not None and self._missed_since < start_ts:
+            start_ts = self._missed_since
+
+        self._missed_since = None
+        self._catching_up = True
+        self._held = []
+        self._catch_up_task = asyncio.create_task(self._run_catch_up(start_ts))
+
+    async def _run_catch_up(self, start_ts):
+        '''
+        Queue the events created since start_ts, waiting for room in the queue,
+        then release the live messages held back while the missed events were
+        retrieved.
+        '''
+
+        try:
+            offset = 0
+            total = 0
+
+            logging.info("Retrieving events created since %s", start_ts)
+
+            while True:
+                events = await asyncio.to_thread(get_events, start_ts=start_ts,
+                                                 limit=self._catch_up_page_size,
+                                                 offset=offset,
+                                                 api_server_url=self._api_server_url,
+                                                 headers=self._headers)
+
+                if not events:
+                    break
+
+                for event in events:
+                    await self._queue.put((NEW_EVENTS_PATH, event, True))
+
+                total += len(events)
+
+                if len(events) < self._catch_up_page_size:
+                    break
+
+                offset += self._catch_up_page_size
+
+            logging.info("Queued %d events for catch-up", total)
+
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logging.error("Unable to retrieve the missed events")
+            logging.debug(str(exc))
+
+        finally:
+            # when cancelled by a disconnect the reader releases the held
+            # messages
+            if asyncio.current_task() is self._catch_up_task:
+                while self._held:
+                    path, message = self._held.pop(0)
+                    await self._queue.put((path, message, False))
+
+                self._catching_up = False
+                self._catch_up_task = None
+
+    async def _reader(self, websocket):
+        '''
+        Send the HELLO message then read messages until the connection closes.
+        '''
+
+        await websocket.send(dumps(self.hello))
+
+        on_connect_task = None
+
+        if self._on_connect is not None:
+            on_connect_task = asyncio.create_task(self._run_on_connect())
+
+        if self._catch_up and (self._last_event_ts or self._missed_since) is not None:
+            self._start_catch_up(self._last_event_ts or self._missed_since)
+
+        try:
+            async for msg in websocket:
+                msg_obj = loads(msg)
+                msg_type = msg_obj.get('type')
+
+                if msg_type == 'ping':
+                    await websocket.send(self._ping)
+
+                elif msg_type == 'pub':
+                    # drop any cached API responses the message made stale
+                    invalidate_cache_by_sub(msg_obj['path'])
+
+                    if self._on_receive is not None:
+                        self._on_receive(msg_obj['path'], msg_obj['message'])
+
+                    if self._catching_up:
+                        self._held.append((msg_obj['path'], msg_obj['message']))
+                    else:
+                        self._enqueue_nowait(msg_obj['path'], msg_obj['message'])
+
+        finally:
+            if on_connect_task is not None:
+                on_connect_task.cancel()
+
+            if self._catch_up_task is not None:
+                self._catch_up_task.cancel()
+                self._catch_up_task = None
+                self._catching_up = False
+
+                held, self._held = self._held, []
+                for path, message in held:
+                    self._enqueue_nowait(path, message)
+
+    async def run(self):
+        '''
+        Connect to the websocket server and process messages until cancelled,
+        reconnecting whenever the connection is lost.
+        '''
+
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        workers = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+
+        attempt = 0
+
+        try:
+            while True:
+                try:
+                    logging.debug("Connecting to websocket feed: %s", self._ws_server_url)
+                    async with websockets.connect(self._ws_server_url) as websocket:
+                        attempt = 0
+                        await self._reader(websocket)
+
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    logging.debug(str(exc))
+
+                delay = self._backoff_delay(attempt)
+                attempt += 1
+                logging.error("Lost connection to server, trying again in %0.1f seconds", delay)
+                await asyncio.sleep(delay)
+
+        finally:
+            for worker in workers:
+                worker.cancel()
@@ -0,0 +1,16 @@
+'''
+Stub sealog-server and synthetic datasets for benchmarking the python_sealog
+wrappers and the service scripts without a live server.
+
+The sealog root directory is added to the module search path once, when the
+package is first imported, so the modules can import each other as
+misc.sealog_bench.<module>.
+'''
+
+import sys
+from os.path import dirname, realpath
+
+_ROOT_DIR = dirname(dirname(dirname(realpath(__file__))))
+
+if _ROOT_DIR not in sys.path:
+    sys.path.append(_ROOT_DIR)
@@ -0,0 +1,604 @@
+#!/usr/bin/env python3
+'''
+FILE:           stub_server.py
+
+DESCRIPTION:    This script contains a stub sealog-server used to benchmark
+                the python_sealog wrappers and the service scripts without a
+                live server.  It answers the API routes used by the wrappers
+                from a SyntheticDataset, optionally adding a fixed latency
+                plus jitter to every request, and publishes new events to
+                websocket clients on a second port.
+
+BUGS:
+NOTES:          Only json responses are supported, requests for csv return a
+                501 status.
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import re
+import sys
+import time
+import random
+import asyncio
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import websockets
+
+from os.path import dirname, realpath
+sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
+
+from misc.python_sealog.json_backend import dumps, loads
+from misc.sealog_bench.synthetic import SyntheticDataset
+
+API_PREFIX = '/sealog-server/api/v1'
+
+DEFAULT_HOST = 'localhost'
+DEFAULT_PORT = 8000
+
+NEW_EVENTS_PATH = '/ws/status/newEvents'
+
+
+def _by_id(records, uid):
+    '''
+    Return the record with the uid or None.
+    '''
+
+    return next((record for record in records if record['id'] == uid), None)
+
+
+def _page(records, params):
+    '''
+    Apply the offset and limit query parameters.
+    '''
+
+    offset = int(params.get('offset', ['0'])[0])
+    limit = int(params.get('limit', ['0'])[0])
+
+    return records[offset:offset + limit] if limit else records[offset:]
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    '''
+    Answer the sealog-server API requests from the SyntheticDataset of the
+    StubSealogServer.
+    '''
+
+    protocol_version = 'HTTP/1.1'
+
+    # the headers and body are written separately, without this small
+    # responses wait on the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    ROUTES = (
+        ('GET', r'/cruises', '_get_cruises'),
+        ('GET', r'/cruises/bylowering/(\w+)', '_get_cruise_by_lowering'),
+        ('GET', r'/cruises/byevent/(\w+)', '_get_cruise_by_event'),
+        ('GET', r'/cruises/(\w+)', '_get_cruise'),
+        ('GET', r'/lowerings', '_get_lowerings'),
+        ('GET', r'/lowerings/bycruise/(\w+)', '_get_lowerings_by_cruise'),
+        ('GET', r'/lowerings/byevent/(\w+)', '_get_lowering_by_event'),
+        ('GET', r'/lowerings/(\w+)', '_get_lowering'),
+        ('GET', r'/(events|event_exports)', '_get_events'),
+        ('GET', r'/(events|event_exports)/bycruise/(\w+)', '_get_events_by_cruise'),
+        ('GET', r'/(events|event_exports)/bylowering/(\w+)', '_get_events_by_lowering'),
+        ('GET', r'/(events|event_exports)/(\w+)', '_get_event'),
+        ('GET', r'/event_aux_data', '_get_aux_data'),
+        ('GET', r'/event_aux_data/bycruise/(\w+)', '_get_aux_data_by_cruise'),
+        ('GET', r'/event_aux_data/bylowering/(\w+)', '_get_aux_data_by_lowering'),
+        ('GET', r'/event_templates', '_get_event_templates'),
+        ('GET', r'/custom_vars', '_get_custom_vars'),
+        ('GET', r'/custom_vars/(\w+)', '_get_custom_var'),
+        ('POST', r'/events', '_create_event'),
+        ('POST', r'/events/bulk', '_create_events'),
+        ('POST', r'/event_aux_data', '_create_aux_data'),
+        ('PATCH', r'/(lowerings|cruises|custom_vars|events)/(\w+)', '_update'),
+        ('DELETE', r'/(events|event_aux_data)/(\w+)', '_delete')
+    )
+
+    ROUTE_REGEXES = [(method, re.compile(pattern + '$'), name) for method, pattern, name in ROUTES]
+
+    @property
+    def stub(self):
+        '''
+        The StubSealogServer.
+        '''
+        return self.server.stub
+
+    @property
+    def dataset(self):
+        '''
+        The SyntheticDataset served by the StubSealogServer.
+        '''
+        return self.server.stub.dataset
+
+    def _handle(self, method):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0) or 0))
+
+        self.stub.delay()
+
+        if not url.path.startswith(API_PREFIX):
+            self._send(404)
+            return
+
+        if params.get('format', ['json'])[0] != 'json':
+            self._send(501, {'statusCode': 501,
+                             'message': 'Only json responses are supported by the stub server'})
+            return
+
+        route = url.path[len(API_PREFIX):]
+
+        for route_method, regex, name in self.ROUTE_REGEXES:
+            match = regex.match(route)
+            if route_method == method and match:
+                payload = loads(body) if body else None
+                self._send(*getattr(self, name)(params, payload, *match.groups()))
+                return
+
+        self._send(404, {'statusCode': 404, 'message': 'Route not found'})
+
+    def _send(self, status, result=None):
+        body = dumps(result).encode('utf-8') if result is not None else b''
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        self.stub.count_request(len(body))
+
+    @staticmethod
+    def _records(records):
+        if not records:
+            return 404, {'statusCode': 404, 'message': 'No records found'}
+
+        return 200, records
+
+    def _find(self, records, uid):
+        record = _by_id(records, uid)
+        return (200, record) if record is not None else self._records(None)
+
+    def _events(self, kind, params, events):
+        events = _page(events, params)
+
+        if kind == 'event_exports':
+            events = [self.dataset.get_event_export(event) for event in events]
+
+        return self._records(events)
+
+    # ------------------------------------------------------------------------
+    def _get_cruises(self, params, _):
+        cruise_ids = params.get('cruise_id')
+        return self._records([cruise for cruise in self.dataset.cruises
+                              if not cruise_ids or cruise['cruise_id'] in cruise_ids])
+
+    def _get_cruise(self, _, __, uid):
+        return self._find(self.dataset.cruises, uid)
+
+    def _get_cruise_by_lowering(self, _, __, uid):
+        lowering = _by_id(self.dataset.lowerings, uid)
+        return self._records(lowering and self.dataset.find_cruise(lowering['start_ts']))
+
+    def _get_cruise_by_event(self, _, __, uid):
+        event = self.dataset.get_event(uid)
+        return self._records(event and self.dataset.find_cruise(event['ts']))
+
+    def _get_lowerings(self, params, _):
+        lowering_ids = params.get('lowering_id')
+        return self._records([lowering for lowering in self.dataset.lowerings
+                              if not lowering_ids or lowering['lowering_id'] in lowering_ids])
+
+    def _get_lowering(self, _, __, uid):
+        return self._find(self.dataset.lowerings, uid)
+
+    def _get_lowerings_by_cruise(self, _, __, uid):
+        cruise = _by_id(self.dataset.cruises, uid)
+        return self._records(cruise and [
+            lowering for lowering in self.dataset.lowerings
+            if cruise['start_ts'] <= lowering['start_ts'] <= cruise['stop_ts']
+        ])
+
+    def _get_lowering_by_event(self, _, __, uid):
+        event = self.dataset.get_event(uid)
+        return self._records(event and self.dataset.find_lowering(event['ts']))
+
+    def _get_events(self, params, _, kind):
+        return self._events(kind, params, self.dataset.get_events(params.get('startTS', [None])[0],
+                                                                  params.get('stopTS', [None])[0],
+                                                                  params.get('value')))
+
+    def _get_events_by_cruise(self, params, _, kind, uid):
+        cruise = _by_id(self.dataset.cruises, uid)
+        if cruise is None:
+            return self._records(None)
+
+        events = self.dataset.get_events(cruise['start_ts'], cruise['stop_ts'], params.get('value'))
+        return self._events(kind, params, events)
+
+    def _get_events_by_lowering(self, params, _, kind, uid):
+        lowering = _by_id(self.dataset.lowerings, uid)
+        if lowering is None:
+            return self._records(None)
+
+        events = self.dataset.get_events(lowering['start_ts'], lowering['stop_ts'],
+                                         params.get('value'))
+        return self._events(kind, params, events)
+
+    def _get_event(self, _, __, kind, uid):
+        event = self.dataset.get_event(uid)
+        if event is None:
+            return self._records(None)
+
+        return 200, self.dataset.get_event_export(event) if kind == 'event_exports' else event
+
+    def _aux_data(self, params, events):
+        records = [record for event in events
+                   for record in self.dataset.get_aux_data(event['id'], params.get('datasource'))]
+
+        return self._records(_page(records, params))
+
+    def _get_aux_data(self, params, _):
+        return self._aux_data(params, self.dataset.get_events(params.get('startTS', [None])[0],
+                                                              params.get('stopTS', [None])[0]))
+
+    def _get_aux_data_by_cruise(self, params, _, uid):
+        cruise = _by_id(self.dataset.cruises, uid)
+        if cruise is None:
+            return self._aux_data(params, [])
+
+        return self._aux_data(params, self.dataset.get_events(cruise['start_ts'],
+                                                              cruise['stop_ts']))
+
+    def _get_aux_data_by_lowering(self, params, _, uid):
+        lowering = _by_id(self.dataset.lowerings, uid)
+        if lowering is None:
+            return self._aux_data(params, [])
+
+        return self._aux_data(params, self.dataset.get_events(lowering['start_ts'],
+                                                              lowering['stop_ts']))
+
+    def _get_event_templates(self, _, __):
+        return self._records([])
+
+    def _get_custom_vars(self, params, _):
+        names = params.get('name')
+        return self._records([custom_var for custom_var in self.dataset.custom_vars
+                              if not names or custom_var['custom_var_name'] in names])
+
+    def _get_custom_var(self, _, __, uid):
+        return self._find(self.dataset.custom_vars, uid)
+
+    def _create_event(self, _, payload):
+        event = self.dataset.add_event(payload)
+        self.stub.publish(NEW_EVENTS_PATH, event)
+        return 201, {'acknowledged': True, 'insertedId': event['id'], 'insertedCount': 1}
+
+    def _create_events(self, _, payload):
+        for event in payload:
+            self.dataset.add_event(event)
+
+        return 201, {'acknowledged': True, 'insertedCount': len(payload)}
+
+    def _create_aux_data(self, _, payload):
+        created = self.dataset.add_aux_data(payload)
+
+        if created is None:
+            return 404, {'statusCode': 404, 'message': 'No event found for event_id'}
+
+        return (201, {'acknowledged': True, 'insertedCount': 1}) if created else (204, None)
+
+    def _update(self, _, __, ___, ____):
+        return 204, None
+
+    def _delete(self, _, __, ___, ____):
+        return 204, None
+
+    # ------------------------------------------------------------------------
+    def do_GET(self):  # pylint: disable=invalid-name
+        '''
+        Answer a GET request.
+        '''
+        self._handle('GET')
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        '''
+        Answer a POST request.
+        '''
+        self._handle('POST')
+
+    def do_PATCH(self):  # pylint: disable=invalid-name
+        '''
+        Answer a PATCH request.
+        '''
+        self._handle('PATCH')
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        '''
+        Answer a DELETE request.
+        '''
+        self._handle('DELETE')
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logging.debug(format, *args)
+
+
+class StubSealogServer():  # pylint: disable=too-many-instance-attributes
+    '''
+    Class that serves a SyntheticDataset through the sealog-server API routes
+    on port and a websocket feed on ws_port.  Port 0 picks a free port.
+    Every request is delayed by latency seconds plus a random jitter of up to
+    jitter seconds.
+
+    Use as a context manager, or call start() and stop():
+
+        with StubSealogServer(SyntheticDataset(events=10000)) as server:
+            get_events(api_server_url=server.api_server_url)
+    '''
+
+    def __init__(self, dataset=None,  # pylint: disable=too-many-arguments
+                 host=DEFAULT_HOST, port=0, ws_port=0, latency=0.0, jitter=0.0, seed=0):
+        self.dataset = dataset if dataset is not None else SyntheticDataset()
+        self._host = host
+        self._port = port
+        self._ws_port = ws_port
+        self._latency = latency
+        self._jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._bytes = 0
+        self._httpd = None
+        self._loop = None
+        self._ws_server = None
+        self._clients = {}
+        self._subscribed = threading.Condition()
+
+    @property
+    def api_server_url(self):
+        '''
+        The url to pass to the wrappers as api_server_url.
+        '''
+        return f'http://{self._host}:{self._port}/sealog-server'
+
+    @property
+    def ws_server_url(self):
+        '''
+        The url to pass to the SealogWSSubscriber as ws_server_url.
+        '''
+        return f'ws://{self._host}:{self._ws_port}/ws'
+
+    @property
+    def requests(self):
+        '''
+        Getter method for the _requests property
+        '''
+        return self._requests
+
+    @property
+    def bytes(self):
+        '''
+        Getter method for the _bytes property
+        '''
+        return self._bytes
+
+    def delay(self):
+        '''
+        Sleep for the configured request latency.
+        '''
+
+        if self._latency or self._jitter:
+            with self._lock:
+                jitter = self._rng.uniform(0, self._jitter)
+
+            time.sleep(self._latency + jitter)
+
+    def count_request(self, nbytes):
+        '''
+        Count a request and the size of its response.
+        '''
+
+        with self._lock:
+            self._requests += 1
+            self._bytes += nbytes
+
+    def reset_counts(self):
+        '''
+        Zero the request and byte counts.
+        '''
+
+        with self._lock:
+            self._requests = 0
+            self._bytes = 0
+
+    # ------------------------------------------------------------------------
+    async def _ws_handler(self, websocket):
+        '''
+        Record the subscriptions sent in the HELLO message and ignore the
+        other client messages.
+        '''
+
+        try:
+            async for msg in websocket:
+                msg_obj = loads(msg)
+
+                if msg_obj.get('type') == 'hello':
+                    with self._subscribed:
+                        self._clients[websocket] = set(msg_obj.get('subs', []))
+                        self._subscribed.notify_all()
+
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+        finally:
+            with self._subscribed:
+                self._clients.pop(websocket, None)
+
+    async def _broadcast(self, path, message):
+        msg = dumps({'type': 'pub', 'path': path, 'message': message})
+
+        for websocket, subs in list(self._clients.items()):
+            if path in subs:
+                try:
+                    await websocket.send(msg)
+
+                except websockets.exceptions.ConnectionClosed:
+                    pass
+
+    def publish(self, path, message):
+        '''
+        Publish a message to the websocket clients subscribed to path.  Safe
+        to call from any thread.  Returns a concurrent.futures.Future.
+        '''
+
+        return asyncio.run_coroutine_threadsafe(self._broadcast(path, message), self._loop)
+
+    def wait_for_subscriber(self, path=NEW_EVENTS_PATH, timeout=10):
+        '''
+        Wait until a websocket client has subscribed to path.  Returns True if
+        a client subscribed within timeout seconds.
+        '''
+
+        with self._subscribed:
+            return self._subscribed.wait_for(
+                lambda: any(path in subs for subs in self._clients.values()), timeout)
+
+    # ------------------------------------------------------------------------
+    def _run_loop(self, started):
+        asyncio.set_event_loop(self._loop)
+
+        async def _serve():
+            self._ws_server = await websockets.serve(self._ws_handler, self._host, self._ws_port)
+            self._ws_port = self._ws_server.sockets[0].getsockname()[1]
+
+        self._loop.run_until_complete(_serve())
+        started.set()
+        self._loop.run_forever()
+
+    def start(self):
+        '''
+        Start serving the API and websocket feed from background threads.
+        '''
+
+        self._httpd = ThreadingHTTPServer((self._host, self._port), _StubRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, name='sealog-stub-http',
+                         daemon=True).start()
+
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._run_loop, args=(started,), name='sealog-stub-ws',
+                         daemon=True).start()
+        started.wait()
+
+        logging.info("Stub sealog-server at %s, websocket feed at %s",
+                     self.api_server_url, self.ws_server_url)
+
+        return self
+
+    def stop(self):
+        '''
+        Stop serving.
+        '''
+
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+        if self._loop is not None:
+            async def _close():
+                self._ws_server.close()
+                await self._ws_server.wait_closed()
+
+            asyncio.run_coroutine_threadsafe(_close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+# -------------------------------------------------------------------------------------
+# Required python code for running the script as a stand-alone utility
+# -------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    import os
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Stub sealog-server serving a synthetic dataset')
+    parser.add_argument('-v', '--verbosity', dest='verbosity',
+                        default=0, action='count',
+                        help='Increase output verbosity')
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f'host to listen on, default: {DEFAULT_HOST}')
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT,
+                        help=f'API port, default: {DEFAULT_PORT}')
+    parser.add_argument('-w', '--ws_port', type=int, help='websocket feed port, default: port + 1')
+    parser.add_argument('-c', '--cruises', type=int, default=1, help='number of cruises')
+    parser.add_argument('-l', '--lowerings', type=int, default=4,
+                        help='number of lowerings per cruise')
+    parser.add_argument('-e', '--events', type=int, default=1000,
+                        help='number of events per lowering')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the synthetic dataset')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='maximum random seconds added to every request')
+    parser.add_argument('-a', '--asnap_interval', type=float,
+                        help='publish a new ASNAP event on the websocket feed every '
+                             'asnap_interval seconds')
+
+    parsed_args = parser.parse_args()
+
+    ############################
+    # Set up logging before we do any other argument parsing (so that we
+    # can log problems with argument parsing).
+
+    LOGGING_FORMAT = '%(asctime)-15s %(levelname)s - %(message)s'
+    logging.basicConfig(format=LOGGING_FORMAT)
+
+    LOG_LEVELS = {0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}
+    parsed_args.verbosity = min(parsed_args.verbosity, max(LOG_LEVELS))
+    logging.getLogger().setLevel(LOG_LEVELS[parsed_args.verbosity])
+
+    stub = StubSealogServer(SyntheticDataset(parsed_args.cruises, parsed_args.lowerings,
+                                             parsed_args.events, parsed_args.seed),
+                            parsed_args.host, parsed_args.port,
+                            parsed_args.ws_port or parsed_args.port + 1,
+                            parsed_args.latency, parsed_args.jitter, parsed_args.seed)
+
+    try:
+        stub.start()
+        print(f'API: {stub.api_server_url}')
+        print(f'Websocket feed: {stub.ws_server_url}')
+
+        while True:
+            if parsed_args.asnap_interval:
+                time.sleep(parsed_args.asnap_interval)
+                stub.publish(NEW_EVENTS_PATH, stub.dataset.new_event('ASNAP'))
+            else:
+                time.sleep(60)
+
+    except KeyboardInterrupt:
+        logging.warning('Interrupted')
+        stub.stop()
+        try:
+            sys.exit(0)
+        except SystemExit:
+            os._exit(0)  # pylint: disable=protected-access
@@ -0,0 +1,754 @@
+#!/usr/bin/env python3
+'''
+FILE:           synthetic.py
+
+DESCRIPTION:    This script contains a seeded generator of synthetic sealog
+                cruises, lowerings, events and aux_data records.  Each cruise
+                is generated as a stream of events in time order so datasets
+                with millions of records never have to be held in memory.  The
+                vessel leaves port, holds station over each dive site and
+                returns, logging vessel events along the way.  Each lowering
+                follows a vehicle nav track (descent, bottom time, ascent) with
+                ASNAP events at the sealog_asnap interval, manual events at a
+                random rate and an event at each milestone.  Every event gets
+                a vessel nav aux_data record, lowering events also get vehicle
+                nav and frame grab records.  The same seed always produces the
+                same dataset.
+
+                SyntheticDataset holds a generated dataset in memory for the
+                stub sealog-server.
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import math
+import heapq
+import random
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from itertools import chain
+from operator import itemgetter
+
+TS_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+DEFAULT_START_TS = '2024-01-01T00:00:00.000Z'
+
+DEFAULT_CRUISES = 1
+DEFAULT_LOWERINGS = 4  # per cruise
+DEFAULT_EVENTS = 1000  # ASNAP events per lowering held by SyntheticDataset
+
+DEFAULT_ASNAP_INTERVAL = 10  # seconds, same as sealog_asnap
+DEFAULT_EVENT_RATE = 20  # manual events per hour of bottom time
+DEFAULT_VESSEL_EVENT_RATE = 2  # vessel events per hour
+
+# manual events are less frequent while the vehicle is descending/ascending
+TRANSIT_EVENT_FACTOR = 0.25
+
+LOWERING_DURATION = 8 * 3600  # seconds
+LOWERING_SPACING = 24 * 3600  # seconds between the lowering start times
+
+DESCENT_RATE = 0.5  # m/s
+BOTTOM_SPEED = 0.4  # m/s
+METERS_PER_DEGREE = 111320.0
+
+PORT_DISTANCE = 1.0  # degrees from the cruise area
+SITE_SPREAD = 0.01  # standard deviation in degrees of the dive sites
+
+NAV_DATA_SOURCE = 'vehicleRealtimeNavData'
+FRAMEGRAB_DATA_SOURCE = 'vehicleRealtimeFramegrabberData'
+VESSEL_NAV_DATA_SOURCE = 'vesselRealtimeNavData'
+
+CAMERAS = ('CAMERA_1', 'CAMERA_2')
+
+# event value, relative frequency and event_options of the manual lowering
+# events
+EVENT_VALUES = (
+    ('FREE_FORM', 40, []),
+    ('OBSERVATION', 30, [{'event_option_name': 'category', 'event_option_value': 'biology'}]),
+    ('SAMPLE', 20, [{'event_option_name': 'sample_type', 'event_option_value': 'rock'},
+                    {'event_option_name': 'sample_container', 'event_option_value': 'quad box'}]),
+    ('PROBLEM', 10, [{'event_option_name': 'system', 'event_option_value': 'vehicle'}])
+)
+
+# event value, relative frequency and event_options of the vessel events
+VESSEL_EVENT_VALUES = (
+    ('EQUIPMENT', 30, [{'event_option_name': 'system', 'event_option_value': 'USBL'},
+                       {'event_option_name': 'status', 'event_option_value': 'Beacons Tracking'}]),
+    ('SONAR', 30, [{'event_option_name': 'system', 'event_option_value': 'EM124'},
+                   {'event_option_name': 'status', 'event_option_value': 'Setting Change'}]),
+    ('CTD', 20, [{'event_option_name': 'system', 'event_option_value': 'CTD'},
+                 {'event_option_name': 'status', 'event_option_value': 'CTD Deployed'}]),
+    ('FREE_FORM', 15, []),
+    ('PROBLEM', 5, [{'event_option_name': 'system', 'event_option_value': 'EM124'}])
+)
+
+# status of the vehicle event logged at each lowering milestone
+MILESTONE_STATUS = (
+    ('lowering_descending', 'In Water'),
+    ('lowering_on_bottom', 'On Bottom'),
+    ('lowering_off_bottom', 'Off Bottom'),
+    ('lowering_on_surface', 'On Surface')
+)
+
+AUTHORS = ('pilot', 'scientist', 'navigator', 'datalogger')
+VESSEL_AUTHORS = ('mt', 'watchstander')
+
+
+def parse_ts(timestamp):
+    '''
+    Convert an ISO8601 timestamp str to seconds since the epoch.
+    '''
+
+    return datetime.strptime(timestamp, TS_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+
+
+def format_ts(epoch):
+    '''
+    Convert seconds since the epoch to the ISO8601 timestamp str used by the
+    API.
+    '''
+
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime(TS_FORMAT)[:-4] + 'Z'
+
+
+class IdGenerator():
+    '''
+    Produces unique 24 character hex record ids.  Like mongo ObjectIds the
+    first 8 characters are the record time so ids sort roughly by time.
+    '''
+
+    def __init__(self):
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, epoch):
+        with self._lock:
+            self._counter += 1
+            return f'{int(epoch) & 0xffffffff:08x}{self._counter:016x}'
+
+
+class NavTrack():
+    '''
+    A vehicle nav track for a single lowering.  The vehicle descends at
+    DESCENT_RATE to max_depth, wanders along the bottom at BOTTOM_SPEED with a
+    slowly changing heading and then ascends.  Positions must be requested in
+    time order.
+    '''
+
+    def __init__(self, rng, start, stop,  # pylint: disable=too-many-arguments
+                 latitude, longitude, max_depth):
+        self._rng = rng
+        self._time = start
+        self._latitude = latitude
+        self._longitude = longitude
+        self._heading = rng.uniform(0, 360)
+        self._max_depth = max_depth
+
+        # north, east, south, west of the positions returned so far
+        self._bounds = [latitude, longitude, latitude, longitude]
+
+        transit = max_depth / DESCENT_RATE
+        self.start = start
+        self.on_bottom = min(start + transit, (start + stop) / 2)
+        self.off_bottom = max(stop - transit, self.on_bottom)
+        self.stop = stop
+
+    @property
+    def bounding_box(self):
+        '''
+        Getter method for the _bounds property, the [north, east, south, west]
+        extent of the positions returned so far
+        '''
+        return [round(bound, 6) for bound in self._bounds]
+
+    def depth(self, epoch):
+        '''
+        Return the vehicle depth at epoch.
+        '''
+
+        if epoch < self.on_bottom:
+            return max(0.0, (epoch - self.start) * DESCENT_RATE)
+
+        if epoch > self.off_bottom:
+            return max(0.0, self._max_depth - (epoch - self.off_bottom) * DESCENT_RATE)
+
+        return self._max_depth + 5 * math.sin((epoch - self.on_bottom) / 600)
+
+    def position(self, epoch):
+        '''
+        Return the vehicle latitude, longitude, depth and heading at epoch.
+        '''
+
+        if self.on_bottom < epoch < self.off_bottom:
+            elapsed = epoch - max(self._time, self.on_bottom)
+            self._heading = (self._heading + self._rng.gauss(0, 10)) % 360
+
+            distance = BOTTOM_SPEED * max(0.0, elapsed)
+            self._latitude += distance * math.cos(math.radians(self._heading)) / METERS_PER_DEGREE
+            self._longitude += (distance * math.sin(math.radians(self._heading)) /
+                                (METERS_PER_DEGREE * math.cos(math.radians(self._latitude))))
+
+            self._bounds = [max(self._bounds[0], self._latitude),
+                            max(self._bounds[1], self._longitude),
+                            min(self._bounds[2], self._latitude),
+                            min(self._bounds[3], self._longitude)]
+
+        self._time = max(self._time, epoch)
+
+        return self._latitude, self._longitude, self.depth(epoch), self._heading
+
+
+class VesselTrack():
+    '''
+    The vessel nav track for a cruise, a straight line between each of the
+    waypoints.  waypoints is a list of (epoch, latitude, longitude) in time
+    order.  Positions may be requested in any order.
+    '''
+
+    def __init__(self, waypoints):
+        self._waypoints = waypoints
+        self._times = [waypoint[0] for waypoint in waypoints]
+
+    def position(self, epoch):
+        '''
+        Return the vessel latitude, longitude and heading at epoch.
+        '''
+
+        index = min(max(bisect_right(self._times, epoch), 1), len(self._waypoints) - 1)
+        start, latitude, longitude = self._waypoints[index - 1]
+        stop, next_latitude, next_longitude = self._waypoints[index]
+
+        fraction = min(max((epoch - start) / (stop - start), 0.0), 1.0) if stop > start else 1.0
+        delta_latitude = next_latitude - latitude
+        delta_longitude = next_longitude - longitude
+
+        if delta_latitude or delta_longitude:
+            heading = math.degrees(math.atan2(delta_longitude * math.cos(math.radians(latitude)),
+                                              delta_latitude)) % 360
+        else:
+            # holding station, heading into the weather
+            heading = (180 + 10 * math.sin(epoch / 900)) % 360
+
+        return latitude + fraction * delta_latitude, longitude + fraction * delta_longitude, heading
+
+
+def build_cruise(new_id, index, start, stop):
+    '''
+    Return a cruise record.
+    '''
+
+    return {
+        'id': new_id(start),
+        'cruise_id': f'BENCH{index:03d}',
+        'start_ts': format_ts(start),
+        'stop_ts': format_ts(stop),
+        'cruise_location': 'Synthetic Ridge',
+        'cruise_tags': ['synthetic'],
+        'cruise_hidden': False,
+        'cruise_additional_meta': {
+            'cruise_name': f'Synthetic cruise {index}',
+            'cruise_vessel': 'R/V Synthetic',
+            'cruise_pi': 'Dr. Bench Mark',
+            'cruise_departure_location': 'Woods Hole, MA',
+            'cruise_arrival_location': 'Woods Hole, MA',
+            'cruise_description': 'Synthetic cruise generated for benchmarking.',
+            'cruise_participants': list(AUTHORS),
+            'cruise_files': []
+        }
+    }
+
+
+def build_lowering(new_id, cruise, index, track):
+    '''
+    Return a lowering record for the nav track.  The stats bounding_box is
+    empty until the track has been followed.
+    '''
+
+    return {
+        'id': new_id(track.start),
+        'lowering_id': f'S{index:04d}',
+        'start_ts': format_ts(track.start),
+        'stop_ts': format_ts(track.stop),
+        'lowering_location': cruise['cruise_location'],
+        'lowering_tags': ['synthetic'],
+        'lowering_hidden': False,
+        'lowering_additional_meta': {
+            'lowering_description': f'Synthetic lowering {index}',
+            'lowering_files': [],
+            'milestones': {
+                'lowering_descending': format_ts(track.start),
+                'lowering_on_bottom': format_ts(track.on_bottom),
+                'lowering_off_bottom': format_ts(track.off_bottom),
+                'lowering_on_surface': format_ts(track.stop),
+                'lowering_aborted': None
+            },
+            'stats': {
+                'max_depth': round(track.depth(track.on_bottom), 1),
+                'bounding_box': []
+            }
+        }
+    }
+
+
+def build_event(new_id, rng, epoch, value=None,  # pylint: disable=too-many-arguments
+                event_values=EVENT_VALUES, authors=AUTHORS):
+    '''
+    Return an event record, the event value is picked at random from
+    event_values unless provided.
+    '''
+
+    if value is None:
+        weights = [weight for _, weight, _ in event_values]
+        value, _, options = rng.choices(event_values, weights=weights)[0]
+    else:
+        options = next((options for event_value, _, options in event_values
+                        if event_value == value), [])
+
+    return {
+        'id': new_id(epoch),
+        'ts': format_ts(epoch),
+        'event_author': 'sealog' if value == 'ASNAP' else rng.choice(authors),
+        'event_value': value,
+        'event_free_text': '' if value == 'ASNAP' else f'Synthetic {value.lower()} event',
+        'event_options': [dict(option) for option in options]
+    }
+
+
+def build_aux_data(new_id, event, epoch, position):
+    '''
+    Return the vehicle nav and frame grab aux_data records for the event.
+    '''
+
+    latitude, longitude, depth, heading = position
+    filename_middle = datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y%m%d_%H%M%S%f')[:-3]
+
+    return [
+        {
+            'id': new_id(epoch),
+            'event_id': event['id'],
+            'data_source': NAV_DATA_SOURCE,
+            'data_array': [
+                {'data_name': 'latitude', 'data_value': f'{latitude:.6f}', 'data_uom': 'ddeg'},
+                {'data_name': 'longitude', 'data_value': f'{longitude:.6f}', 'data_uom': 'ddeg'},
+                {'data_name': 'depth', 'data_value': f'{depth:.2f}', 'data_uom': 'meters'},
+                {'data_name': 'heading', 'data_value': f'{heading:.2f}', 'data_uom': 'deg'}
+            ]
+        },
+        {
+            'id': new_id(epoch),
+            'event_id': event['id'],
+            'data_source': FRAMEGRAB_DATA_SOURCE,
+            'data_array': [
+                item for camera in CAMERAS for item in (
+                    {'data_name': 'camera_name', 'data_value': camera},
+                    {'data_name': 'filename',
+                     'data_value': f'/images/{camera}_{filename_middle}.jpg'}
+                )
+            ]
+        }
+    ]
+
+
+def build_vessel_aux_data(new_id, event, epoch, position):
+    '''
+    Return the vessel nav aux_data record for the event.
+    '''
+
+    latitude, longitude, heading = position
+
+    return {
+        'id': new_id(epoch),
+        'event_id': event['id'],
+        'data_source': VESSEL_NAV_DATA_SOURCE,
+        'data_array': [
+            {'data_name': 'heading', 'data_value': f'{heading:.2f}', 'data_uom': 'deg'},
+            {'data_name': 'latitude', 'data_value': f'{latitude:.6f}', 'data_uom': 'ddeg'},
+            {'data_name': 'longitude', 'data_value': f'{longitude:.6f}', 'data_uom': 'ddeg'}
+        ]
+    }
+
+
+def _event_times(rng, start, stop, rate):
+    '''
+    Yield the times of events occurring at random at rate events per hour
+    between start and stop.
+    '''
+
+    if rate <= 0:
+        return
+
+    epoch = start
+    while True:
+        epoch += rng.expovariate(rate / 3600)
+
+        if epoch >= stop:
+            return
+
+        yield epoch
+
+
+class CruiseGenerator():  # pylint: disable=too-many-instance-attributes
+    '''
+    Class that generates a single synthetic cruise with lowerings lowering
+    records spaced a day apart.  The cruise and lowering records are built up
+    front, events() then yields the events and their aux_data records in time
+    order.  The stats bounding_box of each lowering record is filled in once
+    all the events of the lowering have been yielded.
+    '''
+
+    def __init__(self, index=1,  # pylint: disable=too-many-arguments,too-many-locals
+                 lowerings=DEFAULT_LOWERINGS, seed=0,
+                 start_ts=DEFAULT_START_TS, first_lowering=1,
+                 lowering_duration=LOWERING_DURATION,
+                 asnap_interval=DEFAULT_ASNAP_INTERVAL,
+                 event_rate=DEFAULT_EVENT_RATE,
+                 vessel_event_rate=DEFAULT_VESSEL_EVENT_RATE, new_id=None):
+
+        if not 0 < lowering_duration < LOWERING_SPACING:
+            raise ValueError(f'lowering_duration must be between 0 and {LOWERING_SPACING} seconds')
+
+        self._seed = seed
+        self._index = index
+        self._new_id = new_id or IdGenerator()
+        self._asnap_interval = asnap_interval
+        self._event_rate = event_rate
+        self._vessel_event_rate = vessel_event_rate
+
+        rng = self._rng('cruise')
+
+        start = parse_ts(start_ts)
+        stop = start + (lowerings + 2) * LOWERING_SPACING - 1
+
+        self.cruise = build_cruise(self._new_id, index, start, stop)
+        self.lowerings = []
+
+        latitude = rng.uniform(-60, 60)
+        longitude = rng.uniform(-180, 180)
+
+        bearing = rng.uniform(0, 2 * math.pi)
+        port = (latitude + PORT_DISTANCE * math.cos(bearing),
+                longitude + PORT_DISTANCE * math.sin(bearing))
+
+        # NavTrack arguments of each lowering, the tracks are rebuilt for
+        # every call to events()
+        self._tracks = []
+        waypoints = [(start,) + port]
+
+        for lowering_index in range(lowerings):
+            lowering_start = start + (lowering_index + 1) * LOWERING_SPACING
+            site = (latitude + rng.gauss(0, SITE_SPREAD), longitude + rng.gauss(0, SITE_SPREAD))
+            track_args = ((lowering_start, lowering_start + lowering_duration) + site +
+                          (rng.uniform(500, 4000),))
+
+            self._tracks.append(track_args)
+            track = NavTrack(self._rng(f'track-{lowering_index}'), *track_args)
+            self.lowerings.append(build_lowering(self._new_id, self.cruise,
+                                                 first_lowering + lowering_index, track))
+
+            waypoints += [(track_args[0],) + site, (track_args[1],) + site]
+
+        waypoints.append((stop,) + port)
+        self._vessel_track = VesselTrack(waypoints)
+
+    def _rng(self, name):
+        '''
+        Return a random number generator for part of the cruise, seeded so
+        the same part is always generated the same way.
+        '''
+
+        return random.Random(f'{self._seed}-{self._index}-{name}')
+
+    def _vessel_events(self):
+        '''
+        Yield (epoch, event, aux_data) of the vessel events.
+        '''
+
+        rng = self._rng('vessel')
+        start = parse_ts(self.cruise['start_ts'])
+        stop = parse_ts(self.cruise['stop_ts'])
+
+        times = heapq.merge(((start, 'Start of Cruise'), (stop, 'End of Cruise')),
+                            ((epoch, None) for epoch
+                             in _event_times(rng, start, stop, self._vessel_event_rate)),
+                            key=itemgetter(0))
+
+        for epoch, status in times:
+            event = build_event(self._new_id, rng, epoch, 'CRUISE' if status else None,
+                                VESSEL_EVENT_VALUES, VESSEL_AUTHORS)
+
+            if status:
+                event['event_options'] = [{'event_option_name': 'status',
+                                           'event_option_value': status}]
+
+            position = self._vessel_track.position(epoch)
+            yield epoch, event, [build_vessel_aux_data(self._new_id, event, epoch, position)]
+
+    def _lowering_events(self, lowering_index):
+        '''
+        Yield (epoch, event, aux_data) of the ASNAP, manual and milestone
+        events of a lowering.
+        '''
+
+        lowering = self.lowerings[lowering_index]
+        rng = self._rng(f'events-{lowering_index}')
+        track = NavTrack(self._rng(f'track-{lowering_index}'), *self._tracks[lowering_index])
+
+        asnaps = ()
+        if self._asnap_interval > 0:
+            count = int((track.stop - track.start) / self._asnap_interval) + 1
+            asnaps = ((track.start + index * self._asnap_interval, 'ASNAP', None)
+                      for index in range(count))
+
+        transit_rate = self._event_rate * TRANSIT_EVENT_FACTOR
+        manual = ((epoch, None, None) for epoch in chain(
+            _event_times(rng, track.start, track.on_bottom, transit_rate),
+            _event_times(rng, track.on_bottom, track.off_bottom, self._event_rate),
+            _event_times(rng, track.off_bottom, track.stop, transit_rate)))
+
+        milestones = ((parse_ts(lowering['lowering_additional_meta']['milestones'][milestone]),
+                       'ROV', status)
+                      for milestone, status in MILESTONE_STATUS)
+
+        for epoch, value, status in heapq.merge(milestones, asnaps, manual, key=itemgetter(0)):
+            event = build_event(self._new_id, rng, epoch, value)
+
+            if status:
+                event['event_options'] = [{'event_option_name': 'status',
+                                           'event_option_value': status},
+                                          {'event_option_name': 'dive_number',
+                                           'event_option_value': lowering['lowering_id']}]
+
+            aux_data = [build_vessel_aux_data(self._new_id, event, epoch,
+                                              self._vessel_track.position(epoch))]
+            aux_data += build_aux_data(self._new_id, event, epoch, track.position(epoch))
+
+            yield epoch, event, aux_data
+
+        lowering['lowering_additional_meta']['stats']['bounding_box'] = track.bounding_box
+
+    def events(self):
+        '''
+        Yield (event, aux_data) for every event of the cruise in time order,
+        aux_data is the list of aux_data records for the event.
+        '''
+
+        streams = [self._vessel_events()] + [self._lowering_events(index)
+                                             for index in range(len(self.lowerings))]
+
+        for _, event, aux_data in heapq.merge(*streams, key=itemgetter(0)):
+            yield event, aux_data
+
+
+def generate_cruises(cruises=DEFAULT_CRUISES, lowerings=DEFAULT_LOWERINGS, seed=0,
+                     start_ts=DEFAULT_START_TS, **kwargs):
+    '''
+    Yield a CruiseGenerator for each of the cruises, each cruise starts when
+    the previous one ends.  The remaining kwargs are passed to the
+    CruiseGenerator.
+    '''
+
+    kwargs['new_id'] = kwargs.get('new_id') or IdGenerator()
+
+    for index in range(cruises):
+        generator = CruiseGenerator(index + 1, lowerings, seed, start_ts,
+                                    first_lowering=index * lowerings + 1, **kwargs)
+        yield generator
+
+        start_ts = format_ts(parse_ts(generator.cruise['stop_ts']) + 1)
+
+
+class SyntheticDataset():  # pylint: disable=too-many-instance-attributes
+    '''
+    Class that generates and holds a synthetic dataset in memory: cruises
+    cruise records, each with lowerings lowering records with about events
+    ASNAP events per lowering plus the manual, milestone and vessel events.
+    Also answers the queries made by the stub sealog-server.  Records may be
+    added while the dataset is being queried.
+    '''
+
+    def __init__(self, cruises=DEFAULT_CRUISES,  # pylint: disable=too-many-arguments
+                 lowerings=DEFAULT_LOWERINGS, events=DEFAULT_EVENTS, seed=0,
+                 start_ts=DEFAULT_START_TS):
+        self._rng = random.Random(seed)
+        self._new_id = IdGenerator()
+        self._lock = threading.Lock()
+
+        self.cruises = []
+        self.lowerings = []
+        self.events = []
+        self.aux_data = {}
+        self.custom_vars = []
+
+        self._event_ts = []
+        self._events_by_id = {}
+
+        for generator in generate_cruises(cruises, lowerings, seed, start_ts, new_id=self._new_id,
+                                          asnap_interval=LOWERING_DURATION / max(1, events)):
+            self.cruises.append(generator.cruise)
+
+            for event, aux_data in generator.events():
+                self._add_event(event, aux_data)
+
+            self.lowerings += generator.lowerings
+
+        self.custom_vars.append({'id': self._new_id(parse_ts(start_ts)),
+                                 'custom_var_name': 'asnapStatus', 'custom_var_value': 'Off'})
+
+    def _add_event(self, event, aux_data=None):
+        position = bisect_right(self._event_ts, event['ts'])
+        self._event_ts.insert(position, event['ts'])
+        self.events.insert(position, event)
+        self._events_by_id[event['id']] = event
+        self.aux_data[event['id']] = list(aux_data or [])
+
+    def new_event(self, value='ASNAP', epoch=None, **kwargs):
+        '''
+        Create and add a new event at epoch, defaults to now.
+        '''
+
+        if epoch is None:
+            epoch = datetime.now(timezone.utc).timestamp()
+
+        event = build_event(self._new_id, self._rng, epoch, value)
+        event.update(kwargs)
+
+        with self._lock:
+            self._add_event(event)
+
+        return event
+
+    def add_event(self, payload):
+        '''
+        Add an event submitted to the API, returns the new event.
+        '''
+
+        epoch = parse_ts(payload['ts']) if payload.get('ts') else None
+        fields = {key: value for key, value in payload.items() if key not in ('id', 'ts')}
+        return self.new_event(payload.get('event_value', 'FREE_FORM'), epoch, **fields)
+
+    def put_event(self, event):
+        '''
+        Add an event record as is, i.e. one replayed from a recorded
+        websocket feed.  Returns False if the event already exists.
+        '''
+
+        with self._lock:
+            if event['id'] in self._events_by_id:
+                return False
+
+            self._add_event(dict(event))
+            return True
+
+    def put_custom_var(self, custom_var):
+        '''
+        Add or replace a custom var record, matched by id.
+        '''
+
+        with self._lock:
+            for index, existing in enumerate(self.custom_vars):
+                if existing['id'] == custom_var.get('id'):
+                    self.custom_vars[index] = dict(existing, **custom_var)
+                    return
+
+            self.custom_vars.append(dict(custom_var))
+
+    def add_aux_data(self, payload):
+        '''
+        Add or replace an aux_data record submitted to the API.  Returns True if
+        a new record was created, False if an existing record was replaced and
+        None if the event does not exist.
+        '''
+
+        with self._lock:
+            records = self.aux_data.get(payload.get('event_id'))
+
+            if records is None:
+                return None
+
+            event_ts = self._events_by_id[payload['event_id']]['ts']
+            record = dict(payload, id=self._new_id(parse_ts(event_ts)))
+
+            for index, existing in enumerate(records):
+                if existing['data_source'] == record['data_source']:
+                    record['id'] = existing['id']
+                    records[index] = record
+                    return False
+
+            records.append(record)
+            return True
+
+    def get_event(self, event_uid):
+        '''
+        Return the event with the given uid or None.
+        '''
+
+        return self._events_by_id.get(event_uid)
+
+    def get_events(self, start_ts=None, stop_ts=None, values=None):
+        '''
+        Return the events between start_ts and stop_ts, inclusive, optionally
+        limited to the event values in values.  Values starting with "!" are
+        excluded instead.
+        '''
+
+        with self._lock:
+            first = bisect_left(self._event_ts, start_ts) if start_ts else 0
+            last = bisect_right(self._event_ts, stop_ts) if stop_ts else len(self._event_ts)
+            events = self.events[first:last]
+
+        if values:
+            include = {value for value in values if not value.startswith('!')}
+            exclude = {value[1:] for value in values if value.startswith('!')}
+            events = [event for event in events
+                      if (not include or event['event_value'] in include)
+                      and event['event_value'] not in exclude]
+
+        return events
+
+    def get_aux_data(self, event_uid, datasources=None):
+        '''
+        Return the aux_data records for the event, optionally limited to the
+        data sources in datasources.
+        '''
+
+        return [record for record in self.aux_data.get(event_uid, [])
+                if not datasources or record['data_source'] in datasources]
+
+    def get_event_export(self, event, datasources=None):
+        '''
+        Return the event with its aux_data records as returned by the
+        event_exports routes.
+        '''
+
+        return dict(event, aux_data=[{'data_source': record['data_source'],
+                                      'data_array': record['data_array']}
+                                     for record in self.get_aux_data(event['id'], datasources)])
+
+    def find_cruise(self, timestamp):
+        '''
+        Return the cruise containing the timestamp or None.
+        '''
+
+        return next((cruise for cruise in self.cruises
+                     if cruise['start_ts'] <= timestamp <= cruise['stop_ts']), None)
+
+    def find_lowering(self, timestamp):
+        '''
+        Return the lowering containing the timestamp or None.
+        '''
+
+        return next((lowering for lowering in self.lowerings
+                     if lowering['start_ts'] <= timestamp <= lowering['stop_ts']), None)
+
+    def __len__(self):
+        return len(self.events)
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+'''
+FILE:           ws_replay.py
+
+DESCRIPTION:    This script records the messages published on the sealog-
+                server /ws/status/* websocket feeds during a live session and
+                replays them through the stub sealog-server at the recorded
+                pace, N times faster or as fast as possible.  Service scripts
+                pointed at the stub (inserters, auto_actions, the repeater)
+                can then be driven with the load pattern of a busy dive and
+                their throughput and backlog measured.
+
+                Recordings are json lines, gzip compressed when the filename
+                ends in .gz.  The first line is a header with the recording
+                start time and subscriptions, each following line is
+                [seconds since the start, path, message].
+
+BUGS:
+NOTES:          Replayed new events and custom vars are added to the stub
+                dataset so the services can look them up and save aux_data
+                records for them.
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import sys
+import gzip
+import time
+import asyncio
+import logging
+
+from os.path import dirname, realpath
+sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
+
+from misc.python_sealog.json_backend import dumps, loads
+from misc.sealog_bench.synthetic import SyntheticDataset, parse_ts, format_ts
+from misc.sealog_bench.stub_server import (
+    StubSealogServer, DEFAULT_HOST, DEFAULT_PORT, NEW_EVENTS_PATH
+)
+
+RECORDING_FORMAT = 'sealog-ws-recording'
+RECORDING_VERSION = 1
+
+CLIENT_WSID = 'ws-recorder'
+
+# every feed published by sealog-server
+STATUS_SUBS = [
+    '/ws/status/newEvents',
+    '/ws/status/updateEvents',
+    '/ws/status/deleteEvents',
+    '/ws/status/newEventAuxData',
+    '/ws/status/updateEventAuxData',
+    '/ws/status/deleteEventAuxData',
+    '/ws/status/newCruises',
+    '/ws/status/updateCruises',
+    '/ws/status/newLowerings',
+    '/ws/status/updateLowerings',
+    '/ws/status/updateCustomVars',
+    '/ws/status/newEventTemplates',
+    '/ws/status/updateEventTemplates',
+    '/ws/status/deleteEventTemplates'
+]
+
+UPDATE_CUSTOM_VARS_PATH = '/ws/status/updateCustomVars'
+NEW_EVENT_AUX_DATA_PATH = '/ws/status/newEventAuxData'
+
+DEFAULT_SPEED = 1.0
+
+# seconds to wait for a service to subscribe before replaying
+DEFAULT_WAIT = 30
+
+# seconds to wait after the replay for the services to save the aux_data
+# records of the replayed events
+DEFAULT_DRAIN = 30
+
+
+def _open(filename, mode):
+    if filename.endswith('.gz'):
+        return gzip.open(filename, mode + 't', encoding='utf-8')
+
+    return open(filename, mode, encoding='utf-8')  # pylint: disable=consider-using-with
+
+
+class FeedRecording():  # pylint: disable=too-few-public-methods
+    '''
+    A recorded websocket feed.  Iterating yields (offset, path, message) in
+    the order received, offset is in seconds since the recording started.
+    The file is read as it is iterated.
+    '''
+
+    def __init__(self, filename):
+        self._filename = filename
+
+        with _open(filename, 'r') as recording_fp:
+            self.header = loads(recording_fp.readline() or '{}')
+
+        if self.header.get('format') != RECORDING_FORMAT:
+            raise ValueError(f'{filename} is not a websocket feed recording')
+
+    def __iter__(self):
+        with _open(self._filename, 'r') as recording_fp:
+            recording_fp.readline()
+
+            for line in recording_fp:
+                if line.strip():
+                    yield tuple(loads(line))
+
+
+class FeedRecorder():  # pylint: disable=too-many-instance-attributes
+    '''
+    Class that subscribes to the websocket feeds and writes every published
+    message to a recording file.
+    '''
+
+    def __init__(self, filename, subs=None, ws_server_url=None, headers=None):
+        self._filename = filename
+        self._subs = list(subs or STATUS_SUBS)
+        self._ws_server_url = ws_server_url
+        self._headers = headers
+        self._recording_fp = None
+        self._started = None
+        self._count = 0
+        self._done = None
+        self._max_messages = None
+
+    @property
+    def count(self):
+        '''
+        Getter method for the _count property
+        '''
+        return self._count
+
+    def _on_receive(self, path, message):
+        offset = round(time.monotonic() - self._started, 3)
+        self._recording_fp.write(dumps([offset, path, message]) + '\n')
+        self._count += 1
+
+        if self._max_messages and self._count >= self._max_messages:
+            self._done.set()
+
+    async def run(self, duration=None, max_messages=None):
+        '''
+        Record until duration seconds have passed or max_messages have been
+        received, or until cancelled if neither is set.  Returns the number of
+        messages recorded.
+        '''
+
+        # the live feed settings are only needed for recording
+        # pylint: disable=import-outside-toplevel
+        from misc.python_sealog.ws_subscriber import SealogWSSubscriber
+        from misc.python_sealog.settings import WS_SERVER_URL, HEADERS
+
+        async def _discard(path, message):  # pylint: disable=unused-argument
+            pass
+
+        self._done = asyncio.Event()
+        self._max_messages = max_messages
+        self._count = 0
+
+        ws_server_url = self._ws_server_url or WS_SERVER_URL
+
+        subscriber = SealogWSSubscriber(CLIENT_WSID, self._subs, _discard,
+                                        ws_server_url=ws_server_url,
+                                        headers=self._headers or HEADERS,
+                                        on_receive=self._on_receive)
+
+        with _open(self._filename, 'w') as self._recording_fp:
+            self._started = time.monotonic()
+            self._recording_fp.write(dumps({
+                'format': RECORDING_FORMAT,
+                'version': RECORDING_VERSION,
+                'started': time.time(),
+                'ws_server_url': ws_server_url,
+                'subs': self._subs
+            }) + '\n')
+
+            subscriber_task = asyncio.create_task(subscriber.run())
+
+            try:
+                await asyncio.wait_for(self._done.wait(), duration)
+
+            except asyncio.TimeoutError:
+                pass
+
+            finally:
+                subscriber_task.cancel()
+
+        logging.info("Recorded %d messages to %s", self._count, self._filename)
+
+        return self._count
+
+
+def _restamp(message, shift):
+    '''
+    Return a copy of the message with its ts moved forward by shift seconds.
+    '''
+
+    if not isinstance(message, dict) or not isinstance(message.get('ts'), str):
+        return message
+
+    try:
+        return dict(message, ts=format_ts(parse_ts(message['ts']) + shift))
+
+    except ValueError:
+        return message
+
+
+class FeedReplayer():
+    '''
+    Class that publishes the messages of a FeedRecording through a
+    StubSealogServer.  speed is the replay speed relative to the recording,
+    0 replays as fast as possible.  paths limits the feeds replayed.  When
+    restamp is True the event ts are moved so the recording appears to have
+    started when the replay did.
+    '''
+
+    def __init__(self, recording, server,  # pylint: disable=too-many-arguments
+                 speed=DEFAULT_SPEED, paths=None, restamp=False):
+        self._recording = recording
+        self._server = server
+        self._speed = speed
+        self._paths = set(paths or [])
+        self._restamp = restamp
+        self._event_ids = {}
+
+    def _apply(self, path, message):
+        '''
+        Add the records published by the message to the stub dataset.
+        '''
+
+        if path == NEW_EVENTS_PATH:
+            self._server.dataset.put_event(message)
+            self._event_ids[message['id']] = True
+
+        elif path == UPDATE_CUSTOM_VARS_PATH:
+            self._server.dataset.put_custom_var(message)
+
+        elif path == NEW_EVENT_AUX_DATA_PATH:
+            self._server.dataset.add_aux_data(message)
+
+    def backlog(self):
+        '''
+        Return the number of replayed new events without an aux_data record.
+        '''
+
+        return sum(not self._server.dataset.get_aux_data(event_id) for event_id in self._event_ids)
+
+    def run(self):
+        '''
+        Replay the recording and return the replay stats.  max_late_s is how
+        far the replay fell behind the recorded pace.
+        '''
+
+        shift = time.time() - self._recording.header.get('started', time.time())
+        requests = self._server.requests
+        counts = {}
+        max_late = 0.0
+        first_offset = None
+
+        started = time.monotonic()
+
+        for offset, path, message in self._recording:
+            if self._paths and path not in self._paths:
+                continue
+
+            if first_offset is None:
+                first_offset = offset
+
+            if self._speed > 0:
+                wait = started + (offset - first_offset) / self._speed - time.monotonic()
+
+                if wait > 0:
+                    time.sleep(wait)
+                else:
+                    max_late = max(max_late, -wait)
+
+            if self._restamp:
+                message = _restamp(message, shift)
+
+            self._apply(path, message)
+            self._server.publish(path, message).result()
+            counts[path] = counts.get(path, 0) + 1
+
+        elapsed = time.monotonic() - started
+        messages = sum(counts.values())
+
+        return {
+            'messages': messages,
+            'seconds': elapsed,
+            'messages_per_s': messages / elapsed if elapsed else None,
+            'max_late_s': max_late,
+            'api_requests': self._server.requests - requests,
+            'backlog': self.backlog(),
+            'paths': counts
+        }
+
+    def drain(self, timeout=DEFAULT_DRAIN):
+        '''
+        Wait up to timeout seconds for the services to save an aux_data
+        record for every replayed new event.  Returns the seconds waited and
+        the remaining backlog.
+        '''
+
+        started = time.monotonic()
+
+        while self.backlog() and time.monotonic() - started < timeout:
+            time.sleep(0.1)
+
+        return time.monotonic() - started, self.backlog()
+
+
+# -------------------------------------------------------------------------------------
+# Required python code for running the script as a stand-alone utility
+# -------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    import os
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Record and replay the sealog-server websocket feeds')
+    parser.add_argument('-v', '--verbosity', dest='verbosity',
+                        default=0, action='count',
+                        help='Increase output verbosity')
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+
+    record_parser = subparsers.add_parser('record',
+                                          help='record the websocket feeds of a live sealog-server')
+    record_parser.add_argument('recording', help='recording file, compressed if it ends in .gz')
+    record_parser.add_argument('-d', '--duration', type=float,
+                               help='seconds to record, default: until interrupted')
+    record_parser.add_argument('-n', '--max_messages', type=int,
+                               help='stop after this many messages')
+    record_parser.add_argument('-u', '--ws_server_url',
+                               help='websocket feed url, default: WS_SERVER_URL from the settings')
+    record_parser.add_argument('--subs', nargs='+',
+                               help='feeds to record, default: all /ws/status feeds')
+
+    replay_parser = subparsers.add_parser('replay',
+                                          help='replay a recording through a stub sealog-server')
+    replay_parser.add_argument('recording', help='recording file')
+    replay_parser.add_argument('-s', '--speed', type=float, default=DEFAULT_SPEED,
+                               help='replay speed relative to the recording, 0 for as fast as '
+                                    f'possible, default: {DEFAULT_SPEED}')
+    replay_parser.add_argument('--host', default=DEFAULT_HOST,
+                               help=f'host to listen on, default: {DEFAULT_HOST}')
+    replay_parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT,
+                               help=f'API port, default: {DEFAULT_PORT}')
+    replay_parser.add_argument('-w', '--ws_port', type=int,
+                               help='websocket feed port, default: port + 1')
+    replay_parser.add_argument('--latency', type=float, default=0.0,
+                               help='seconds added to every API request')
+    replay_parser.add_argument('--paths', nargs='+',
+                               help='feeds to replay, default: all recorded feeds')
+    replay_parser.add_argument('--restamp', action='store_true',
+                               help='move the event ts to the time of the replay')
+    replay_parser.add_argument('--wait', type=float, default=DEFAULT_WAIT,
+                               help='seconds to wait for a service to subscribe, '
+                                    f'default: {DEFAULT_WAIT}')
+    replay_parser.add_argument('--drain', type=float, default=DEFAULT_DRAIN,
+                               help='seconds to wait for the aux_data backlog to clear, '
+                                    f'default: {DEFAULT_DRAIN}')
+
+    parsed_args = parser.parse_args()
+
+    ############################
+    # Set up logging before we do any other argument parsing (so that we
+    # can log problems with argument parsing).
+
+    LOGGING_FORMAT = '%(asctime)-15s %(levelname)s - %(message)s'
+    logging.basicConfig(format=LOGGING_FORMAT)
+
+    LOG_LEVELS = {0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}
+    parsed_args.verbosity = min(parsed_args.verbosity, max(LOG_LEVELS))
+    logging.getLogger().setLevel(LOG_LEVELS[parsed_args.verbosity])
+
+    try:
+        if parsed_args.mode == 'record':
+            recorder = FeedRecorder(parsed_args.recording, parsed_args.subs,
+                                    parsed_args.ws_server_url)
+
+            try:
+                asyncio.run(recorder.run(parsed_args.duration, parsed_args.max_messages))
+
+            finally:
+                print(f'Recorded {recorder.count} messages')
+
+            sys.exit(0)
+
+        try:
+            feed_recording = FeedRecording(parsed_args.recording)
+
+        except (OSError, ValueError) as exc:
+            logging.error(str(exc))
+            sys.exit(1)
+
+        with StubSealogServer(SyntheticDataset(cruises=0), parsed_args.host, parsed_args.port,
+                              parsed_args.ws_port or parsed_args.port + 1,
+                              parsed_args.latency) as stub:
+            print(f'API: {stub.api_server_url}')
+            print(f'Websocket feed: {stub.ws_server_url}')
+
+            recorded_subs = feed_recording.header.get('subs', [])
+            wait_path = NEW_EVENTS_PATH if NEW_EVENTS_PATH in recorded_subs else recorded_subs[0]
+
+            if not stub.wait_for_subscriber(wait_path, parsed_args.wait):
+                logging.warning("No service subscribed to %s, replaying anyway", wait_path)
+
+            replayer = FeedReplayer(feed_recording, stub, parsed_args.speed, parsed_args.paths,
+                                    parsed_args.restamp)
+            replay_stats = replayer.run()
+            drain_seconds, replay_stats['backlog_after_drain'] = replayer.drain(parsed_args.drain)
+            replay_stats['drain_s'] = drain_seconds
+            replay_stats['api_requests_after_drain'] = stub.requests
+
+            print(dumps(replay_stats, indent=2))
+
+    except KeyboardInterrupt:
+        logging.warning('Interrupted')
+        try:
+            sys.exit(0)
+        except SystemExit:
+            os._exit(0)  # pylint: disable=protected-access
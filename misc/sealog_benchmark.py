@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+'''
+FILE:           sealog_benchmark.py
+
+DESCRIPTION:    This script runs repeatable benchmarks of the python_sealog
+                wrappers and the service script code paths against a local
+                stub sealog-server serving a synthetic dataset, so no live
+                server is needed.  The results are saved as json and can be
+                compared against the results from a previous version to find
+                regressions.
+
+                Benchmarks:
+                    wrappers - API wrapper calls per second
+                    export   - event export to csv runtime
+                    inserter - websocket event to aux_data saved latency
+                    import   - bulk event import and record conversion speed
+                    influx   - influx aux_data record building against a fake
+                               InfluxDB, per-event and batched queries
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import os
+import sys
+import time
+import json
+import random
+import asyncio
+import logging
+import platform
+import statistics
+import subprocess
+import tempfile
+from bisect import bisect_left
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+from os.path import dirname, realpath
+sys.path.append(dirname(dirname(realpath(__file__))))
+
+from misc.python_sealog.json_backend import get_backend
+from misc.python_sealog.cruises import get_cruise_uid_by_id
+from misc.python_sealog.lowerings import get_lowerings_by_cruise
+from misc.python_sealog.events import get_event, get_events_by_lowering, create_events
+from misc.python_sealog.event_exports import get_event_exports_by_lowering
+from misc.python_sealog.event_aux_data import get_event_aux_data_by_lowering, create_event_aux_data
+from misc.python_sealog.ws_subscriber import SealogWSSubscriber
+from misc.python_sealog.latency import LatencyTracker, record_receipt
+from misc.sealog_bench.synthetic import (SyntheticDataset, parse_ts, format_ts,
+                                         DEFAULT_LOWERINGS, DEFAULT_EVENTS)
+from misc.sealog_bench.stub_server import StubSealogServer, NEW_EVENTS_PATH
+
+BENCHMARKS = ('wrappers', 'export', 'inserter', 'import', 'influx')
+
+DEFAULT_REPEAT = 3
+
+DEFAULT_ITERATIONS = 50
+
+# number of concurrent requests used to measure the wrapper throughput
+DEFAULT_CONCURRENCY = 8
+
+# inserter benchmark defaults
+DEFAULT_INSERTER_EVENTS = 200
+DEFAULT_INSERTER_RATE = 50.0  # events/second
+DEFAULT_QUERY_LATENCY = 0.005  # seconds
+DEFAULT_INSERTER_TIMEOUT = 60  # seconds
+
+BENCH_DATA_SOURCE = 'benchmarkData'
+
+# influx benchmark defaults
+DEFAULT_INFLUX_EVENTS = 1000
+DEFAULT_INFLUX_LATENCY = 0.002  # seconds
+DEFAULT_INFLUX_BATCH = 100  # events per batched query
+DEFAULT_INFLUX_INTERVAL = 1.0  # seconds between points
+
+# the aux_data config used by the influx benchmark, the same as the
+# sealog_aux_data_inserter_influx INLINE_CONFIG
+BENCH_INFLUX_CONFIG = {
+    'data_source': 'realtimeVesselPosition',
+    'query_measurements': ['seapath1'],
+    'aux_record_lookup': {
+        'S1HeadingTrue': {'name': 'heading', 'uom': 'deg', 'round': 3},
+        'S1Latitude': {'name': 'latitude', 'uom': 'ddeg', 'round': 6,
+                       'modify': [{'test': [{'field': 'S1NorS', 'eq': 'S'}],
+                                   'operation': [{'multiply': -1}]}]},
+        'S1Longitude': {'name': 'longitude', 'uom': 'ddeg', 'round': 6,
+                        'modify': [{'test': [{'field': 'S1EorW', 'eq': 'W'}],
+                                    'operation': [{'multiply': -1}]}]},
+        'S1NorS': {'no_output': True},
+        'S1EorW': {'no_output': True}
+    }
+}
+
+# seconds of data before the event ts searched by the influx queries
+INFLUX_QUERY_WINDOW = 60
+
+# change from the baseline that is reported as a regression
+DEFAULT_THRESHOLD = 0.1
+
+
+def _time_calls(func, iterations):
+    '''
+    Return the mean seconds per call of func over iterations calls.
+    '''
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+
+    return (time.perf_counter() - start) / iterations
+
+
+def bench_wrappers(server, options):
+    '''
+    Time the wrapper functions used by the service scripts.
+    '''
+
+    url = server.api_server_url
+    rng = random.Random(options.seed)
+
+    cruise_id = server.dataset.cruises[0]['cruise_id']
+    lowering_uid = server.dataset.lowerings[0]['id']
+    event_uids = [event['id'] for event in server.dataset.events]
+
+    iterations = options.iterations
+    bulk_iterations = max(1, iterations // 10)
+
+    cruise_uid = server.dataset.cruises[0]['id']
+
+    results = {
+        'get_cruise_uid_by_id_s': _time_calls(
+            lambda: get_cruise_uid_by_id(cruise_id, api_server_url=url), iterations),
+        'get_lowerings_by_cruise_s': _time_calls(
+            lambda: get_lowerings_by_cruise(cruise_uid, api_server_url=url), iterations),
+        'get_event_s': _time_calls(
+            lambda: get_event(rng.choice(event_uids), api_server_url=url), iterations),
+        'get_events_by_lowering_s': _time_calls(
+            lambda: get_events_by_lowering(lowering_uid, api_server_url=url), bulk_iterations),
+        'get_event_exports_by_lowering_s': _time_calls(
+            lambda: get_event_exports_by_lowering(lowering_uid, api_server_url=url),
+            bulk_iterations),
+        'get_event_aux_data_by_lowering_s': _time_calls(
+            lambda: get_event_aux_data_by_lowering(lowering_uid, api_server_url=url),
+            bulk_iterations),
+    }
+
+    calls = iterations * options.concurrency
+    uids = [rng.choice(event_uids) for _ in range(calls)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=options.concurrency) as executor:
+        list(executor.map(lambda uid: get_event(uid, api_server_url=url), uids))
+
+    results['get_event_concurrent_per_s'] = calls / (time.perf_counter() - start)
+
+    return results
+
+
+def bench_export(server, options):  # pylint: disable=unused-argument
+    '''
+    Time exporting the events of every lowering to csv through a DataFrame,
+    the path used by the export scripts.
+    '''
+
+    # pandas is slow to import, only load it for this benchmark
+    from misc.python_sealog.dataframes import (  # pylint: disable=import-outside-toplevel
+        get_event_exports_dataframe_by_lowering)
+
+    events = 0
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.perf_counter()
+
+        for lowering in server.dataset.lowerings:
+            data = get_event_exports_dataframe_by_lowering(lowering['id'],
+                                                           api_server_url=server.api_server_url)
+            data.to_csv(os.path.join(tmp_dir, f"{lowering['lowering_id']}_eventExport.csv"),
+                        index=False)
+            events += len(data)
+
+        seconds = time.perf_counter() - start
+
+    return {
+        'export_s': seconds,
+        'export_events_per_s': events / seconds
+    }
+
+
+def bench_inserter(server, options):
+    '''
+    Publish new events on the websocket feed at options.rate events/second to
+    an aux_data inserter that queries a data source taking
+    options.query_latency seconds and saves an aux_data record for each
+    event.  Reports the lag percentiles recorded by the LatencyTracker.
+    '''
+
+    url = server.api_server_url
+    tracker = LatencyTracker([BENCH_DATA_SOURCE])
+
+    def _insert_aux_data(path, event):  # pylint: disable=unused-argument
+        tracker.start(event)
+
+        time.sleep(options.query_latency)
+        tracker.queried(event, BENCH_DATA_SOURCE)
+
+        record = {
+            'event_id': event['id'],
+            'data_source': BENCH_DATA_SOURCE,
+            'data_array': [{'data_name': 'value', 'data_value': '1', 'data_uom': 'count'}]
+        }
+
+        if create_event_aux_data(record, api_server_url=url):
+            tracker.inserted(event, BENCH_DATA_SOURCE)
+        else:
+            tracker.failed(event, BENCH_DATA_SOURCE, 'error submitting aux data record')
+
+    async def _run():
+        subscriber = SealogWSSubscriber('sealogBenchmark', [NEW_EVENTS_PATH], _insert_aux_data,
+                                        ws_server_url=server.ws_server_url, api_server_url=url,
+                                        workers=options.workers, on_receive=record_receipt)
+        task = asyncio.create_task(subscriber.run())
+
+        try:
+            if not await asyncio.to_thread(server.wait_for_subscriber, NEW_EVENTS_PATH):
+                raise RuntimeError('The inserter did not connect to the stub websocket feed')
+
+            for _ in range(options.inserter_events):
+                server.publish(NEW_EVENTS_PATH, server.dataset.new_event('ASNAP'))
+                await asyncio.sleep(1 / options.rate)
+
+            deadline = time.monotonic() + DEFAULT_INSERTER_TIMEOUT
+            while time.monotonic() < deadline:
+                stats = tracker.to_dict()[BENCH_DATA_SOURCE]
+                if stats['inserted'] + stats['missing'] >= options.inserter_events:
+                    break
+
+                await asyncio.sleep(0.1)
+
+        finally:
+            task.cancel()
+
+    asyncio.run(_run())
+
+    stats = tracker.to_dict()[BENCH_DATA_SOURCE]
+
+    results = {
+        'inserter_saved': stats['inserted'],
+        'inserter_missing': options.inserter_events - stats['inserted']
+    }
+
+    for stage in ('received', 'queried', 'inserted'):
+        for quantile, value in stats[f'{stage}_lag'].items():
+            results[f'inserter_{stage}_{quantile}_s'] = value
+
+    return results
+
+
+def bench_import(server, options):  # pylint: disable=unused-argument,too-many-locals
+    '''
+    Time importing the events through the bulk events route of an empty stub
+    server and converting the event and aux_data export files ahead of a
+    database import.
+    '''
+
+    # jsonschema is only needed for this benchmark
+    from misc.python_sealog.db_import_utils import (  # pylint: disable=import-outside-toplevel
+        convert_event_record_rn, convert_aux_data_record_fn
+    )
+
+    events = server.dataset.events
+    aux_data = [record for event in events for record in server.dataset.get_aux_data(event['id'])]
+    payloads = [{key: value for key, value in event.items() if key != 'id'} for event in events]
+
+    with StubSealogServer(SyntheticDataset(cruises=0), latency=options.latency,
+                          jitter=options.jitter) as empty_server:
+        start = time.perf_counter()
+        imported = create_events(payloads, api_server_url=empty_server.api_server_url)
+        import_seconds = time.perf_counter() - start
+
+    results = {
+        'import_events_per_s': imported / import_seconds
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, records, convert in (('events', events, convert_event_record_rn),
+                                       ('aux_data', aux_data, convert_aux_data_record_fn)):
+            record_fn = os.path.join(tmp_dir, f'{name}.json')
+            with open(record_fn, 'w', encoding='utf-8') as record_fp:
+                json.dump(records, record_fp)
+
+            start = time.perf_counter()
+            convert(record_fn)
+            results[f'convert_{name}_per_s'] = len(records) / (time.perf_counter() - start)
+
+    return results
+
+
+def _batched_query(builder, start, stop):
+    '''
+    Return the flux query for every point of the builder's measurements and
+    fields from start to stop.
+    '''
+
+    measurements = ' or '.join(f'r["_measurement"] == "{measurement}"'
+                               for measurement in builder.measurements)
+    fields = ' or '.join(f'r["_field"] == "{field}"' for field in builder.fields)
+
+    return (f'from(bucket: "benchmark")\n'
+            f'|> range(start: {format_ts(start)}, stop: {format_ts(stop)})\n'
+            f'|> filter(fn: (r) => {measurements})\n|> filter(fn: (r) => {fields})')
+
+
+def _influx_batches(epochs, size):
+    '''
+    Split the sorted event epochs into batches of up to size events, a new
+    batch is started when the next event's query window does not overlap the
+    previous event's so a batched query never returns the points between
+    widely spaced events.  Yields the (first, last) slice of each batch.
+    '''
+
+    first = 0
+
+    for last in range(1, len(epochs) + 1):
+        if (last == len(epochs) or last - first == size
+                or epochs[last] - epochs[last - 1] > INFLUX_QUERY_WINDOW):
+            yield first, last
+            first = last
+
+
+def bench_influx(server, options):  # pylint: disable=too-many-locals
+    '''
+    Time building the influx aux_data records for the dataset events against
+    a fake InfluxDB, first with the builder's query per event and then with
+    a single range query per batch of closely spaced events.  Query building,
+    the query and the result parsing of the per-event mode are timed
+    separately.
+    '''
+
+    # influxdb_client is only needed for this benchmark
+    # pylint: disable=import-outside-toplevel
+    try:
+        from misc.influx_sealog.aux_data_record_builder import SealogInfluxAuxDataRecordBuilder
+
+    except ImportError as exc:
+        logging.warning("Skipping the influx benchmark: %s", str(exc))
+        return {}
+
+    from misc.influx_sealog.fake_influxdb import (
+        FakeInfluxDBClient, FakeTimeSeries, FluxTable, TableList, fields_from_configs
+    )
+
+    events = server.dataset.events[:options.influx_events]
+    epochs = [parse_ts(event['ts']) for event in events]
+
+    time_series = FakeTimeSeries.generate(fields_from_configs([BENCH_INFLUX_CONFIG]),
+                                          min(epochs) - INFLUX_QUERY_WINDOW, max(epochs) + 1,
+                                          options.influx_interval, options.seed)
+    client = FakeInfluxDBClient(time_series, options.influx_latency, seed=options.seed)
+    builder = SealogInfluxAuxDataRecordBuilder(client, BENCH_INFLUX_CONFIG)
+    build_aux_data_dict = builder._build_aux_data_dict  # pylint: disable=protected-access
+
+    results = {'influx_points': len(time_series)}
+
+    # per-event, the stages of build_aux_data_record()
+    build_seconds = query_seconds = parse_seconds = 0.0
+    per_event_records = []
+
+    start = time.perf_counter()
+    for event in events:
+        stage_start = time.perf_counter()
+        query = builder._build_query(event['ts'])  # pylint: disable=protected-access
+        build_seconds += time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        query_result = client.query_api().query(query=query)
+        query_seconds += time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        per_event_records.append(build_aux_data_dict(event['id'], query_result))
+        parse_seconds += time.perf_counter() - stage_start
+
+    results['influx_per_event_records_per_s'] = len(events) / (time.perf_counter() - start)
+    results['influx_build_query_s'] = build_seconds / len(events)
+    results['influx_query_s'] = query_seconds / len(events)
+    results['influx_parse_s'] = parse_seconds / len(events)
+
+    # batched, one range query per batch then the latest point before each
+    # event ts is picked from the result
+    batched_records = []
+    batches = 0
+
+    start = time.perf_counter()
+    for first, last in _influx_batches(epochs, options.influx_batch):
+        query = _batched_query(builder, epochs[first] - INFLUX_QUERY_WINDOW, epochs[last - 1])
+        query_result = client.query_api().query(query=query)
+        batches += 1
+
+        # the point times are converted once per batch
+        tables = [([record.get_time().timestamp() for record in table.records], table.records)
+                  for table in query_result]
+
+        for event, epoch in zip(events[first:last], epochs[first:last]):
+            event_result = TableList()
+
+            for times, records in tables:
+                position = bisect_left(times, epoch)
+
+                if position and times[position - 1] >= epoch - INFLUX_QUERY_WINDOW:
+                    table = FluxTable()
+                    table.records = [records[position - 1]]
+                    event_result.append(table)
+
+            batched_records.append(build_aux_data_dict(event['id'], event_result))
+
+    results['influx_batched_records_per_s'] = len(events) / (time.perf_counter() - start)
+    results['influx_batched_queries'] = batches
+    results['influx_batched_mismatches'] = sum(record != batched for record, batched
+                                               in zip(per_event_records, batched_records))
+
+    return results
+
+
+BENCHMARK_FUNCTIONS = {
+    'wrappers': bench_wrappers,
+    'export': bench_export,
+    'inserter': bench_inserter,
+    'import': bench_import,
+    'influx': bench_influx
+}
+
+
+def get_version():
+    '''
+    Return the versions of the code and environment being benchmarked.
+    '''
+
+    root_dir = dirname(dirname(realpath(__file__)))
+
+    try:
+        with open(os.path.join(root_dir, 'package.json'), 'r', encoding='utf-8') as package_fp:
+            sealog_version = json.load(package_fp).get('version')
+
+    except (OSError, ValueError):
+        sealog_version = None
+
+    try:
+        commit = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=root_dir,
+                                capture_output=True, check=True).stdout.decode().strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'sealog': sealog_version,
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'json_backend': get_backend()
+    }
+
+
+def run_benchmarks(benchmarks, options):
+    '''
+    Run each benchmark options.repeat times against a stub server and return
+    the results.  The reported value of each metric is the median of the
+    runs.
+    '''
+
+    dataset = SyntheticDataset(options.cruises, options.lowerings, options.events, options.seed)
+
+    results = {
+        'created': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
+        'version': get_version(),
+        'options': vars(options),
+        'benchmarks': {},
+        'runs': {}
+    }
+
+    with StubSealogServer(dataset, latency=options.latency, jitter=options.jitter,
+                          seed=options.seed) as server:
+        for name in benchmarks:
+            runs = []
+            for run in range(options.repeat):
+                logging.info("Running %s benchmark, run %d of %d", name, run + 1, options.repeat)
+                runs.append(BENCHMARK_FUNCTIONS[name](server, options))
+
+            results['runs'][name] = runs
+            results['benchmarks'][name] = {
+                metric: statistics.median(run[metric] for run in runs)
+                if all(run[metric] is not None for run in runs) else None
+                for metric in runs[0]
+            }
+
+    return results
+
+
+def compare_results(baseline, results, threshold=DEFAULT_THRESHOLD):
+    '''
+    Return the (benchmark, metric, baseline value, value, change) of every
+    metric in both results and the list of metrics that got worse by more
+    than threshold.  Metrics ending in _per_s are better when higher, all
+    other timings are better when lower.
+    '''
+
+    changes = []
+    regressions = []
+
+    for name, metrics in results['benchmarks'].items():
+        for metric, value in metrics.items():
+            baseline_value = baseline.get('benchmarks', {}).get(name, {}).get(metric)
+
+            if value is None or not baseline_value or not metric.endswith('_s'):
+                continue
+
+            change = (value - baseline_value) / baseline_value
+            changes.append((name, metric, baseline_value, value, change))
+
+            worse = -change if metric.endswith('_per_s') else change
+            if worse > threshold:
+                regressions.append((name, metric))
+
+    return changes, regressions
+
+
+# -------------------------------------------------------------------------------------
+# Main function
+# -------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the sealog python wrappers and scripts '
+                                                 'against a stub sealog-server')
+    parser.add_argument('-v', '--verbosity', dest='verbosity', default=0, action='count',
+                        help='Increase output verbosity, default level: warning')
+    parser.add_argument('-o', '--output', help='save the results as json to this file')
+    parser.add_argument('-c', '--compare',
+                        help='compare the results with the results saved in this file')
+    parser.add_argument('-t', '--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='fractional change reported as a regression, '
+                             f'default: {DEFAULT_THRESHOLD}')
+    parser.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'number of runs of each benchmark, default: {DEFAULT_REPEAT}')
+    parser.add_argument('-n', '--iterations', type=int, default=DEFAULT_ITERATIONS,
+                        help=f'number of calls per wrapper, default: {DEFAULT_ITERATIONS}')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='number of concurrent wrapper calls, '
+                             f'default: {DEFAULT_CONCURRENCY}')
+    parser.add_argument('--cruises', type=int, default=1,
+                        help='number of synthetic cruises, default: 1')
+    parser.add_argument('--lowerings', type=int, default=DEFAULT_LOWERINGS,
+                        help=f'number of lowerings per cruise, default: {DEFAULT_LOWERINGS}')
+    parser.add_argument('--events', type=int, default=DEFAULT_EVENTS,
+                        help=f'number of ASNAP events per lowering, default: {DEFAULT_EVENTS}')
+    parser.add_argument('--seed', type=int, default=0, help='random seed, default: 0')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds added to every stub server request')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='maximum random seconds added to every stub server request')
+    parser.add_argument('--inserter_events', type=int, default=DEFAULT_INSERTER_EVENTS,
+                        help='number of events published for the inserter benchmark, '
+                             f'default: {DEFAULT_INSERTER_EVENTS}')
+    parser.add_argument('--rate', type=float, default=DEFAULT_INSERTER_RATE,
+                        help='events/second published for the inserter benchmark, '
+                             f'default: {DEFAULT_INSERTER_RATE}')
+    parser.add_argument('--query_latency', type=float, default=DEFAULT_QUERY_LATENCY,
+                        help='seconds taken by the inserter data source query, '
+                             f'default: {DEFAULT_QUERY_LATENCY}')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of inserter workers, default: 1')
+    parser.add_argument('--influx_events', type=int, default=DEFAULT_INFLUX_EVENTS,
+                        help='number of events for the influx benchmark, '
+                             f'default: {DEFAULT_INFLUX_EVENTS}')
+    parser.add_argument('--influx_latency', type=float, default=DEFAULT_INFLUX_LATENCY,
+                        help='seconds taken by every fake influx query, '
+                             f'default: {DEFAULT_INFLUX_LATENCY}')
+    parser.add_argument('--influx_batch', type=int, default=DEFAULT_INFLUX_BATCH,
+                        help='events per query in the batched influx mode, '
+                             f'default: {DEFAULT_INFLUX_BATCH}')
+    parser.add_argument('--influx_interval', type=float, default=DEFAULT_INFLUX_INTERVAL,
+                        help='seconds between the fake influx points, '
+                             f'default: {DEFAULT_INFLUX_INTERVAL}')
+    parser.add_argument('benchmarks', nargs='*',
+                        help=f"the benchmarks to run ({', '.join(BENCHMARKS)}), default: all")
+
+    parsed_args = parser.parse_args()
+
+    ############################
+    # Set up logging before we do any other argument parsing (so that we
+    # can log problems with argument parsing).
+
+    LOGGING_FORMAT = '%(asctime)-15s %(levelname)s - %(message)s'
+    logging.basicConfig(format=LOGGING_FORMAT)
+
+    LOG_LEVELS = {0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}
+    parsed_args.verbosity = min(parsed_args.verbosity, max(LOG_LEVELS))
+    logging.getLogger().setLevel(LOG_LEVELS[parsed_args.verbosity])
+
+    for bench_name in parsed_args.benchmarks:
+        if bench_name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {bench_name}, "
+                         f"must be one of: {', '.join(BENCHMARKS)}")
+
+    try:
+        bench_results = run_benchmarks(parsed_args.benchmarks or BENCHMARKS, parsed_args)
+
+        for bench_name, bench_metrics in bench_results['benchmarks'].items():
+            print(bench_name)
+            for bench_metric, bench_value in bench_metrics.items():
+                if bench_value is None:
+                    print(f'    {bench_metric:45} {"-":>14}')
+                else:
+                    print(f'    {bench_metric:45} {bench_value:>14.6g}')
+
+        if parsed_args.output:
+            with open(parsed_args.output, 'w', encoding='utf-8') as output_fp:
+                json.dump(bench_results, output_fp, indent=2)
+
+        if parsed_args.compare:
+            with open(parsed_args.compare, 'r', encoding='utf-8') as baseline_fp:
+                bench_baseline = json.load(baseline_fp)
+
+            bench_changes, bench_regressions = compare_results(bench_baseline, bench_results,
+                                                               parsed_args.threshold)
+
+            print(f"\nCompared with {bench_baseline['version'].get('commit')} "
+                  f"({bench_baseline['created']})")
+            for bench_name, bench_metric, old_value, new_value, bench_change in bench_changes:
+                print(f'    {bench_name:9} {bench_metric:45} {old_value:12.6g} {new_value:12.6g} '
+                      f'{bench_change:+8.1%} ',
+                      'REGRESSION' if (bench_name, bench_metric) in bench_regressions else '')
+
+            sys.exit(1 if bench_regressions else 0)
+
+    except KeyboardInterrupt:
+        logging.warning('Interrupted')
+        try:
+            sys.exit(0)
+        except SystemExit:
+            os._exit(0)  # pylint: disable=protected-access
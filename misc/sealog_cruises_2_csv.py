@@ -19,33 +19,21 @@ LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for det
 '''
 
 import sys
-import json
 import logging
 import asyncio
-import websockets
+from functools import partial
 
 from os.path import dirname, realpath
 sys.path.append(dirname(dirname(realpath(__file__))))
 
 from misc.python_sealog.cruises import get_cruises
-from misc.python_sealog.settings import WS_SERVER_URL, HEADERS
+from misc.python_sealog.ws_subscriber import SealogWSSubscriber
+from misc.python_sealog.json_backend import LazyJSON
 
 CLIENT_WSID = 'cruise2CSVSync'
 
-HELLO = {
-    'type': 'hello',
-    'id': CLIENT_WSID,
-    'auth': {
-        'headers': HEADERS
-    },
-    'version': '2',
-    'subs': ['/ws/status/newCruises', '/ws/status/updateCruises']
-}
-
-PING = {
-    'type':'ping',
-    'id':CLIENT_WSID
-}
+SUBS = ['/ws/status/newCruises', '/ws/status/updateCruises']
+
 
 def update_csv_file(output_file):
     '''
@@ -68,37 +56,15 @@ def update_csv_file(output_file):
     logging.info("Done")
 
 
-async def cruise_sync(output_file):
+def cruise_sync(output_file, path, cruise):  # pylint: disable=unused-argument
     '''
-    Listen to the newCruise and updateCruise subscriptions and call
-    update_csv_file whenever there is a change.
+    Called for each message from the newCruise and updateCruise subscriptions,
+    calls update_csv_file to rewrite the output_file.
     '''
 
-    try:
-        async with websockets.connect(WS_SERVER_URL) as websocket:
-
-            await websocket.send(json.dumps(HELLO))
-
-            while True:
-
-                cruise = await websocket.recv()
-                cruise_obj = json.loads(cruise)
-
-                if cruise_obj['type'] and cruise_obj['type'] == 'ping':
-
-                    await websocket.send(json.dumps(PING))
-
-                elif cruise_obj['type'] and cruise_obj['type'] == 'pub':
-
-                    logging.info("A cruise record has been added or an existing record has been updated")
-                    logging.debug(json.dumps(cruise_obj, indent=2))
-                    update_csv_file(output_file)
-
-                else:
-                    logging.debug("Skipping because message is not important")
-
-    except Exception as exc:
-        logging.error(str(exc))
+    logging.info("A cruise record has been added or an existing record has been updated")
+    logging.debug("%s", LazyJSON(cruise, indent=2))
+    update_csv_file(output_file)
 
 
 # -------------------------------------------------------------------------------------
@@ -136,7 +102,9 @@ if __name__ == "__main__":
         # If requested start the service to update the output_file whenever a
         # cruise record is created or changed.
         if parsed_args.service:
-            asyncio.get_event_loop().run_until_complete(cruise_sync(parsed_args.output_file))
+            subscriber = SealogWSSubscriber(CLIENT_WSID, SUBS,
+                                            partial(cruise_sync, parsed_args.output_file))
+            asyncio.run(subscriber.run())
 
     except KeyboardInterrupt:
         logging.warning('Interrupted')
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+'''
+FILE:           sealog_generate_dataset.py
+
+DESCRIPTION:    This script writes seeded synthetic cruises in the on-disk
+                layout of the sealog export scripts, for testing the
+                exporters, db_import_utils and the nav exporter at scale.  The
+                records are streamed to disk as they are generated so cruises
+                with millions of events and aux_data records can be written
+                without holding them in memory.  The same seed always produces
+                the same files.
+
+                <export_dir>/<cruise_id>/
+                    <cruise_id>_cruiseRecord.json
+                    <cruise_id>_eventOnlyExport.json
+                    <cruise_id>_auxDataExport.json
+                    <cruise_id>_sealogExport.json
+                    <cruise_id>_eventTemplates.json
+                    <cruise_id>_<lowering_id>/
+                        <cruise_id>_<lowering_id>_loweringRecord.json
+                        <cruise_id>_<lowering_id>_eventOnlyExport.json
+                        <cruise_id>_<lowering_id>_auxDataExport.json
+                        <cruise_id>_<lowering_id>_sealogExport.json
+                        <cruise_id>_<lowering_id>_eventTemplates.json
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import os
+import sys
+import time
+import logging
+
+from os.path import dirname, realpath
+sys.path.append(dirname(dirname(realpath(__file__))))
+
+from misc.python_sealog.json_backend import dumps
+from misc.sealog_bench.synthetic import (
+    generate_cruises, parse_ts, EVENT_VALUES, VESSEL_EVENT_VALUES, MILESTONE_STATUS,
+    DEFAULT_CRUISES, DEFAULT_LOWERINGS, DEFAULT_START_TS, DEFAULT_ASNAP_INTERVAL,
+    DEFAULT_EVENT_RATE, DEFAULT_VESSEL_EVENT_RATE, LOWERING_DURATION
+)
+
+# record type and the db_import_utils schema used to validate it
+RECORD_SCHEMAS = (
+    ('cruise', 'cruise_schema'),
+    ('lowering', 'lowering_schema'),
+    ('event', 'event_schema'),
+    ('aux_data', 'auxData_schema')
+)
+
+
+class JSONArrayWriter():
+    '''
+    Class that writes records to a file as a json array one record at a time,
+    the format of the export files.
+    '''
+
+    def __init__(self, filename):
+        self._fp = open(filename, 'w', encoding='utf-8')  # pylint: disable=consider-using-with
+        self._fp.write('[')
+        self.count = 0
+
+    def write(self, record):
+        '''
+        Append the record to the array.
+        '''
+
+        self._fp.write((',\n' if self.count else '\n') + dumps(record))
+        self.count += 1
+
+    def close(self):
+        '''
+        Close the array and the file.
+        '''
+
+        self._fp.write('\n]\n' if self.count else ']\n')
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_validators():
+    '''
+    Return a validator for each record type built from the db_import_utils
+    schemas.
+    '''
+
+    from jsonschema.validators import validator_for  # pylint: disable=import-outside-toplevel
+    from misc.python_sealog import db_import_utils  # pylint: disable=import-outside-toplevel
+
+    validators = {}
+    for record_type, schema_name in RECORD_SCHEMAS:
+        schema = getattr(db_import_utils, schema_name)
+        validators[record_type] = validator_for(schema)(schema)
+
+    return validators
+
+
+def _validate(validators, record_type, record):
+    '''
+    Raise a ValueError if the record does not match the db_import_utils schema
+    for the record type.
+    '''
+
+    if validators is None:
+        return
+
+    error = next(validators[record_type].iter_errors(record), None)
+
+    if error is not None:
+        raise ValueError(f"Invalid {record_type} record {record.get('id')}: {error.message}")
+
+
+def build_event_templates(cruise):
+    '''
+    Return the event templates for the event values used by the synthetic
+    events.
+    '''
+
+    templates = []
+
+    def _add_template(event_value, options, categories):
+        templates.append({
+            'id': f'{len(templates) + 1:024x}',
+            'event_name': event_value.replace('_', ' ').title(),
+            'event_value': event_value,
+            'event_free_text_required': False,
+            'event_options': [{
+                'event_option_name': name,
+                'event_option_type': 'dropdown',
+                'event_option_values': values,
+                'event_option_allow_freeform': False,
+                'event_option_required': False
+            } for name, values in options],
+            'system_template': False,
+            'template_categories': categories,
+            'disabled': False,
+            'admin_only': False
+        })
+
+    for event_values, category in ((EVENT_VALUES, 'vehicle'),
+                                   (VESSEL_EVENT_VALUES, cruise['cruise_id'].lower())):
+        for event_value, _, options in event_values:
+            _add_template(event_value,
+                          [(option['event_option_name'], [option['event_option_value']])
+                           for option in options], [category])
+
+    _add_template('ROV', [('status', [status for _, status in MILESTONE_STATUS])], ['vehicle'])
+    _add_template('CRUISE', [('status', ['Start of Cruise', 'End of Cruise'])], ['cruise'])
+
+    return templates
+
+
+def _sealog_export_record(event, aux_data):
+    return dict(event, aux_data=[{'data_source': record['data_source'],
+                                  'data_array': record['data_array']}
+                                 for record in aux_data])
+
+
+def _write_records(filename, records):
+    with JSONArrayWriter(filename) as writer:
+        for record in records:
+            writer.write(record)
+
+
+def write_cruise_export(generator, export_dir,  # pylint: disable=too-many-locals,too-many-branches
+                        sealog_export=True, validators=None):
+    '''
+    Write the cruise from the CruiseGenerator to export_dir.  The events
+    between the start_ts and stop_ts of a lowering are also written to the
+    lowering files.  Returns the number of events and aux_data records
+    written.  If validators is provided every record is checked against the
+    db_import_utils schemas.
+    '''
+
+    cruise = generator.cruise
+    cruise_dir = os.path.join(export_dir, cruise['cruise_id'])
+    os.makedirs(cruise_dir, exist_ok=True)
+
+    def _open_writers(prefix):
+        return (JSONArrayWriter(f'{prefix}_eventOnlyExport.json'),
+                JSONArrayWriter(f'{prefix}_auxDataExport.json'),
+                JSONArrayWriter(f'{prefix}_sealogExport.json') if sealog_export else None)
+
+    def _close_writers(writers):
+        for writer in writers:
+            if writer is not None:
+                writer.close()
+
+    lowering_dirs = []
+    for lowering in generator.lowerings:
+        lowering_dirs.append(os.path.join(cruise_dir,
+                                          f"{cruise['cruise_id']}_{lowering['lowering_id']}"))
+        os.makedirs(lowering_dirs[-1], exist_ok=True)
+
+    cruise_writers = _open_writers(os.path.join(cruise_dir, cruise['cruise_id']))
+    lowerings = generator.lowerings
+    lowering_writers = None
+    lowering_index = 0
+    counts = {'events': 0, 'aux_data': 0}
+
+    try:
+        for event, aux_data in generator.events():
+            _validate(validators, 'event', event)
+            for record in aux_data:
+                _validate(validators, 'aux_data', record)
+
+            # the events arrive in time order so the lowerings are written
+            # one at a time
+            while (lowering_index < len(lowerings)
+                   and event['ts'] > lowerings[lowering_index]['stop_ts']):
+                if lowering_writers is not None:
+                    _close_writers(lowering_writers)
+                    lowering_writers = None
+
+                lowering_index += 1
+
+            writers = [cruise_writers]
+
+            if (lowering_index < len(lowerings)
+                    and event['ts'] >= lowerings[lowering_index]['start_ts']):
+                if lowering_writers is None:
+                    lowering_dir = lowering_dirs[lowering_index]
+                    lowering_writers = _open_writers(os.path.join(lowering_dir,
+                                                                  os.path.basename(lowering_dir)))
+
+                writers.append(lowering_writers)
+
+            sealog_record = _sealog_export_record(event, aux_data) if sealog_export else None
+
+            for event_writer, aux_data_writer, sealog_writer in writers:
+                event_writer.write(event)  # pylint: disable=no-member
+                for record in aux_data:
+                    aux_data_writer.write(record)
+
+                if sealog_writer is not None:
+                    sealog_writer.write(sealog_record)
+
+            counts['events'] += 1
+            counts['aux_data'] += len(aux_data)
+
+    finally:
+        _close_writers(cruise_writers)
+        if lowering_writers is not None:
+            _close_writers(lowering_writers)
+
+    # the lowering stats are complete once all the events have been generated
+    templates = build_event_templates(cruise)
+
+    _validate(validators, 'cruise', cruise)
+    prefix = os.path.join(cruise_dir, cruise['cruise_id'])
+    _write_records(f'{prefix}_cruiseRecord.json', [cruise])
+    _write_records(f'{prefix}_eventTemplates.json', templates)
+
+    for lowering, lowering_dir in zip(lowerings, lowering_dirs):
+        prefix = os.path.join(lowering_dir, os.path.basename(lowering_dir))
+
+        _validate(validators, 'lowering', lowering)
+        _write_records(f'{prefix}_loweringRecord.json', [lowering])
+        _write_records(f'{prefix}_eventTemplates.json', templates)
+
+    return counts
+
+
+# -------------------------------------------------------------------------------------
+# Main function
+# -------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Write synthetic sealog cruises in the export file layout')
+    parser.add_argument('-v', '--verbosity', dest='verbosity', default=0, action='count',
+                        help='Increase output verbosity, default level: warning')
+    parser.add_argument('-c', '--cruises', type=int, default=DEFAULT_CRUISES,
+                        help=f'number of cruises, default: {DEFAULT_CRUISES}')
+    parser.add_argument('-l', '--lowerings', type=int, default=DEFAULT_LOWERINGS,
+                        help=f'number of lowerings per cruise, default: {DEFAULT_LOWERINGS}')
+    parser.add_argument('-d', '--lowering_hours', type=float, default=LOWERING_DURATION / 3600,
+                        help='duration of each lowering in hours, '
+                             f'default: {LOWERING_DURATION / 3600:g}')
+    parser.add_argument('-a', '--asnap_interval', type=float, default=DEFAULT_ASNAP_INTERVAL,
+                        help='seconds between ASNAP events, 0 for none, '
+                             f'default: {DEFAULT_ASNAP_INTERVAL}')
+    parser.add_argument('-e', '--event_rate', type=float, default=DEFAULT_EVENT_RATE,
+                        help='manual events per hour of bottom time, '
+                             f'default: {DEFAULT_EVENT_RATE}')
+    parser.add_argument('--vessel_event_rate', type=float, default=DEFAULT_VESSEL_EVENT_RATE,
+                        help=f'vessel events per hour, default: {DEFAULT_VESSEL_EVENT_RATE}')
+    parser.add_argument('--seed', type=int, default=0, help='random seed, default: 0')
+    parser.add_argument('--start_ts', default=DEFAULT_START_TS,
+                        help=f'start of the first cruise, default: {DEFAULT_START_TS}')
+    parser.add_argument('--no_sealog_export', action='store_true',
+                        help='do not write the _sealogExport.json files')
+    parser.add_argument('--validate', action='store_true',
+                        help='check every record against the db_import_utils schemas')
+    parser.add_argument('export_dir', help='directory to write the cruises to')
+
+    parsed_args = parser.parse_args()
+
+    ############################
+    # Set up logging before we do any other argument parsing (so that we
+    # can log problems with argument parsing).
+
+    LOGGING_FORMAT = '%(asctime)-15s %(levelname)s - %(message)s'
+    logging.basicConfig(format=LOGGING_FORMAT)
+
+    LOG_LEVELS = {0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}
+    parsed_args.verbosity = min(parsed_args.verbosity, max(LOG_LEVELS))
+    logging.getLogger().setLevel(LOG_LEVELS[parsed_args.verbosity])
+
+    try:
+        parse_ts(parsed_args.start_ts)
+
+    except ValueError:
+        parser.error(f'invalid start_ts: {parsed_args.start_ts}, '
+                     f'must be formatted like {DEFAULT_START_TS}')
+
+    if not 0 < parsed_args.lowering_hours < 24:
+        parser.error('lowering_hours must be between 0 and 24')
+
+    try:
+        record_validators = load_validators() if parsed_args.validate else None
+
+        cruise_generators = generate_cruises(parsed_args.cruises, parsed_args.lowerings,
+                                             parsed_args.seed, parsed_args.start_ts,
+                                             lowering_duration=parsed_args.lowering_hours * 3600,
+                                             asnap_interval=parsed_args.asnap_interval,
+                                             event_rate=parsed_args.event_rate,
+                                             vessel_event_rate=parsed_args.vessel_event_rate)
+
+        for cruise_generator in cruise_generators:
+            started = time.perf_counter()
+            logging.info("Writing cruise %s", cruise_generator.cruise['cruise_id'])
+
+            cruise_counts = write_cruise_export(cruise_generator, parsed_args.export_dir,
+                                                not parsed_args.no_sealog_export, record_validators)
+
+            elapsed = time.perf_counter() - started
+            print(f"{cruise_generator.cruise['cruise_id']}: "
+                  f"{len(cruise_generator.lowerings)} lowerings, "
+                  f"{cruise_counts['events']} events, {cruise_counts['aux_data']} aux_data records "
+                  f"in {elapsed:.1f}s ({cruise_counts['events'] / elapsed:.0f} events/s)")
+
+    except ValueError as exc:
+        logging.error(str(exc))
+        sys.exit(1)
+
+    except KeyboardInterrupt:
+        logging.warning('Interrupted')
+        try:
+            sys.exit(0)
+        except SystemExit:
+            os._exit(0)  # pylint: disable=protected-access
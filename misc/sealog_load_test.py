@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+'''
+FILE:           sealog_load_test.py
+
+DESCRIPTION:    This script load tests a sealog-server through the
+                python_sealog wrappers.  Requests are sent at a target rate
+                from a pool of worker threads, each request picked from a
+                weighted mix of operations:
+
+                    event        - create an event (an event logger)
+                    aux_data     - add an aux_data record to an event (an
+                                   aux_data inserter)
+                    lowering     - look up a lowering record
+                    event_export - export the events of a lowering
+
+                Requests are scheduled at random (poisson) intervals and are
+                not held back by slow responses, so when the server falls
+                behind the response times include the time spent waiting for
+                a worker.  The request count, error rate, throughput and
+                latency percentiles are reported per operation along with the
+                timings recorded by the python_sealog metrics for each API
+                route.
+
+BUGS:
+NOTES:          The event and aux_data operations add records to the server,
+                only run this script against a local test instance.  The
+                events are logged as LOAD_TEST and the aux_data records use
+                the loadTest data source so they can be removed afterwards.
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import sys
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from os.path import dirname, realpath
+sys.path.append(dirname(dirname(realpath(__file__))))
+
+from misc.python_sealog.settings import API_SERVER_URL, HEADERS
+from misc.python_sealog.json_backend import dumps
+from misc.python_sealog.api_client import POOL_SIZE
+from misc.python_sealog.metrics import enable_metrics
+from misc.python_sealog.lowerings import get_lowerings, get_lowering
+from misc.python_sealog.events import create_event, get_events_by_lowering
+from misc.python_sealog.event_exports import get_event_exports_by_lowering
+from misc.python_sealog.event_aux_data import create_event_aux_data
+
+OPERATIONS = ('event', 'aux_data', 'lowering', 'event_export')
+
+# relative weight of each operation, roughly ten event loggers, three
+# aux_data inserters saving a record for every event and the occasional
+# lowering lookup and export
+DEFAULT_MIX = 'event=10,aux_data=30,lowering=2,event_export=0.1'
+
+DEFAULT_RATE = 20.0  # requests per second
+DEFAULT_DURATION = 60  # seconds
+DEFAULT_WORKERS = POOL_SIZE
+
+LOAD_TEST_EVENT_VALUE = 'LOAD_TEST'
+LOAD_TEST_DATASOURCE = 'loadTest'
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def parse_mix(mix):
+    '''
+    Return the operation weights from a "name=weight,..." string.  Raises a
+    ValueError for unknown operations or invalid weights.
+    '''
+
+    weights = {}
+
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+
+        if name not in OPERATIONS:
+            raise ValueError(f'unknown operation "{name}", '
+                             f'valid operations are: {", ".join(OPERATIONS)}')
+
+        weights[name] = float(weight) if weight else 1.0
+
+        if weights[name] < 0:
+            raise ValueError(f'the weight of "{name}" can not be negative')
+
+    if not any(weights.values()):
+        raise ValueError('the mix has no operations')
+
+    return weights
+
+
+def _percentile(values, quantile):
+    '''
+    Return the nearest-rank percentile of the sorted values.
+    '''
+
+    if not values:
+        return None
+
+    return values[min(len(values) - 1, max(0, int(round(quantile * len(values))) - 1))]
+
+
+class LoadTest():  # pylint: disable=too-many-instance-attributes
+    '''
+    Class that sends a weighted mix of requests to the sealog-server at the
+    target rate and records the outcome of each request.  The lowering and
+    aux_data operations use the lowering with lowering_id, or the most
+    recent lowering if lowering_id is None.
+    '''
+
+    def __init__(self, weights, rate=DEFAULT_RATE,  # pylint: disable=too-many-arguments
+                 workers=DEFAULT_WORKERS, lowering_id=None, seed=0,
+                 api_server_url=API_SERVER_URL, headers=HEADERS):
+        self._weights = dict(weights)
+        self._rate = rate
+        self._workers = workers
+        self._lowering_id = lowering_id
+        self._rng = random.Random(seed)
+        self._api_server_url = api_server_url
+        self._headers = headers
+        self._lowering_uids = []
+        self._event_uids = []
+        self._lock = threading.Lock()
+        self._results = {}
+        self._sent = 0
+        self._seconds = 0.0
+
+    def setup(self):
+        '''
+        Look up the lowerings and events used by the requests.  Operations
+        that need a lowering or an event are dropped from the mix if there
+        are none.
+        '''
+
+        lowerings = get_lowerings(api_server_url=self._api_server_url, headers=self._headers) or []
+        self._lowering_uids = [lowering['id'] for lowering in lowerings]
+
+        lowering = None
+        if self._lowering_id is not None:
+            lowering = next((lowering for lowering in lowerings
+                             if lowering['lowering_id'] == self._lowering_id), None)
+
+            if lowering is None:
+                raise ValueError(f'lowering {self._lowering_id} not found')
+
+            self._lowering_uids = [lowering['id']]
+
+        elif lowerings:
+            lowering = max(lowerings, key=lambda lowering: lowering['start_ts'])
+
+        if lowering is not None:
+            events = get_events_by_lowering(lowering['id'], api_server_url=self._api_server_url,
+                                            headers=self._headers) or []
+            self._event_uids = [event['id'] for event in events]
+
+        for name, needed in (('lowering', self._lowering_uids),
+                             ('event_export', self._lowering_uids),
+                             ('aux_data', self._event_uids)):
+            if self._weights.get(name) and not needed:
+                logging.warning("No %s available, removing %s from the mix",
+                                'events' if name == 'aux_data' else 'lowerings', name)
+                self._weights[name] = 0
+
+        if not any(self._weights.values()):
+            raise ValueError('none of the operations in the mix can be run against this server')
+
+    def _event(self, _):
+        return create_event({
+            'event_value': LOAD_TEST_EVENT_VALUE,
+            'event_options': [],
+            'event_free_text': ''
+        }, api_server_url=self._api_server_url, headers=self._headers)
+
+    def _aux_data(self, rng):
+        return create_event_aux_data({
+            'event_id': rng.choice(self._event_uids),
+            'data_source': LOAD_TEST_DATASOURCE,
+            'data_array': [{'data_name': 'value', 'data_value': str(rng.random()), 'data_uom': ''}]
+        }, api_server_url=self._api_server_url, headers=self._headers)
+
+    def _lowering(self, rng):
+        return get_lowering(rng.choice(self._lowering_uids), api_server_url=self._api_server_url,
+                            headers=self._headers) is not None
+
+    def _event_export(self, rng):
+        return get_event_exports_by_lowering(rng.choice(self._lowering_uids),
+                                             api_server_url=self._api_server_url,
+                                             headers=self._headers) is not None
+
+    def _send(self, name, scheduled, seed):
+        '''
+        Run a single request and record its latency and response time, the
+        response time includes the time the request waited for a worker.
+        '''
+
+        start = time.perf_counter()
+        error = False
+
+        try:
+            error = not getattr(self, f'_{name}')(random.Random(seed))
+
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logging.debug("%s request failed: %s", name, str(exc))
+            error = True
+
+        finished = time.perf_counter()
+
+        with self._lock:
+            result = self._results.setdefault(name, {'latency': [], 'response': [], 'errors': 0})
+            result['latency'].append(finished - start)
+            result['response'].append(finished - scheduled)
+            result['errors'] += int(error)
+
+    def run(self, duration=DEFAULT_DURATION, stop=None):
+        '''
+        Send requests for duration seconds, or until the stop threading.Event
+        is set, then wait for the outstanding requests.  Returns the stats.
+        '''
+
+        names = [name for name in OPERATIONS if self._weights.get(name)]
+        weights = [self._weights[name] for name in names]
+
+        started = time.perf_counter()
+        scheduled = started
+        deadline = started + duration
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self._workers)) as executor:
+                while True:
+                    scheduled += self._rng.expovariate(self._rate)
+
+                    if scheduled >= deadline or (stop is not None and stop.is_set()):
+                        break
+
+                    wait = scheduled - time.perf_counter()
+                    if wait > 0:
+                        time.sleep(wait)
+
+                    executor.submit(self._send, self._rng.choices(names, weights)[0], scheduled,
+                                    self._rng.random())
+                    self._sent += 1
+
+        finally:
+            self._seconds = time.perf_counter() - started
+
+        return self.to_dict()
+
+    def to_dict(self):
+        '''
+        Return the request count, error rate, throughput and latency
+        percentiles of each operation.
+        '''
+
+        seconds = self._seconds or None
+        stats = {
+            'target_rate': self._rate,
+            'workers': self._workers,
+            'seconds': self._seconds,
+            'requests': self._sent,
+            'requests_per_s': self._sent / seconds if seconds else None,
+            'operations': {}
+        }
+
+        with self._lock:
+            for name in OPERATIONS:
+                result = self._results.get(name)
+                if result is None:
+                    continue
+
+                latency = sorted(result['latency'])
+                response = sorted(result['response'])
+                count = len(latency)
+
+                operation_stats = {
+                    'requests': count,
+                    'errors': result['errors'],
+                    'error_rate': result['errors'] / count,
+                    'requests_per_s': count / seconds if seconds else None,
+                }
+
+                for quantile in QUANTILES:
+                    label = f'p{quantile * 100:g}_s'
+                    operation_stats[f'latency_{label}'] = _percentile(latency, quantile)
+
+                operation_stats['latency_max_s'] = latency[-1]
+
+                for quantile in QUANTILES:
+                    label = f'p{quantile * 100:g}_s'
+                    operation_stats[f'response_{label}'] = _percentile(response, quantile)
+
+                stats['operations'][name] = operation_stats
+
+        return stats
+
+
+# -------------------------------------------------------------------------------------
+# Required python code for running the script as a stand-alone utility
+# -------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Load test a sealog-server with a weighted mix of requests')
+    parser.add_argument('-v', '--verbosity', dest='verbosity',
+                        default=0, action='count',
+                        help='Increase output verbosity')
+    parser.add_argument('-r', '--rate', type=float, default=DEFAULT_RATE,
+                        help=f'target requests per second, default: {DEFAULT_RATE}')
+    parser.add_argument('-d', '--duration', type=float, default=DEFAULT_DURATION,
+                        help=f'seconds to run, default: {DEFAULT_DURATION}')
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'number of concurrent requests, default: {DEFAULT_WORKERS}')
+    parser.add_argument('-m', '--mix', default=DEFAULT_MIX,
+                        help=f'relative weight of each operation ({", ".join(OPERATIONS)}), '
+                             f'default: {DEFAULT_MIX}')
+    parser.add_argument('-l', '--lowering_id',
+                        help='lowering used by the requests, default: the most recent lowering')
+    parser.add_argument('-u', '--api_server_url', default=API_SERVER_URL,
+                        help=f'sealog-server API url, default: {API_SERVER_URL}')
+    parser.add_argument('-o', '--output', help='save the stats as json to this file')
+    parser.add_argument('--seed', type=int, default=0, help='random seed, default: 0')
+
+    parsed_args = parser.parse_args()
+
+    ############################
+    # Set up logging before we do any other argument parsing (so that we
+    # can log problems with argument parsing).
+
+    LOGGING_FORMAT = '%(asctime)-15s %(levelname)s - %(message)s'
+    logging.basicConfig(format=LOGGING_FORMAT)
+
+    LOG_LEVELS = {0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}
+    parsed_args.verbosity = min(parsed_args.verbosity, max(LOG_LEVELS))
+    logging.getLogger().setLevel(LOG_LEVELS[parsed_args.verbosity])
+
+    if parsed_args.workers > POOL_SIZE:
+        logging.warning("Only %d connections are kept open to the server, "
+                        "extra workers will open new connections", POOL_SIZE)
+
+    try:
+        load_test = LoadTest(parse_mix(parsed_args.mix), parsed_args.rate, parsed_args.workers,
+                             parsed_args.lowering_id, parsed_args.seed, parsed_args.api_server_url)
+        load_test.setup()
+
+    except ValueError as exc:
+        logging.error(str(exc))
+        sys.exit(1)
+
+    except requests.exceptions.RequestException as exc:
+        logging.error("Unable to retrieve the lowerings and events from %s",
+                      parsed_args.api_server_url)
+        logging.debug(str(exc))
+        sys.exit(1)
+
+    metrics = enable_metrics()
+
+    try:
+        load_stats = load_test.run(parsed_args.duration)
+
+    except KeyboardInterrupt:
+        logging.warning('Interrupted')
+        load_stats = load_test.to_dict()
+
+    load_stats['routes'] = metrics.to_dict()['api']
+
+    print(f"{load_stats['requests']} requests in {load_stats['seconds']:.1f}s, "
+          f"{load_stats['requests_per_s'] or 0:.1f}/s (target {parsed_args.rate:g}/s)")
+    print(f"    {'operation':14} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50':>8} "
+          f"{'p90':>8} {'p99':>8} {'max':>8} {'resp p99':>9}")
+
+    for op_name, op_stats in load_stats['operations'].items():
+        print(f"    {op_name:14} {op_stats['requests']:>9} {op_stats['error_rate']:>7.1%} "
+              f"{op_stats['requests_per_s'] or 0:>8.2f} {op_stats['latency_p50_s']:>8.3f} "
+              f"{op_stats['latency_p90_s']:>8.3f} {op_stats['latency_p99_s']:>8.3f} "
+              f"{op_stats['latency_max_s']:>8.3f} {op_stats['response_p99_s']:>9.3f}")
+
+    print(f"\n    {'route':60} {'requests':>9} {'errors':>7} {'mean':>8} {'max':>8}")
+    for route_name, route_stats in load_stats['routes'].items():
+        print(f"    {route_name:60} {route_stats['count']:>9} {route_stats['errors']:>7} "
+              f"{route_stats['mean']:>8.3f} {route_stats['max']:>8.3f}")
+
+    if parsed_args.output:
+        with open(parsed_args.output, 'w', encoding='utf-8') as output_fp:
+            output_fp.write(dumps(load_stats, indent=2))
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+'''
+FILE:           startup_time_check.py
+
+DESCRIPTION:    This script measures the startup time of the sealog python
+                scripts by timing "<script> --help" and reports the scripts
+                that exceed the startup time budget.  Optionally lists the
+                slowest imports of each script.
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import os
+import sys
+import glob
+import time
+import logging
+import statistics
+import subprocess
+
+from os.path import basename, dirname, realpath
+
+# startup time budget in seconds
+DEFAULT_BUDGET = 0.5
+
+# budgets for the scripts that can not avoid loading a heavy module
+BUDGETS = {
+    'lowering_nav_exporter': 1.5,  # pandas
+}
+
+DEFAULT_RUNS = 5
+
+
+def find_scripts(script_dir=dirname(realpath(__file__))):
+    '''
+    Return the python scripts in script_dir that can be run from the command
+    line.
+    '''
+
+    scripts = []
+    candidates = glob.glob(os.path.join(script_dir, '*.py'))
+    candidates += glob.glob(os.path.join(script_dir, '*.py.dist'))
+
+    for script in sorted(candidates):
+        if realpath(script) == realpath(__file__):
+            continue
+
+        # skip the .dist template when the deployed copy exists
+        if script.endswith('.dist') and os.path.isfile(script[:-5]):
+            continue
+
+        with open(script, 'r', encoding='utf-8') as script_fp:
+            if "if __name__ == '__main__':" in script_fp.read().replace('"', "'"):
+                scripts.append(script)
+
+    return scripts
+
+
+def get_budget(script):
+    '''
+    Return the startup time budget for the script.
+    '''
+
+    name = basename(script).split('.')[0]
+    return BUDGETS.get(name, DEFAULT_BUDGET)
+
+
+def time_startup(script, runs=DEFAULT_RUNS):
+    '''
+    Return the median time for "<script> --help" to complete, or None if the
+    script failed.
+    '''
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, script, '--help'],
+                                capture_output=True, check=False)
+        times.append(time.perf_counter() - start)
+
+        if result.returncode != 0:
+            logging.error("%s failed:\n%s", basename(script),
+                          result.stderr.decode(errors='replace'))
+            return None
+
+    return statistics.median(times)
+
+
+def slowest_imports(script, count=10):
+    '''
+    Return the count slowest imports (cumulative time in seconds, module) for
+    the script using "python -X importtime".
+    '''
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', script, '--help'],
+                            capture_output=True, check=False)
+
+    imports = []
+    for line in result.stderr.decode(errors='replace').splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+
+        # only report the top level imports
+        if not name.startswith('  '):
+            imports.append((int(cumulative) / 1e6, name.strip()))
+
+    return sorted(imports, reverse=True)[:count]
+
+
+# -------------------------------------------------------------------------------------
+# Main function
+# -------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Check the startup time of the sealog python scripts')
+    parser.add_argument('-v', '--verbosity', dest='verbosity', default=0, action='count',
+                        help='Increase output verbosity, default level: warning')
+    parser.add_argument('-n', '--runs', type=int, default=DEFAULT_RUNS,
+                        help=f'number of runs per script, default: {DEFAULT_RUNS}')
+    parser.add_argument('-b', '--budget', type=float,
+                        help='startup time budget in seconds for every script, '
+                        f'default: {DEFAULT_BUDGET} unless set in BUDGETS')
+    parser.add_argument('-i', '--imports', action='store_true',
+                        help='list the slowest imports of each script')
+    parser.add_argument('scripts', nargs='*', help='the scripts to check, default: all')
+
+    parsed_args = parser.parse_args()
+
+    ############################
+    # Set up logging before we do any other argument parsing (so that we
+    # can log problems with argument parsing).
+
+    LOGGING_FORMAT = '%(asctime)-15s %(levelname)s - %(message)s'
+    logging.basicConfig(format=LOGGING_FORMAT)
+
+    LOG_LEVELS = {0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}
+    parsed_args.verbosity = min(parsed_args.verbosity, max(LOG_LEVELS))
+    logging.getLogger().setLevel(LOG_LEVELS[parsed_args.verbosity])
+
+    try:
+        over_budget = []  # pylint: disable=invalid-name
+
+        for entry_point in parsed_args.scripts or find_scripts():
+            budget = parsed_args.budget or get_budget(entry_point)
+            startup = time_startup(entry_point, parsed_args.runs)
+
+            if startup is None:
+                print(f'{basename(entry_point):45} FAILED')
+                over_budget.append(entry_point)
+                continue
+
+            status = 'ok' if startup <= budget else 'OVER BUDGET'  # pylint: disable=invalid-name
+            print(f'{basename(entry_point):45} {startup:6.3f}s  (budget {budget:0.2f}s)  {status}')
+
+            if startup > budget:
+                over_budget.append(entry_point)
+
+            if parsed_args.imports:
+                for seconds, module in slowest_imports(entry_point):
+                    print(f'    {seconds:6.3f}s  {module}')
+
+        sys.exit(1 if over_budget else 0)
+
+    except KeyboardInterrupt:
+        logging.warning('Interrupted')
+        try:
+            sys.exit(0)
+        except SystemExit:
+            os._exit(0)  # pylint: disable=protected-access
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+'''
+FILE:           test_event_exports.py
+
+DESCRIPTION:    Unit tests for flatten_event_export and the event_exports
+                DataFrame conversion.
+
+BUGS:
+NOTES:          Requires misc/python_sealog/settings.py (copy settings.py.dist)
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import sys
+import unittest
+
+from os.path import dirname, realpath
+sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
+
+from misc.python_sealog.event_exports import flatten_event_export
+from misc.python_sealog.dataframes import PANDAS_REQS, event_exports_to_dataframe
+
+EVENT = {
+    'id': 'event_1',
+    'ts': '2026-10-19T01:00:00.000Z',
+    'event_author': 'pilot',
+    'event_value': 'SAMPLE',
+    'event_free_text': 'note',
+    'event_options': [
+        {'event_option_name': 'sample_id', 'event_option_value': 'S1'},
+        {'event_option_name': 'sample_id', 'event_option_value': 'S2'},
+        {'event_option_name': 'notes', 'event_option_value': ''}
+    ],
+    'aux_data': [
+        {'data_source': 'vehicleRealtimeNavData', 'data_array': [
+            {'data_name': 'latitude', 'data_value': '10.5', 'data_uom': 'ddeg'},
+            {'data_name': 'depth', 'data_value': '1500', 'data_uom': 'meters'}
+        ]},
+        {'data_source': 'vehicleRealtimeNavData', 'data_array': [
+            {'data_name': 'latitude', 'data_value': '10.6', 'data_uom': 'ddeg'}
+        ]},
+        {'data_source': 'vehicleRealtimeNavData', 'data_array': [
+            {'data_name': 'latitude', 'data_value': '10.7', 'data_uom': 'ddeg'}
+        ]},
+        {'data_source': 'framegrabber', 'data_array': [
+            {'data_name': 'camera_name', 'data_value': 'CAM', 'data_uom': ''}
+        ]}
+    ]
+}
+
+# EVENT as flattened by flattenEventObjs in lib/utils.js for the csv export
+SERVER_FLAT_EVENT = {
+    'id': 'event_1',
+    'ts': '2026-10-19T01:00:00.000Z',
+    'event_author': 'pilot',
+    'event_value': 'SAMPLE',
+    'event_free_text': 'note',
+    'vehicleRealtimeNavData.latitude_value': '10.5',
+    'vehicleRealtimeNavData.latitude_uom': 'ddeg',
+    'vehicleRealtimeNavData.depth_value': '1500',
+    'vehicleRealtimeNavData.depth_uom': 'meters',
+    'vehicleRealtimeNavData.latitude_2_value': '10.6',
+    'vehicleRealtimeNavData.latitude_2_uom': 'ddeg',
+    'vehicleRealtimeNavData.latitude_3_value': '10.7',
+    'vehicleRealtimeNavData.latitude_3_uom': 'ddeg',
+    'framegrabber.camera_name_value': 'CAM',
+    'framegrabber.camera_name_uom': '',
+    'event_option.sample_id': 'S1',
+    'event_option.sample_id_2': 'S2',
+    'event_option.notes': ''
+}
+
+
+class TestFlattenEventExport(unittest.TestCase):
+    '''
+    Tests for flatten_event_export
+    '''
+
+    def test_matches_server(self):
+        '''
+        The column names, values and order match the server's csv export,
+        repeated names are numbered from _2.
+        '''
+
+        flat_event = flatten_event_export(EVENT)
+
+        self.assertEqual(flat_event, SERVER_FLAT_EVENT)
+        self.assertEqual(list(flat_event), list(SERVER_FLAT_EVENT))
+
+    def test_columns(self):
+        '''
+        Only the requested columns are included, using the same numbering
+        as the full export.
+        '''
+
+        columns = ['ts', 'vehicleRealtimeNavData.latitude_2_value', 'event_option.sample_id_2']
+
+        self.assertEqual(flatten_event_export(EVENT, columns),
+                         {column: SERVER_FLAT_EVENT[column] for column in columns})
+
+
+@unittest.skipUnless(PANDAS_REQS, 'pandas not installed')
+class TestEventExportsToDataframe(unittest.TestCase):
+    '''
+    Tests for event_exports_to_dataframe
+    '''
+
+    def test_types(self):
+        '''
+        The ts column is parsed as UTC and the numeric aux_data values are
+        converted to numbers.
+        '''
+
+        data = event_exports_to_dataframe([EVENT])
+
+        self.assertEqual(str(data['ts'].dt.tz), 'UTC')
+        self.assertEqual(data['ts'][0].isoformat(), '2026-10-19T01:00:00+00:00')
+        self.assertEqual(data['vehicleRealtimeNavData.depth_value'][0], 1500)
+        self.assertEqual(data['framegrabber.camera_name_value'][0], 'CAM')
+
+    def test_missing_columns(self):
+        '''
+        A ValueError lists the requested columns that are not found.
+        '''
+
+        with self.assertRaisesRegex(ValueError, 'vehicleRealtimeNavData.heading_value'):
+            event_exports_to_dataframe([EVENT], ['ts', 'vehicleRealtimeNavData.heading_value'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+'''
+FILE:           test_events.py
+
+DESCRIPTION:    Unit tests for the create_events batch submission.
+
+BUGS:
+NOTES:          Requires misc/python_sealog/settings.py (copy settings.py.dist)
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import sys
+import json
+import unittest
+from unittest import mock
+
+from os.path import dirname, realpath
+sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
+
+import requests
+
+from misc.python_sealog.events import create_events, CreateEventsError
+
+
+class FakeResponse():
+    '''
+    The parts of a requests.Response used by create_events.
+    '''
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode('utf-8')
+        self.text = self.content.decode('utf-8')
+
+
+def _fake_post(fail_values):
+    '''
+    Return a session.post replacement that fails the batches containing any
+    of the fail_values, with a 503 or a connection error.
+    '''
+
+    def _post(url, headers=None, data=None):  # pylint: disable=unused-argument
+        batch = json.loads(data)
+        values = {event['event_value'] for event in batch}
+
+        if 'CONNECTION_ERROR' in values & fail_values:
+            raise requests.exceptions.ConnectionError('connection refused')
+
+        if values & fail_values:
+            return FakeResponse(503, {'statusCode': 503, 'message': 'database error'})
+
+        return FakeResponse(201, {'acknowledged': True, 'insertedCount': len(batch)})
+
+    return _post
+
+
+class TestCreateEvents(unittest.TestCase):
+    '''
+    Tests for create_events
+    '''
+
+    def _create_events(self, payloads, fail_values=frozenset()):
+        session = mock.Mock()
+        session.post.side_effect = _fake_post(set(fail_values))
+
+        with mock.patch('misc.python_sealog.events.get_session', return_value=session):
+            return create_events(payloads, batch_size=2, workers=2)
+
+    def test_all_batches_added(self):
+        '''
+        Returns the number of events added.
+        '''
+
+        payloads = [{'event_value': 'TEST'} for _ in range(5)]
+        self.assertEqual(self._create_events(payloads), 5)
+
+    def test_failed_batches_reported(self):
+        '''
+        The events in batches that were rejected or could not be sent are
+        listed by the CreateEventsError, the other batches are still added.
+        '''
+
+        payloads = [{'event_value': value} for value in
+                    ('A', 'B', 'C', 'FAIL', 'CONNECTION_ERROR', 'D', 'E')]
+
+        with self.assertRaises(CreateEventsError) as context:
+            self._create_events(payloads, {'FAIL', 'CONNECTION_ERROR'})
+
+        self.assertEqual(context.exception.inserted, 3)
+        self.assertEqual([payload['event_value'] for payload in context.exception.failed],
+                         ['C', 'FAIL', 'CONNECTION_ERROR', 'D'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+'''
+FILE:           test_file_sync.py
+
+DESCRIPTION:    Unit tests for the manifest based file sync used by the
+                export scripts.
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import os
+import sys
+import tempfile
+import unittest
+
+from os.path import dirname, exists, join, realpath
+sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
+
+from misc.python_sealog.file_sync import sync_files, sync_directory, MANIFEST_FILENAME
+from misc.python_sealog.json_backend import loads
+
+FILENAMES = ['img_0.jpg', 'img_1.jpg', 'img_2.jpg']
+
+
+def _write(filepath, content):
+    os.makedirs(dirname(filepath), exist_ok=True)
+
+    with open(filepath, 'wb') as file_fp:
+        file_fp.write(content)
+
+
+def _read(filepath):
+    with open(filepath, 'rb') as file_fp:
+        return file_fp.read()
+
+
+class TestFileSync(unittest.TestCase):
+    '''
+    Tests for sync_files and sync_directory
+    '''
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self._tmp_dir.cleanup)
+
+        self.src_dir = join(self._tmp_dir.name, 'src')
+        self.dest_dir = join(self._tmp_dir.name, 'dest')
+
+        for filename in FILENAMES:
+            _write(join(self.src_dir, filename), filename.encode('utf-8'))
+
+    def _manifest(self):
+        return loads(_read(join(self.dest_dir, MANIFEST_FILENAME)))
+
+    def test_unchanged_files_skipped(self):
+        '''
+        The files are copied and recorded in the manifest, a second sync
+        copies nothing.
+        '''
+
+        stats = sync_files(self.src_dir, FILENAMES, self.dest_dir)
+        self.assertEqual((stats.copied, stats.skipped), (3, 0))
+        self.assertEqual(sorted(self._manifest()), FILENAMES)
+
+        for filename in FILENAMES:
+            self.assertEqual(_read(join(self.dest_dir, filename)), filename.encode('utf-8'))
+
+        stats = sync_files(self.src_dir, FILENAMES, self.dest_dir)
+        self.assertEqual((stats.copied, stats.skipped), (0, 3))
+
+    def test_changed_files_copied(self):
+        '''
+        A source touched without changing its content is not copied again
+        but its new mtime is recorded, a source with new content of the same
+        size is copied, as is a file removed from the destination.
+        '''
+
+        sync_files(self.src_dir, FILENAMES, self.dest_dir)
+
+        touched = join(self.src_dir, FILENAMES[0])
+        os.utime(touched, ns=(0, os.stat(touched).st_mtime_ns + 10**9))
+        _write(join(self.src_dir, FILENAMES[1]), b'IMG_1.JPG')
+        os.remove(join(self.dest_dir, FILENAMES[2]))
+
+        stats = sync_files(self.src_dir, FILENAMES, self.dest_dir)
+
+        self.assertEqual((stats.copied, stats.skipped), (2, 1))
+        self.assertEqual(_read(join(self.dest_dir, FILENAMES[1])), b'IMG_1.JPG')
+        self.assertTrue(exists(join(self.dest_dir, FILENAMES[2])))
+        self.assertEqual(self._manifest()[FILENAMES[0]]['mtime'], os.stat(touched).st_mtime_ns)
+
+        stats = sync_files(self.src_dir, FILENAMES, self.dest_dir)
+        self.assertEqual((stats.copied, stats.skipped), (0, 3))
+
+    def test_delete(self):
+        '''
+        With delete the files not in the sync are removed along with the
+        directories left empty, without it they are kept.
+        '''
+
+        _write(join(self.dest_dir, 'old', 'stale.jpg'), b'stale')
+
+        stats = sync_files(self.src_dir, FILENAMES[:2], self.dest_dir)
+        self.assertEqual(stats.deleted, 0)
+        self.assertTrue(exists(join(self.dest_dir, 'old', 'stale.jpg')))
+
+        stats = sync_files(self.src_dir, FILENAMES[:2], self.dest_dir, delete=True)
+        self.assertEqual((stats.deleted, stats.skipped), (1, 2))
+        self.assertFalse(exists(join(self.dest_dir, 'old')))
+        self.assertEqual(sorted(self._manifest()), FILENAMES[:2])
+
+    def test_hardlink(self):
+        '''
+        With hardlink the destination files are links to the source files.
+        '''
+
+        stats = sync_files(self.src_dir, FILENAMES, self.dest_dir, hardlink=True)
+
+        self.assertEqual((stats.linked, stats.copied), (3, 0))
+        self.assertTrue(os.path.samefile(join(self.src_dir, FILENAMES[0]),
+                                         join(self.dest_dir, FILENAMES[0])))
+
+    def test_sync_directory(self):
+        '''
+        The files in the sub-directories are synced and the files no longer
+        in the source directory are removed.
+        '''
+
+        _write(join(self.src_dir, 'sub', 'deeper', 'notes.txt'), b'notes')
+        _write(join(self.dest_dir, 'old', 'stale.txt'), b'stale')
+
+        stats = sync_directory(self.src_dir, self.dest_dir)
+
+        self.assertEqual((stats.files, stats.copied, stats.deleted), (4, 4, 1))
+        self.assertEqual(_read(join(self.dest_dir, 'sub', 'deeper', 'notes.txt')), b'notes')
+        self.assertFalse(exists(join(self.dest_dir, 'old')))
+
+    def test_sync_directory_missing_source(self):
+        '''
+        A missing source directory leaves the destination untouched and a
+        missing destination is not created.
+        '''
+
+        _write(join(self.dest_dir, 'a.txt'), b'a')
+
+        stats = sync_directory(join(self._tmp_dir.name, 'missing'), self.dest_dir)
+        self.assertEqual((stats.files, stats.deleted), (0, 0))
+        self.assertTrue(exists(join(self.dest_dir, 'a.txt')))
+
+        missing_dest = join(self._tmp_dir.name, 'missing_dest')
+        sync_directory(join(self._tmp_dir.name, 'missing'), missing_dest)
+        self.assertFalse(exists(missing_dest))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+'''
+FILE:           test_interval_index.py
+
+DESCRIPTION:    Unit tests for the IntervalIndex timestamp lookups.
+
+BUGS:
+NOTES:
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import sys
+import unittest
+
+from os.path import dirname, realpath
+sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
+
+from misc.python_sealog.interval_index import IntervalIndex
+
+
+def _record(uid, start, stop):
+    return {
+        'id': uid,
+        'start_ts': f'2026-10-19T{start}:00.000Z',
+        'stop_ts': f'2026-10-19T{stop}:00.000Z'
+    }
+
+
+def _ts(time):
+    return f'2026-10-19T{time}:00.000Z'
+
+
+class TestIntervalIndex(unittest.TestCase):
+    '''
+    Tests for IntervalIndex
+    '''
+
+    def setUp(self):
+        self.index = IntervalIndex([
+            _record('lowering_1', '01:00', '02:00'),
+            _record('lowering_2', '03:00', '04:00'),
+            _record('lowering_3', '05:00', '06:00')
+        ])
+
+    def _find_id(self, timestamp):
+        record = self.index.find(timestamp)
+        return record['id'] if record else None
+
+    def test_find(self):
+        '''
+        Returns the record containing the timestamp, including the start_ts
+        and stop_ts, and None between or outside the records.
+        '''
+
+        self.assertEqual(self._find_id(_ts('01:30')), 'lowering_1')
+        self.assertEqual(self._find_id(_ts('03:00')), 'lowering_2')
+        self.assertEqual(self._find_id(_ts('06:00')), 'lowering_3')
+        self.assertIsNone(self._find_id(_ts('00:30')))
+        self.assertIsNone(self._find_id(_ts('02:30')))
+        self.assertIsNone(self._find_id(_ts('06:30')))
+
+    def test_find_overlapping(self):
+        '''
+        Returns the most recently started record when ranges overlap, and
+        still finds a long range that started before a shorter one.
+        '''
+
+        self.index.load([
+            _record('long', '01:00', '10:00'),
+            _record('short', '02:00', '03:00')
+        ])
+
+        self.assertEqual(self._find_id(_ts('02:30')), 'short')
+        self.assertEqual(self._find_id(_ts('04:00')), 'long')
+        self.assertEqual(self._find_id(_ts('01:30')), 'long')
+
+    def test_update_and_remove(self):
+        '''
+        Updated and removed records are reflected by find.
+        '''
+
+        self.index.update(_record('lowering_2', '02:30', '04:00'))
+        self.assertEqual(self._find_id(_ts('02:45')), 'lowering_2')
+
+        self.index.update(_record('lowering_4', '07:00', '08:00'))
+        self.assertEqual(self._find_id(_ts('07:30')), 'lowering_4')
+        self.assertEqual(len(self.index), 4)
+
+        self.index.remove('lowering_1')
+        self.assertIsNone(self._find_id(_ts('01:30')))
+        self.assertIsNone(self.index.get('lowering_1'))
+        self.assertEqual(len(self.index), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+'''
+FILE:           test_lowering_nav_exporter.py
+
+DESCRIPTION:    Unit tests for the Douglas-Peucker track simplification in
+                lowering_nav_exporter.py.dist.
+
+BUGS:
+NOTES:          Requires misc/python_sealog/settings.py (copy settings.py.dist)
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import sys
+import math
+import random
+import unittest
+import importlib.util
+from importlib.machinery import SourceFileLoader
+
+from os.path import dirname, join, realpath
+sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
+
+from misc.python_sealog.dataframes import PANDAS_REQS
+
+try:
+    import numpy as np
+    NUMPY_REQS = True
+
+except ImportError:
+    NUMPY_REQS = False
+
+SCRIPT = join(dirname(dirname(realpath(__file__))), 'lowering_nav_exporter.py.dist')
+
+
+def _load_script():
+    '''
+    Import the nav exporter script, the .dist extension is not recognized by
+    the regular import machinery.
+    '''
+
+    loader = SourceFileLoader('lowering_nav_exporter', SCRIPT)
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+
+    return module
+
+
+def _point_distance(point, start, end):
+    '''
+    Distance from point to the segment start-end.
+    '''
+
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length2 = dx * dx + dy * dy
+    t = 0.0 if length2 == 0 else ((point[0] - start[0]) * dx + (point[1] - start[1]) * dy) / length2
+    t = min(1.0, max(0.0, t))
+
+    return math.hypot(point[0] - (start[0] + t * dx), point[1] - (start[1] + t * dy))
+
+
+def _douglas_peucker(points, tolerance):
+    '''
+    Reference recursive Douglas-Peucker, returns the indexes of the kept
+    points.
+    '''
+
+    keep = {0, len(points) - 1}
+
+    def _split(first, last):
+        if last - first < 2:
+            return
+
+        dist, index = max((_point_distance(points[i], points[first], points[last]), i)
+                          for i in range(first + 1, last))
+
+        if dist > tolerance:
+            keep.add(index)
+            _split(first, index)
+            _split(index, last)
+
+    _split(0, len(points) - 1)
+    return sorted(keep)
+
+
+@unittest.skipUnless(NUMPY_REQS and PANDAS_REQS, 'numpy and pandas not installed')
+class TestTrackSimplification(unittest.TestCase):
+    '''
+    Tests for track_significance and simplification_error
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.script = _load_script()
+
+        rng = random.Random(1)
+        x, y = [0.0], [0.0]
+        for _ in range(499):
+            x.append(x[-1] + rng.uniform(0, 10))
+            y.append(y[-1] + rng.gauss(0, 10))
+
+        cls.x = np.array(x)
+        cls.y = np.array(y)
+
+    def test_matches_recursive_douglas_peucker(self):
+        '''
+        Keeping the points more significant than a tolerance gives the same
+        points as the recursive Douglas-Peucker at that tolerance.
+        '''
+
+        significance = self.script.track_significance(self.x, self.y)
+        points = list(zip(self.x, self.y))
+
+        for tolerance in (0.5, 2.0, 10.0, 50.0):
+            self.assertEqual(list(np.flatnonzero(significance > tolerance)),
+                             _douglas_peucker(points, tolerance))
+
+    def test_error_within_tolerance(self):
+        '''
+        The simplified track is within the tolerance of every dropped point
+        and the end points are always kept.
+        '''
+
+        significance = self.script.track_significance(self.x, self.y)
+
+        for tolerance in (2.0, 50.0, 1e9):
+            keep = significance > tolerance
+
+            self.assertTrue(keep[0] and keep[-1])
+            self.assertLessEqual(self.script.simplification_error(self.x, self.y, keep),
+                                 tolerance)
+
+    def test_short_tracks(self):
+        '''
+        Empty and two point tracks are handled.
+        '''
+
+        self.assertEqual(len(self.script.track_significance(np.array([]), np.array([]))), 0)
+
+        significance = self.script.track_significance(np.array([0.0, 1.0]), np.array([0.0, 1.0]))
+        self.assertTrue(np.isinf(significance).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+'''
+FILE:           test_response_cache.py
+
+DESCRIPTION:    Unit tests for the ResponseCache keys, ttl and ETag
+                revalidation.
+
+BUGS:
+NOTES:          Requires misc/python_sealog/settings.py (copy settings.py.dist)
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import sys
+import unittest
+from unittest import mock
+
+from os.path import dirname, realpath
+sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
+
+from misc.python_sealog.api_client import ResponseCache
+
+URL = 'http://localhost:8000/sealog-server/api/v1/lowerings'
+
+
+class FakeResponse():  # pylint: disable=too-few-public-methods
+    '''
+    The parts of a requests.Response used by the ResponseCache.
+    '''
+
+    def __init__(self, status_code, body='', headers=None):
+        self.status_code = status_code
+        self.text = body
+        self.headers = headers or {}
+
+
+class TestResponseCache(unittest.TestCase):
+    '''
+    Tests for ResponseCache
+    '''
+
+    def setUp(self):
+        self.now = 0.0
+        self.session = mock.Mock()
+        self.session.get.return_value = FakeResponse(200, 'v1', {'ETag': '"v1"'})
+
+        patches = [
+            mock.patch('misc.python_sealog.api_client.get_session', return_value=self.session),
+            mock.patch('misc.python_sealog.api_client.time.monotonic', side_effect=lambda: self.now)
+        ]
+
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.cache = ResponseCache(max_size=2, ttl=10)
+
+    def test_fresh_response_cached(self):
+        '''
+        A response younger than the ttl is returned without a request.
+        '''
+
+        self.assertEqual(self.cache.get(URL).text, 'v1')
+        self.now = 5
+        self.assertEqual(self.cache.get(URL).text, 'v1')
+
+        self.assertEqual(self.session.get.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_includes_params_and_authorization(self):
+        '''
+        Requests with different params, including multi-valued params, or
+        a different Authorization header are cached separately.
+        '''
+
+        self.cache.get(URL, params={'value': ['A', 'B']})
+        self.cache.get(URL, params={'value': ['A', 'B']})
+        self.assertEqual(self.session.get.call_count, 1)
+
+        self.cache.get(URL, params={'value': ['A', 'C']})
+        self.assertEqual(self.session.get.call_count, 2)
+
+        self.cache.get(URL, headers={'Authorization': 'other'}, params={'value': ['A', 'C']})
+        self.assertEqual(self.session.get.call_count, 3)
+
+    def test_stale_response_revalidated(self):
+        '''
+        A stale response is revalidated with If-None-Match, a 304 reply
+        renews the cached response and a 200 reply replaces it.
+        '''
+
+        self.cache.get(URL)
+
+        self.now = 11
+        self.session.get.return_value = FakeResponse(304)
+        self.assertEqual(self.cache.get(URL).text, 'v1')
+
+        _, kwargs = self.session.get.call_args
+        self.assertEqual(kwargs['headers']['If-None-Match'], '"v1"')
+
+        # the 304 renewed the ttl
+        self.now = 20
+        self.cache.get(URL)
+        self.assertEqual(self.session.get.call_count, 2)
+
+        self.now = 31
+        self.session.get.return_value = FakeResponse(200, 'v2', {'ETag': '"v2"'})
+        self.assertEqual(self.cache.get(URL).text, 'v2')
+        self.assertEqual(self.session.get.call_count, 3)
+
+    def test_errors_not_cached(self):
+        '''
+        Error responses are returned but not cached.
+        '''
+
+        self.session.get.return_value = FakeResponse(404)
+        self.assertEqual(self.cache.get(URL).status_code, 404)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction_and_invalidate(self):
+        '''
+        The least recently used response is evicted when the cache is full
+        and invalidate removes the responses for an api path.
+        '''
+
+        self.cache.get(URL + '/1')
+        self.cache.get(URL + '/2')
+        self.cache.get(URL + '/1')
+        self.cache.get(URL + '/3')
+
+        self.assertEqual(len(self.cache), 2)
+
+        self.cache.get(URL + '/1')
+        self.assertEqual(self.session.get.call_count, 3)
+
+        self.cache.invalidate('/lowerings')
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+'''
+FILE:           test_ws_subscriber.py
+
+DESCRIPTION:    Unit tests for the SealogWSSubscriber queueing, overflow and
+                catch-up behaviour, run against a local websocket server.
+
+BUGS:
+NOTES:          Requires misc/python_sealog/settings.py (copy settings.py.dist)
+AUTHOR:     Webb Pinner
+COMPANY:    OceanDataTools.org
+VERSION:    1.0
+CREATED:    2026-10-19
+REVISION:
+
+LICENSE INFO:   This code is licensed under MIT license (see LICENSE.txt for details)
+                Copyright (C) OceanDataTools.org 2024
+'''
+
+import sys
+import json
+import asyncio
+import unittest
+from unittest import mock
+
+from os.path import dirname, realpath
+sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
+
+import websockets
+
+from misc.python_sealog.ws_subscriber import SealogWSSubscriber, NEW_EVENTS_PATH
+
+CUSTOM_VARS_PATH = '/ws/status/updateCustomVars'
+
+
+def _event(index):
+    return {
+        'id': f'event_{index:04d}',
+        'ts': f'2026-10-19T00:00:{index:02d}.000Z',
+        'event_value': 'TEST'
+    }
+
+
+def _custom_var_messages(count):
+    return [{'type': 'pub', 'path': CUSTOM_VARS_PATH, 'message': {'index': i}}
+            for i in range(count)]
+
+
+class FakeServer():
+    '''
+    Websocket server that sends the queued messages to the first client after
+    its HELLO message and records the client's replies.
+    '''
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.replies = asyncio.Queue()
+        self._server = None
+
+    async def _handle(self, websocket):
+        await websocket.recv()  # HELLO
+
+        for msg in self.messages:
+            await websocket.send(json.dumps(msg))
+
+        async for reply in websocket:
+            await self.replies.put(json.loads(reply))
+
+    async def __aenter__(self):
+        self._server = await websockets.serve(self._handle, 'localhost', 0)
+        return f"ws://localhost:{self._server.sockets[0].getsockname()[1]}"
+
+    async def __aexit__(self, *args):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+class TestSealogWSSubscriber(unittest.IsolatedAsyncioTestCase):
+    '''
+    Tests for SealogWSSubscriber
+    '''
+
+    async def asyncSetUp(self):
+        self.release = asyncio.Event()
+        self.handled = []
+
+    async def _blocking_handler(self, path, message):
+        await self.release.wait()
+        self.handled.append((path, message))
+
+    async def _wait_for(self, condition, timeout=2):
+        async with asyncio.timeout(timeout):
+            while not condition():
+                await asyncio.sleep(0.01)
+
+    async def test_pings_answered_when_queue_full(self):
+        '''
+        The reader answers a ping while the queue is full and the handler is
+        blocked.
+        '''
+
+        messages = _custom_var_messages(10) + [{'type': 'ping'}]
+
+        server = FakeServer(messages)
+        async with server as url:
+            subscriber = SealogWSSubscriber('test', [CUSTOM_VARS_PATH], self._blocking_handler,
+                                            ws_server_url=url, queue_size=2)
+            task = asyncio.create_task(subscriber.run())
+
+            try:
+                reply = await asyncio.wait_for(server.replies.get(), timeout=2)
+                self.assertEqual(reply, {'type': 'ping', 'id': 'test'})
+                self.assertEqual(self.handled, [])
+
+            finally:
+                self.release.set()
+                task.cancel()
+
+    async def test_drop_oldest_when_queue_full(self):
+        '''
+        Messages other than new events are queued by dropping the oldest
+        queued message.
+        '''
+
+        messages = _custom_var_messages(10) + [{'type': 'ping'}]
+
+        server = FakeServer(messages)
+        async with server as url:
+            subscriber = SealogWSSubscriber('test', [CUSTOM_VARS_PATH], self._blocking_handler,
+                                            ws_server_url=url, queue_size=3)
+            task = asyncio.create_task(subscriber.run())
+
+            try:
+                await asyncio.wait_for(server.replies.get(), timeout=2)
+                self.release.set()
+
+                # the queue keeps the newest 3 messages, plus the message
+                # the worker may already be holding
+                await self._wait_for(lambda: self.handled and self.handled[-1][1]['index'] == 9)
+                await asyncio.sleep(0.1)
+
+                indexes = [message['index'] for _, message in self.handled]
+                self.assertEqual(indexes[-3:], [7, 8, 9])
+                self.assertLessEqual(len(indexes), 4)
+
+            finally:
+                task.cancel()
+
+    async def test_dropped_events_recovered_by_catch_up(self):
+        '''
+        New events dropped while the queue is full are retrieved by a catch-up
+        once the queue is empty and handled in order, exactly once.
+        '''
+
+        events = [_event(i) for i in range(10)]
+        messages = [{'type': 'pub', 'path': NEW_EVENTS_PATH, 'message': event} for event in events]
+        messages.append({'type': 'ping'})
+
+        def _get_events(start_ts, **kwargs):  # pylint: disable=unused-argument
+            return [event for event in events if event['ts'] >= start_ts]
+
+        get_events = mock.Mock(side_effect=_get_events)
+
+        server = FakeServer(messages)
+        async with server as url:
+            with mock.patch('misc.python_sealog.ws_subscriber.get_events', get_events):
+                subscriber = SealogWSSubscriber('test', [NEW_EVENTS_PATH], self._blocking_handler,
+                                                ws_server_url=url, queue_size=3, catch_up=True)
+                task = asyncio.create_task(subscriber.run())
+
+                try:
+                    await asyncio.wait_for(server.replies.get(), timeout=2)
+                    self.release.set()
+
+                    await self._wait_for(lambda: len(self.handled) == len(events))
+                    await asyncio.sleep(0.1)
+
+                finally:
+                    task.cancel()
+
+        self.assertEqual([message['id'] for _, message in self.handled],
+                         [event['id'] for event in events])
+        get_events.assert_called_once()
+        self.assertEqual(subscriber.last_event_ts, events[-1]['ts'])
+
+    async def test_catch_up_on_connect(self):
+        '''
+        With last_event_ts set the events since that ts are retrieved page by
+        page when connecting, live events are handled after them and a live
+        event already retrieved is not handled twice.
+        '''
+
+        events = [_event(i) for i in range(10)]
+        live_events = [events[4], _event(10)]
+        messages = [{'type': 'pub', 'path': NEW_EVENTS_PATH, 'message': event}
+                    for event in live_events]
+
+        def _get_events(start_ts, limit, offset, **kwargs):  # pylint: disable=unused-argument
+            return [event for event in events if event['ts'] >= start_ts][offset:offset + limit]
+
+        get_events = mock.Mock(side_effect=_get_events)
+        self.release.set()
+
+        server = FakeServer(messages)
+        async with server as url:
+            with mock.patch('misc.python_sealog.ws_subscriber.get_events', get_events):
+                subscriber = SealogWSSubscriber('test', [NEW_EVENTS_PATH], self._blocking_handler,
+                                                ws_server_url=url, catch_up=True,
+                                                catch_up_page_size=2,
+                                                last_event_ts=events[2]['ts'])
+                task = asyncio.create_task(subscriber.run())
+
+                try:
+                    await self._wait_for(lambda: len(self.handled) == 9)
+                    await asyncio.sleep(0.1)
+
+                finally:
+                    task.cancel()
+
+        self.assertEqual([message['id'] for _, message in self.handled],
+                         [event['id'] for event in events[2:] + [live_events[1]]])
+        self.assertEqual([call.kwargs['offset'] for call in get_events.call_args_list],
+                         [0, 2, 4, 6, 8])
+        self.assertEqual(subscriber.last_event_ts, live_events[1]['ts'])
+
+    async def test_catch_up_handler(self):
+        '''
+        With catch_up_handler set the recovered events are passed to it and
+        the live events to the handler.
+        '''
+
+        events = [_event(i) for i in range(3)]
+        messages = [{'type': 'pub', 'path': NEW_EVENTS_PATH, 'message': _event(3)}]
+        recovered = []
+
+        async def _catch_up_handler(path, message):
+            recovered.append((path, message))
+
+        get_events = mock.Mock(return_value=events)
+        self.release.set()
+
+        server = FakeServer(messages)
+        async with server as url:
+            with mock.patch('misc.python_sealog.ws_subscriber.get_events', get_events):
+                subscriber = SealogWSSubscriber('test', [NEW_EVENTS_PATH], self._blocking_handler,
+                                                ws_server_url=url, catch_up=True,
+                                                last_event_ts=events[0]['ts'],
+                                                catch_up_handler=_catch_up_handler)
+                task = asyncio.create_task(subscriber.run())
+
+                try:
+                    await self._wait_for(lambda: len(self.handled) == 1)
+                    await asyncio.sleep(0.1)
+
+                finally:
+                    task.cancel()
+
+        self.assertEqual([message['id'] for _, message in recovered],
+                         [event['id'] for event in events])
+        self.assertEqual([message['id'] for _, message in self.handled], [_event(3)['id']])
+
+
+if __name__ == '__main__':
+    unittest.main()
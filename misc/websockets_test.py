@@ -21,53 +21,24 @@ import sys
 import asyncio
 import json
 import logging
-import websockets
 
 from os.path import dirname, realpath
 sys.path.append(dirname(dirname(realpath(__file__))))
 
-from misc.python_sealog.settings import WS_SERVER_URL, HEADERS
+from misc.python_sealog.ws_subscriber import SealogWSSubscriber
 
 CLIENT_WS_ID = 'websocketTest'
 
-HELLO = {
-    'type': 'hello',
-    'id': CLIENT_WS_ID,
-    'auth': {
-        'headers': HEADERS
-    },
-    'version': '2',
-    'subs': ['/ws/status/newEvents']
-}
-
-PING = {
-    'type':'ping',
-    'id':CLIENT_WS_ID
-}
-
-async def websocket_test():
-    '''
-    Connects to the sealog-server and subscribes to the newEvent feed
-    '''
-
-    try:
-        async with websockets.connect(WS_SERVER_URL) as websocket:
+SUBS = ['/ws/status/newEvents']
 
-            await websocket.send(json.dumps(HELLO))
 
-            while True:
-
-                event = await websocket.recv()
-                event_obj = json.loads(event)
-
-                if event_obj['type'] and event_obj['type'] == 'ping':
-                    await websocket.send(json.dumps(PING))
+def websocket_test(path, event):  # pylint: disable=unused-argument
+    '''
+    Log the new events received from the sealog-server newEvent feed
+    '''
 
-                elif event_obj['type'] and event_obj['type'] == 'pub':
-                    logging.info("New Event: %s", json.dumps(event_obj['message']))
+    logging.info("New Event: %s", json.dumps(event))
 
-    except Exception as exc:
-        logging.error(str(exc))
 
 # -------------------------------------------------------------------------------------
 # Required python code for running the script as a stand-alone utility
@@ -96,7 +67,7 @@ if __name__ == '__main__':
     logging.getLogger().setLevel(LOG_LEVELS[parsed_args.verbosity])
 
     try:
-        asyncio.get_event_loop().run_until_complete(websocket_test())
+        asyncio.run(SealogWSSubscriber(CLIENT_WS_ID, SUBS, websocket_test).run())
     except KeyboardInterrupt:
         logging.warning('Interrupted')
         try:
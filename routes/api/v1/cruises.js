@@ -35,6 +35,7 @@ const {
 } = require('../../../lib/validations');
 
 const {
+  addResponseETag,
   rmPath,
   mvFilesToDir
 } = require('../../../lib/utils');
@@ -106,6 +107,10 @@ exports.plugin = {
 
     server.subscription('/ws/status/newCruises');
     server.subscription('/ws/status/updateCruises');
+    server.subscription('/ws/status/deleteCruises');
+
+    // ETag headers for conditional GET requests on this plugin's routes
+    server.ext('onPreResponse', addResponseETag, { sandbox: 'plugin' });
 
     server.route({
       method: 'GET',
@@ -1058,10 +1063,12 @@ exports.plugin = {
           return Boom.badRequest('id must be a single String of 12 bytes or a string of 24 hex characters');
         }
 
+        let cruise = null;
+
         try {
-          const result = await db.collection(cruisesTable).findOne(query);
+          cruise = await db.collection(cruisesTable).findOne(query);
 
-          if (!result) {
+          if (!cruise) {
             return Boom.notFound('No record found for id: ' + request.params.id);
           }
         }
@@ -1076,6 +1083,8 @@ exports.plugin = {
             rmPath(cruisePath + '/' + request.params.id);
           }
 
+          server.publish('/ws/status/deleteCruises', _renameAndClearFields(cruise));
+
           return h.response(deleteCruise).code(204);
         }
         catch (err) {
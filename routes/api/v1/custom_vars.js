@@ -12,6 +12,10 @@ const {
   customVarQuery
 } = require('../../../lib/validations');
 
+const {
+  addResponseETag
+} = require('../../../lib/utils');
+
 const _renameAndClearFields = (doc) => {
 
   //rename id
@@ -28,6 +32,9 @@ exports.plugin = {
 
     server.subscription('/ws/status/updateCustomVars');
 
+    // ETag headers for conditional GET requests on this plugin's routes
+    server.ext('onPreResponse', addResponseETag, { sandbox: 'plugin' });
+
     server.route({
       method: 'GET',
       path: '/custom_vars',
@@ -14,6 +14,10 @@ const {
   eventTemplateUpdatePayload
 } = require('../../../lib/validations');
 
+const {
+  addResponseETag
+} = require('../../../lib/utils');
+
 const _renameAndClearFields = (doc, admin = false) => {
 
   //rename id
@@ -35,6 +39,9 @@ exports.plugin = {
     server.subscription('/ws/status/updateEventTemplates');
     server.subscription('/ws/status/deleteEventTemplates');
 
+    // ETag headers for conditional GET requests on this plugin's routes
+    server.ext('onPreResponse', addResponseETag, { sandbox: 'plugin' });
+
     server.route({
       method: 'GET',
       path: '/event_templates',
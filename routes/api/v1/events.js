@@ -21,6 +21,8 @@ const {
   eventCountSuccessResponse,
   eventSingleQuery,
   eventSuccessResponse,
+  eventBulkCreatePayload,
+  eventBulkCreateResponse,
   eventCreatePayload,
   eventCreateResponse,
   eventUpdatePayload
@@ -933,6 +935,143 @@ exports.plugin = {
       }
     });
 
+    server.route({
+      method: 'POST',
+      path: '/events/bulk',
+      async handler(request, h) {
+
+        const db = request.mongo.db;
+        const ObjectID = request.mongo.ObjectID;
+
+        const events = request.payload;
+
+        const ids = [];
+        let event_author = null;
+
+        for (const event of events) {
+          if (event.id) {
+            try {
+              event._id = new ObjectID(event.id);
+              delete event.id;
+              ids.push(event._id);
+            }
+            catch (err) {
+              console.log(err);
+              return Boom.badRequest('id must be a single String of 12 bytes or a string of 24 hex characters');
+            }
+          }
+
+          if (!event.ts) {
+            event.ts = new Date();
+          }
+
+          if (!event.event_options) {
+            event.event_options = [];
+          }
+          else {
+            event.event_options = event.event_options.map((event_option) => {
+
+              event_option.event_option_name = event_option.event_option_name.toLowerCase().replace(/\s+/g, '_');
+              return event_option;
+            });
+          }
+
+          if (!event.event_free_text) {
+            event.event_free_text = '';
+          }
+
+          if (!event.event_author) {
+            if (!event_author) {
+              try {
+                const result = await db.collection(usersTable).findOne({ _id: new ObjectID(request.auth.credentials.id) });
+
+                if (!result) {
+                  return Boom.badRequest('specified user does not exist');
+                }
+
+                event_author = result.username;
+              }
+              catch (err) {
+                console.log(err);
+                return Boom.serverUnavailable('database error');
+              }
+            }
+
+            event.event_author = event_author;
+          }
+        }
+
+        if (new Set(ids.map((id) => id.toString())).size !== ids.length) {
+          return Boom.badRequest('duplicate event ID in payload');
+        }
+
+        if (ids.length > 0) {
+          try {
+            const result = await db.collection(eventsTable).findOne({ _id: { $in: ids } });
+            if (result) {
+              return Boom.badRequest('duplicate event ID');
+            }
+          }
+          catch (err) {
+            console.log(err);
+            return Boom.serverUnavailable('database error');
+          }
+        }
+
+        const publish = events.map((event) => {
+
+          const publish_event = (typeof event.publish !== 'undefined') ? event.publish : true;
+          delete event.publish;
+          return publish_event;
+        });
+
+        try {
+          const result = await db.collection(eventsTable).insertMany(events);
+
+          events.forEach((event, idx) => {
+
+            event._id = result.insertedIds[idx];
+            _renameAndClearFields(event);
+
+            const diff = (new Date().getTime() - event.ts.getTime()) / 1000;
+            if (publish[idx] && Math.abs(Math.round(diff)) < THRESHOLD) {
+              server.publish('/ws/status/newEvents', event);
+            }
+          });
+
+          return h.response({ acknowledged: result.acknowledged, insertedCount: result.insertedCount }).code(201);
+        }
+        catch (err) {
+          console.log(err);
+          return Boom.serverUnavailable('database error');
+        }
+      },
+      config: {
+        auth: {
+          strategy: 'jwt',
+          scope: ['admin', 'write_events']
+        },
+        validate: {
+          headers: authorizationHeader,
+          payload: eventBulkCreatePayload,
+          failAction: (request, h, err) => {
+
+            throw Boom.badRequest(err.message);
+          }
+        },
+        response: {
+          status: {
+            201: eventBulkCreateResponse
+          }
+        },
+
+        description: 'Create several new event records',
+        notes: '<p>Requires authorization via: <strong>JWT token</strong></p>\
+          <p>Available to: <strong>admin</strong>, <strong>event_manager</strong> or <strong>event_logger</strong></p>',
+        tags: ['events','api']
+      }
+    });
+
     server.route({
       method: 'PATCH',
       path: '/events/{id}',
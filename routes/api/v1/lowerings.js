@@ -18,6 +18,7 @@ const {
 } = require('../../../config/db_constants');
 
 const {
+  addResponseETag,
   rmPath,
   mvFilesToDir
 } = require('../../../lib/utils');
@@ -106,6 +107,10 @@ exports.plugin = {
 
     server.subscription('/ws/status/newLowerings');
     server.subscription('/ws/status/updateLowerings');
+    server.subscription('/ws/status/deleteLowerings');
+
+    // ETag headers for conditional GET requests on this plugin's routes
+    server.ext('onPreResponse', addResponseETag, { sandbox: 'plugin' });
 
     server.route({
       method: 'GET',
@@ -1042,9 +1047,11 @@ exports.plugin = {
           return Boom.badRequest('id must be a single String of 12 bytes or a string of 24 hex characters');
         }
 
+        let lowering = null;
+
         try {
-          const result = await db.collection(loweringsTable).findOne(query);
-          if (!result) {
+          lowering = await db.collection(loweringsTable).findOne(query);
+          if (!lowering) {
             return Boom.notFound('No record found for id: ' + request.params.id);
           }
         }
@@ -1055,6 +1062,7 @@ exports.plugin = {
 
         try {
           await db.collection(loweringsTable).deleteOne(query);
+          server.publish('/ws/status/deleteLowerings', _renameAndClearFields(lowering));
           return h.response().code(204);
         }
         catch (err) {
@@ -0,0 +1,102 @@
+'use strict';
+
+const Lab = require('@hapi/lab');
+const { expect } = require('@hapi/code');
+const { afterEach, beforeEach, describe, it } = exports.lab = Lab.script();
+const { init } = require('../lib/server');
+
+const { eventsTable } = require('../config/db_constants');
+
+const url = '/sealog-server/api/v1/events/bulk';
+
+const credentials = {
+  scope: ['admin']
+};
+
+const buildEvent = (id, event_value = 'BULK_TEST') => {
+
+  return {
+    id,
+    event_author: 'test',
+    ts: new Date().toISOString(),
+    event_value,
+    publish: false
+  };
+};
+
+describe('POST /events/bulk', () => {
+
+  let server;
+  let ids;
+
+  const postEvents = (payload) => {
+
+    return server.inject({
+      method: 'post',
+      url,
+      auth: { strategy: 'jwt', credentials },
+      payload
+    });
+  };
+
+  beforeEach(async () => {
+
+    server = await init();
+    ids = [new server.mongo.ObjectID(), new server.mongo.ObjectID()];
+  });
+
+  afterEach(async () => {
+
+    await server.mongo.db.collection(eventsTable).deleteMany({ _id: { $in: ids } });
+    await server.stop();
+  });
+
+  it('creates the events', async () => {
+
+    const res = await postEvents(ids.map((id) => buildEvent(id.toString())));
+
+    expect(res.statusCode).to.equal(201);
+    expect(res.result.insertedCount).to.equal(2);
+
+    const count = await server.mongo.db.collection(eventsTable).countDocuments({ _id: { $in: ids } });
+    expect(count).to.equal(2);
+  });
+
+  it('responds with 400 when the payload repeats an id', async () => {
+
+    const res = await postEvents([buildEvent(ids[0].toString()), buildEvent(ids[1].toString()), buildEvent(ids[0].toString(), 'DUPLICATE')]);
+
+    expect(res.statusCode).to.equal(400);
+    expect(res.result.message).to.equal('duplicate event ID in payload');
+
+    const count = await server.mongo.db.collection(eventsTable).countDocuments({ _id: { $in: ids } });
+    expect(count).to.equal(0);
+  });
+
+  it('responds with 400 when an id already exists', async () => {
+
+    await postEvents([buildEvent(ids[0].toString())]);
+
+    const res = await postEvents([buildEvent(ids[1].toString()), buildEvent(ids[0].toString())]);
+
+    expect(res.statusCode).to.equal(400);
+    expect(res.result.message).to.equal('duplicate event ID');
+
+    const count = await server.mongo.db.collection(eventsTable).countDocuments({ _id: ids[1] });
+    expect(count).to.equal(0);
+  });
+
+  it('responds with 400 when an id is invalid', async () => {
+
+    const res = await postEvents([buildEvent('zzzzzzzzzzzzzzzzzzzzzzzz')]);
+
+    expect(res.statusCode).to.equal(400);
+  });
+
+  it('responds with 400 for an empty payload', async () => {
+
+    const res = await postEvents([]);
+
+    expect(res.statusCode).to.equal(400);
+  });
+});